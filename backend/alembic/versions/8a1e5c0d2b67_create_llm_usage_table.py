@@ -0,0 +1,47 @@
+"""Create llm_usage table
+
+Revision ID: 8a1e5c0d2b67
+Revises: 3f6b2a91c7d4
+Create Date: 2026-10-17 11:03:27.904116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a1e5c0d2b67'
+down_revision = '3f6b2a91c7d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('llm_usage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('period_end', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=True),
+    sa.Column('model_id', sa.String(), nullable=False),
+    sa.Column('calls', sa.Integer(), nullable=False),
+    sa.Column('errors', sa.Integer(), nullable=False),
+    sa.Column('cache_hits', sa.Integer(), nullable=False),
+    sa.Column('input_tokens', sa.Integer(), nullable=False),
+    sa.Column('output_tokens', sa.Integer(), nullable=False),
+    sa.Column('reasoning_tokens', sa.Integer(), nullable=False),
+    sa.Column('total_latency_ms', sa.Float(), nullable=False),
+    sa.Column('cost_usd', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_usage_id'), 'llm_usage', ['id'], unique=False)
+    op.create_index(op.f('ix_llm_usage_model_id'), 'llm_usage', ['model_id'], unique=False)
+    op.create_index(op.f('ix_llm_usage_period_start'), 'llm_usage', ['period_start'], unique=False)
+    op.create_index(op.f('ix_llm_usage_user_id'), 'llm_usage', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_llm_usage_user_id'), table_name='llm_usage')
+    op.drop_index(op.f('ix_llm_usage_period_start'), table_name='llm_usage')
+    op.drop_index(op.f('ix_llm_usage_model_id'), table_name='llm_usage')
+    op.drop_index(op.f('ix_llm_usage_id'), table_name='llm_usage')
+    op.drop_table('llm_usage')
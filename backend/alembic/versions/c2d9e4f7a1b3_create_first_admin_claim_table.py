@@ -0,0 +1,30 @@
+"""Create first_admin_claim table
+
+Revision ID: c2d9e4f7a1b3
+Revises: 8a1e5c0d2b67
+Create Date: 2026-10-17 21:02:11.418903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d9e4f7a1b3'
+down_revision = '8a1e5c0d2b67'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('first_admin_claim',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Existing installations already have their first user
+    op.execute("INSERT INTO first_admin_claim (id) SELECT 1 WHERE EXISTS (SELECT 1 FROM users)")
+
+
+def downgrade() -> None:
+    op.drop_table('first_admin_claim')
@@ -0,0 +1,36 @@
+"""Add user search indexes
+
+Revision ID: e5a7c1d9b2f4
+Revises: c2d9e4f7a1b3
+Create Date: 2026-10-17 22:14:36.201577
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c1d9b2f4'
+down_revision = 'c2d9e4f7a1b3'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_COLUMNS = ('email', 'username', 'full_name')
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f'ix_users_{column}_trgm', 'users', [column], unique=False,
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+            )
+    op.create_index('ix_users_role_is_active_id', 'users', ['role', 'is_active', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_role_is_active_id', table_name='users')
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in TRIGRAM_COLUMNS:
+            op.drop_index(f'ix_users_{column}_trgm', table_name='users')
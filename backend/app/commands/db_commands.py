@@ -1,8 +1,15 @@
+import asyncio
 import typer
 import logging
+from pathlib import Path
+from typing import Optional
+from app.db import AsyncSessionLocal, async_engine
 from app.db.init_db import init_db
 from app.db.populate_db import populate_db
 from app.db.run_migrations import run_migrations
+from app.crud.user import AsyncUserDAO
+from app.schemas.user import UserImportFormat
+from app.services.user_import_service import UserImportService, detect_import_format
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -66,5 +73,63 @@ def setup():
     logger.info("Database setup completed successfully!")
 
 
+
+@app.command("import-users")
+def import_users(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="CSV or JSONL file of users"),
+    file_format: Optional[UserImportFormat] = typer.Option(
+        None, "--format", help="File format (detected from the file extension by default)"
+    ),
+    cognito: bool = typer.Option(False, "--cognito", help="Also create the users in Cognito"),
+    send_invites: bool = typer.Option(
+        False, "--send-invites", help="Let Cognito email invitations (required with --cognito)"
+    ),
+    batch_size: int = typer.Option(500, "--batch-size", help="Rows per database round trip"),
+    concurrency: int = typer.Option(8, "--concurrency", help="Concurrent Cognito calls"),
+):
+    """
+    Bulk-create users from a CSV or JSONL file and print the result of every row.
+    CSV files need a header row with an email column; username, full_name and role are optional.
+    Users imported without --cognito complete onboarding by signing up with their email;
+    with --cognito they are invited by Cognito, so --send-invites is required.
+    """
+    if cognito and not send_invites:
+        raise typer.BadParameter("--cognito requires --send-invites", param_hint="--send-invites")
+
+    cognito_service = None
+    if cognito:
+        # Imported here so plain database imports do not need AWS configuration
+        from app.services.cognito_service import cognito_service
+
+    import_service = UserImportService(
+        AsyncUserDAO(), cognito_service, batch_size=batch_size, cognito_concurrency=concurrency
+    )
+    file_format = file_format or detect_import_format(path.name)
+
+    async def run_import():
+        try:
+            async with AsyncSessionLocal() as db:
+                with path.open(encoding="utf-8-sig", newline="") as f:
+                    return await import_service.import_users(
+                        db, f, file_format, create_in_cognito=cognito, send_invites=send_invites
+                    )
+        finally:
+            # Pooled connections belong to this event loop
+            await async_engine.dispose()
+
+    logger.info(f"Importing users from {path}...")
+    summary = asyncio.run(run_import())
+
+    for result in summary.results:
+        typer.echo(f"{result.row}\t{result.status.value}\t{result.email or ''}\t{result.detail or ''}")
+
+    logger.info(
+        f"Imported {summary.total} rows: {summary.created} created, {summary.duplicates} duplicates, "
+        f"{summary.invalid} invalid, {summary.failed} failed, {summary.cognito_orphans} Cognito orphans"
+    )
+    if summary.invalid or summary.failed or summary.cognito_orphans:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
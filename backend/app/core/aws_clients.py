@@ -0,0 +1,136 @@
+"""
+Process-wide registry of pooled boto3 clients.
+
+Building a boto3 client is expensive (endpoint resolution, credential chain, loader
+caches) and every client owns its own urllib3 connection pool, so services share
+one client per (service, region, endpoint, credentials, client config) instead of
+creating their own.
+
+This module deliberately does not import config_service: ConfigService itself uses
+the registry while it is being constructed.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config as BotoConfig
+
+
+def _fingerprint(secret: Optional[str]) -> Optional[str]:
+    """Hash a secret so it can be part of a registry key without being kept in it."""
+    if not secret:
+        return None
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+class AWSClientRegistry:
+    """Thread-safe cache of boto3 sessions and clients."""
+
+    def __init__(self, max_pool_connections: int = 50, tcp_keepalive: bool = True):
+        """
+        Initialize the registry.
+
+        Args:
+            max_pool_connections: Default connection pool size for every client
+            tcp_keepalive: Enable TCP keep-alive on pooled connections
+        """
+        self.max_pool_connections = max_pool_connections
+        self.tcp_keepalive = tcp_keepalive
+        self._sessions: Dict[Tuple, boto3.Session] = {}
+        self._clients: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_session(
+        self,
+        aws_access_key_id: Optional[str],
+        aws_secret_access_key: Optional[str],
+        aws_session_token: Optional[str],
+    ) -> boto3.Session:
+        # Called with the lock held: boto3 sessions are not thread-safe
+        key = (aws_access_key_id, _fingerprint(aws_secret_access_key), _fingerprint(aws_session_token))
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = boto3.Session(
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                aws_session_token=aws_session_token,
+            )
+        return session
+
+    def get_client(
+        self,
+        service_name: str,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+        aws_session_token: Optional[str] = None,
+        max_pool_connections: Optional[int] = None,
+        **config_options: Any,
+    ) -> Any:
+        """
+        Get a shared client, creating it on first use.
+
+        Args:
+            service_name: AWS service name (e.g. "bedrock-runtime")
+            region_name: AWS region
+            endpoint_url: Custom endpoint (e.g. LocalStack)
+            aws_access_key_id: Explicit access key (None uses the default credential chain)
+            aws_secret_access_key: Explicit secret key
+            aws_session_token: Explicit session token
+            max_pool_connections: Connection pool size (defaults to the registry setting)
+            **config_options: Extra botocore Config options (e.g. retries, read_timeout)
+
+        Returns:
+            A boto3 client; clients are thread-safe and may be shared freely
+        """
+        pool_size = max_pool_connections or self.max_pool_connections
+        key = (
+            service_name,
+            region_name,
+            endpoint_url,
+            aws_access_key_id,
+            _fingerprint(aws_secret_access_key),
+            _fingerprint(aws_session_token),
+            pool_size,
+            json.dumps(config_options, sort_keys=True, default=str),
+        )
+
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                session = self._get_session(aws_access_key_id, aws_secret_access_key, aws_session_token)
+                client = self._clients[key] = session.client(
+                    service_name,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=BotoConfig(
+                        max_pool_connections=pool_size,
+                        tcp_keepalive=self.tcp_keepalive,
+                        **config_options,
+                    ),
+                )
+            return client
+
+    def clear(self) -> None:
+        """Drop all cached sessions and clients."""
+        with self._lock:
+            self._clients.clear()
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+# Global instance
+aws_client_registry = AWSClientRegistry(
+    max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50")),
+    tcp_keepalive=os.getenv("AWS_TCP_KEEPALIVE", "True").lower() in ("true", "1", "t"),
+)
@@ -9,7 +9,6 @@ from pathlib import Path
 import logging
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
 
@@ -80,6 +79,30 @@ class ConfigService:
             "log_rotation": os.getenv("LOG_ROTATION", "20 MB"),
             "log_retention": os.getenv("LOG_RETENTION", "1 week"),
             "log_compression": os.getenv("LOG_COMPRESSION", "zip"),
+
+            # Bedrock client settings
+            "bedrock_requests_per_second": float(os.getenv("BEDROCK_REQUESTS_PER_SECOND", "20")),
+            "bedrock_max_attempts": int(os.getenv("BEDROCK_MAX_ATTEMPTS", "4")),
+            "llm_context_max_tokens": int(os.getenv("LLM_CONTEXT_MAX_TOKENS", "8000")),
+            "llm_metrics_flush_interval_seconds": float(os.getenv("LLM_METRICS_FLUSH_INTERVAL_SECONDS", "60")),
+
+            # JWT validation
+            "jwt_cache_max_entries": int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000")),
+            "jwt_cache_ttl_seconds": float(os.getenv("JWT_CACHE_TTL_SECONDS", "300")),
+            "jwks_refresh_interval_seconds": float(os.getenv("JWKS_REFRESH_INTERVAL_SECONDS", "3600")),
+            "jwks_min_refetch_interval_seconds": float(os.getenv("JWKS_MIN_REFETCH_INTERVAL_SECONDS", "30")),
+            "identity_cache_max_entries": int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000")),
+            "identity_cache_ttl_seconds": float(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "30")),
+            "cognito_max_concurrency": int(os.getenv("COGNITO_MAX_CONCURRENCY", "16")),
+            "cognito_timeout_seconds": float(os.getenv("COGNITO_TIMEOUT_SECONDS", "10")),
+
+            # Database connection pool
+            "db_pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+            "db_max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            "db_pool_timeout_seconds": float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")),
+            "db_pool_recycle_seconds": int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")),
+            "db_pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "True").lower() in ("true", "1", "t"),
+            "db_pgbouncer_mode": os.getenv("DB_PGBOUNCER_MODE", "False").lower() in ("true", "1", "t"),
         }
 
     def _load_aws_secrets(self) -> None:
@@ -94,12 +117,10 @@ class ConfigService:
             # Get AWS region from environment or use default
             region_name = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
 
-            # Create a Secrets Manager client
-            session = boto3.Session()
-            client = session.client(
-                service_name="secretsmanager",
-                region_name=region_name
-            )
+            # Get the shared Secrets Manager client. Imported here so the registry
+            # reads its pool settings after the .env file has been loaded.
+            from app.core.aws_clients import aws_client_registry
+            client = aws_client_registry.get_client("secretsmanager", region_name=region_name)
 
             logger.info(f"Loading secrets from AWS Secrets Manager: {secret_name}")
 
@@ -228,6 +249,33 @@ class ConfigService:
 
         return f"postgresql://{username}:{password}@{host}:{port}/{name}"
 
+    def get_async_database_url(self) -> str:
+        """
+        Get the database URL with an async driver (asyncpg for PostgreSQL,
+        aiosqlite for SQLite) for the async engine.
+        """
+        url = self.get_database_url()
+        for sync_prefix, async_prefix in (
+            ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+            ("postgresql://", "postgresql+asyncpg://"),
+            ("postgres://", "postgresql+asyncpg://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix):]
+        return url
+
+    def get_database_pool_config(self) -> Dict[str, Any]:
+        """Get connection pool settings for the database engines"""
+        return {
+            "pool_size": self.get("db_pool_size", 10),
+            "max_overflow": self.get("db_max_overflow", 20),
+            "pool_timeout": self.get("db_pool_timeout_seconds", 30.0),
+            "pool_recycle": self.get("db_pool_recycle_seconds", 1800),
+            "pool_pre_ping": self.get("db_pool_pre_ping", True),
+            "pgbouncer_mode": self.get("db_pgbouncer_mode", False),
+        }
+
     def get_secret_key(self) -> str:
         """Get the secret key for JWT tokens and other security features"""
         return self.get("security.secret_key", "your_secret_key_here")
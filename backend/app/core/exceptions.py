@@ -49,6 +49,16 @@ class UserAlreadyExistsError(AppException):
     pass
 
 
+class LLMError(AppException):
+    """Raised when an LLM call fails."""
+    pass
+
+
+class LLMThrottledError(LLMError):
+    """Raised when an LLM call is still throttled after all retries."""
+    pass
+
+
 # Cognito-specific error mappings
 COGNITO_ERROR_MESSAGES = {
     "UserNotFoundException": "User not found. Please check your email address.",
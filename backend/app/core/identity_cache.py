@@ -0,0 +1,282 @@
+"""
+Cache of authenticated users.
+
+get_current_user resolves the token's user_sub/username to a UserResponse on every
+request. The result is kept for a short TTL so a typical API call costs no database
+round trip for authentication. The user DAOs' update and delete invalidate the user
+locally and, on PostgreSQL, publish a NOTIFY that other workers receive through
+IdentityInvalidationListener, so role or is_active changes apply everywhere at once.
+"""
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config_service import config_service
+from app.core.logging_service import get_logger
+from app.schemas.user import UserResponse
+
+logger = get_logger(__name__)
+
+# PostgreSQL channel carrying the ids of changed users
+INVALIDATION_CHANNEL = "user_identity_changed"
+
+
+class IdentityCache:
+    """Bounded LRU of UserResponse keyed by Cognito sub and username, with a short TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of lookup keys kept
+            ttl_seconds: How long a user is served from the cache (bounds staleness if a
+                change notification is missed)
+            clock: Monotonic clock, injectable for tests
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, UserResponse]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter bumped by every invalidation.
+
+        Read it before loading a user from the database and pass it to set(), so a
+        result loaded before a concurrent update is not cached after its invalidation.
+        """
+        return self._generation
+
+    @staticmethod
+    def _lookup_keys(user_sub: Optional[str], username: Optional[str]) -> Tuple[str, ...]:
+        keys = []
+        if user_sub:
+            keys.append(f"sub:{user_sub}")
+        if username:
+            keys.append(f"username:{username}")
+        return tuple(keys)
+
+    def get(self, user_sub: Optional[str] = None, username: Optional[str] = None) -> Optional[UserResponse]:
+        """Get the cached user for a token's sub or username, or None."""
+        now = self._clock()
+        with self._lock:
+            for key in self._lookup_keys(user_sub, username):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, user = entry
+                if expires_at <= now:
+                    self._remove_key(key)
+                    continue
+                self._entries.move_to_end(key)
+                return user
+        return None
+
+    def set(
+        self,
+        user: UserResponse,
+        user_sub: Optional[str] = None,
+        username: Optional[str] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache a user under the sub/username it was looked up by.
+
+        Args:
+            user: User loaded from the database
+            user_sub: Cognito sub from the token
+            username: Username from the token
+            generation: Value of generation read before the database lookup; the user is
+                not cached if an invalidation happened since
+        """
+        keys = self._lookup_keys(user_sub, username)
+        if not keys:
+            return
+
+        expires_at = self._clock() + self.ttl_seconds
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            for key in keys:
+                self._remove_key(key)
+                self._entries[key] = (expires_at, user)
+                self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove_key(next(iter(self._entries)))
+
+    def _remove_key(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].id
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+    def invalidate(self, user_id: int) -> int:
+        """
+        Forget a user under every key it was cached by.
+
+        Returns:
+            Number of keys removed
+        """
+        with self._lock:
+            self._generation += 1
+            keys = self._keys_by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached users."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def publish_user_change(db: Session, user_id: int) -> None:
+    """
+    Tell other workers that a user changed.
+
+    Must run inside the transaction making the change: PostgreSQL delivers the
+    notification only when it commits. A no-op on other databases.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": INVALIDATION_CHANNEL, "payload": str(user_id)},
+    )
+
+
+async def apublish_user_change(db: AsyncSession, user_id: int) -> None:
+    """Async variant of publish_user_change for an AsyncSession."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": INVALIDATION_CHANNEL, "payload": str(user_id)},
+    )
+
+
+class IdentityInvalidationListener:
+    """Background thread that LISTENs for user changes and invalidates the local cache."""
+
+    def __init__(
+        self,
+        cache: IdentityCache,
+        database_url: Optional[str] = None,
+        poll_timeout_seconds: float = 5.0,
+        reconnect_delay_seconds: float = 5.0,
+    ):
+        """
+        Initialize the listener.
+
+        Args:
+            cache: Cache to invalidate
+            database_url: PostgreSQL URL (defaults to the application database)
+            poll_timeout_seconds: How often the thread checks whether it should stop
+            reconnect_delay_seconds: Wait before reconnecting after a lost connection
+        """
+        self.cache = cache
+        self.database_url = database_url or config_service.get_database_url()
+        self.poll_timeout_seconds = poll_timeout_seconds
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        connection = psycopg2.connect(self.database_url)
+        connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+        return connection
+
+    def handle_notification(self, payload: str) -> None:
+        """Invalidate the user named by a notification payload."""
+        try:
+            user_id = int(payload)
+        except ValueError:
+            logger.warning(f"Ignoring invalid user change notification: {payload!r}")
+            return
+        self.cache.invalidate(user_id)
+
+    def _listen(self) -> None:
+        connection = self._connect()
+        # Changes made while disconnected were missed
+        self.cache.clear()
+        logger.info(f"Listening for user changes on channel {INVALIDATION_CHANNEL}")
+        try:
+            while not self._stop_event.is_set():
+                if select.select([connection], [], [], self.poll_timeout_seconds) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self.handle_notification(connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+    def start(self) -> None:
+        """Start listening in a background thread (only for PostgreSQL databases)."""
+        if not self.database_url.startswith("postgresql"):
+            logger.info("User change notifications require PostgreSQL; relying on the identity cache TTL")
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run() -> None:
+            while not self._stop_event.is_set():
+                try:
+                    self._listen()
+                except Exception as e:
+                    logger.error(f"User change listener failed: {e}")
+                    self._stop_event.wait(self.reconnect_delay_seconds)
+
+        self._thread = threading.Thread(target=run, name="identity-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background listener."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout_seconds + 1)
+            self._thread = None
+
+
+# Global instances
+identity_cache = IdentityCache(
+    max_entries=config_service.get("identity_cache_max_entries", 10_000),
+    ttl_seconds=config_service.get("identity_cache_ttl_seconds", 30.0),
+)
+identity_invalidation_listener = IdentityInvalidationListener(identity_cache)
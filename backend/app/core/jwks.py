@@ -0,0 +1,224 @@
+"""
+JSON Web Key Set store for JWT signature verification.
+
+Keys are parsed once into ready-to-use key objects indexed by kid and refreshed in
+the background, so verifying a token never converts a JWK or waits on the network
+in the common case. An unknown kid (e.g. after a key rotation) triggers at most one
+refetch per min_refetch_interval_seconds.
+
+The async path (aget_key) fetches with a shared httpx.AsyncClient and de-duplicates
+concurrent misses into a single download, so it never blocks the event loop.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+import requests
+from jose import jwk
+from jose.backends.base import Key
+from jose.constants import ALGORITHMS
+
+from app.core.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+class JWKSKeyStore:
+    """Thread-safe, self-refreshing store of parsed signing keys."""
+
+    def __init__(
+        self,
+        jwks_url: str,
+        refresh_interval_seconds: float = 3600.0,
+        min_refetch_interval_seconds: float = 30.0,
+        fetch_timeout_seconds: float = 10.0,
+        fetcher: Optional[Callable[[str], Dict[str, Any]]] = None,
+        async_fetcher: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            jwks_url: URL of the JWKS document
+            refresh_interval_seconds: How often the background thread refetches the keys
+            min_refetch_interval_seconds: Minimum time between fetches triggered by unknown kids
+            fetch_timeout_seconds: HTTP timeout for a fetch
+            fetcher: Callable returning the JWKS document for a URL (defaults to an HTTP GET)
+            async_fetcher: Coroutine function used by the async path (defaults to httpx.AsyncClient)
+            clock: Monotonic clock, injectable for tests
+        """
+        self.jwks_url = jwks_url
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.min_refetch_interval_seconds = min_refetch_interval_seconds
+        self.fetch_timeout_seconds = fetch_timeout_seconds
+        self._fetcher = fetcher or self._http_fetch
+        self._async_fetcher = async_fetcher or self._async_http_fetch
+        self._clock = clock
+        self._keys: Dict[str, Key] = {}
+        self._last_fetch: Optional[float] = None
+        self._fetch_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[requests.Session] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._refresh_task: Optional["asyncio.Future[bool]"] = None
+
+    def _http_fetch(self, url: str) -> Dict[str, Any]:
+        if self._session is None:
+            self._session = requests.Session()
+        response = self._session.get(url, timeout=self.fetch_timeout_seconds)
+        response.raise_for_status()
+        return response.json()
+
+    async def _async_http_fetch(self, url: str) -> Dict[str, Any]:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self.fetch_timeout_seconds)
+        response = await self._async_client.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def parse_jwks(jwks: Dict[str, Any]) -> Dict[str, Key]:
+        """Parse a JWKS document into key objects indexed by kid, skipping unusable keys."""
+        keys: Dict[str, Key] = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, algorithm=key_data.get("alg", ALGORITHMS.RS256))
+            except Exception as e:
+                logger.warning(f"Skipping unusable JWK {kid}: {e}")
+        return keys
+
+    def load(self, jwks: Dict[str, Any]) -> None:
+        """Replace the keys with those parsed from a JWKS document."""
+        keys = self.parse_jwks(jwks)
+        # Swapping the dict is atomic, so readers never need the lock
+        self._keys = keys
+        self._last_fetch = self._clock()
+
+    def refresh(self) -> bool:
+        """
+        Fetch and parse the JWKS now.
+
+        Returns:
+            True on success; on failure the previous keys are kept
+        """
+        with self._fetch_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        try:
+            self.load(self._fetcher(self.jwks_url))
+            logger.info(f"Loaded {len(self._keys)} signing keys from JWKS")
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to fetch JWKS: {e}")
+            # Counts as an attempt so a failing endpoint is not hammered on every kid miss
+            self._last_fetch = self._clock()
+            return False
+
+    def _refetch_due(self) -> bool:
+        return self._last_fetch is None or self._clock() - self._last_fetch >= self.min_refetch_interval_seconds
+
+    def get_key(self, kid: str, refetch: bool = True) -> Key:
+        """
+        Get the signing key for a kid.
+
+        An unknown kid triggers a refetch unless one happened within
+        min_refetch_interval_seconds; concurrent misses share a single fetch.
+
+        Args:
+            kid: Key ID from the token header
+            refetch: Allow a blocking refetch on a miss (False only looks up known keys)
+
+        Raises:
+            KeyError: If no key with this kid exists after the refetch
+        """
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        if refetch:
+            with self._fetch_lock:
+                if kid not in self._keys and self._refetch_due():
+                    self._refresh_locked()
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise KeyError(f"Unable to find signing key with kid: {kid}")
+        return key
+
+    async def arefresh(self) -> bool:
+        """Async variant of refresh that does not block the event loop."""
+        try:
+            jwks = await self._async_fetcher(self.jwks_url)
+            self.load(jwks)
+            logger.info(f"Loaded {len(self._keys)} signing keys from JWKS")
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to fetch JWKS: {e}")
+            self._last_fetch = self._clock()
+            return False
+
+    async def aget_key(self, kid: str) -> Key:
+        """
+        Async variant of get_key.
+
+        All coroutines missing a kid at the same time await one shared download.
+
+        Raises:
+            KeyError: If no key with this kid exists after the refetch
+        """
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = None
+            if self._refetch_due():
+                task = self._refresh_task = asyncio.ensure_future(self.arefresh())
+        if task is not None:
+            # Shielded so a cancelled request does not cancel the download others wait on
+            await asyncio.shield(task)
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise KeyError(f"Unable to find signing key with kid: {kid}")
+        return key
+
+    def start(self) -> None:
+        """Load the keys and keep them fresh from a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run() -> None:
+            self.refresh()
+            while not self._stop_event.wait(self.refresh_interval_seconds):
+                self.refresh()
+
+        self._thread = threading.Thread(target=run, name="jwks-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.fetch_timeout_seconds)
+            self._thread = None
+
+    async def aclose(self) -> None:
+        """Stop the background refresh and close the async HTTP client."""
+        self.stop()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
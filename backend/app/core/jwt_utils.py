@@ -1,18 +1,26 @@
 """
 JWT utilities for token validation and user authentication.
 """
-import requests
-from typing import Dict, Optional, Any
+from enum import Enum
+from typing import Dict, Optional, Any, Tuple
 from datetime import datetime, timezone
 from jose import JWTError, jwt as jose_jwt
-from jose.constants import ALGORITHMS
+from jose.backends.base import Key
 from app.core.config_service import config_service
+from app.core.jwks import JWKSKeyStore
 from app.core.logging_service import get_logger
+from app.core.token_cache import VerifiedTokenCache
 from app.schemas.auth import TokenData
 
 logger = get_logger(__name__)
 
 
+class TokenIssuer(str, Enum):
+    """Verifier a token is routed to"""
+    COGNITO = "cognito"
+    LOCAL = "local"
+
+
 class JWTValidator:
     """JWT token validator for Cognito tokens with dev mode fallback"""
 
@@ -20,7 +28,15 @@ class JWTValidator:
         self.cognito_config = config_service.get_cognito_config()
         self.is_localstack = config_service.is_localstack_enabled()
         self.is_development = config_service.is_development()
-        self._jwks_cache: Optional[Dict[str, Any]] = None
+        self.key_store = JWKSKeyStore(
+            self._get_jwks_url(),
+            refresh_interval_seconds=config_service.get("jwks_refresh_interval_seconds", 3600.0),
+            min_refetch_interval_seconds=config_service.get("jwks_min_refetch_interval_seconds", 30.0)
+        )
+        self.token_cache = VerifiedTokenCache(
+            max_entries=config_service.get("jwt_cache_max_entries", 10_000),
+            max_ttl_seconds=config_service.get("jwt_cache_ttl_seconds", 300.0)
+        )
 
     def _get_jwks_url(self) -> str:
         """Get the JWKS URL for token validation"""
@@ -33,80 +49,137 @@ class JWTValidator:
             user_pool_id = self.cognito_config["user_pool_id"]
             return f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}/.well-known/jwks.json"
 
-    def _get_jwks(self) -> Dict[str, Any]:
-        """Get JSON Web Key Set (JWKS) for token validation"""
-        if self._jwks_cache is None:
-            try:
-                jwks_url = self._get_jwks_url()
-                response = requests.get(jwks_url, timeout=10)
-                response.raise_for_status()
-                self._jwks_cache = response.json()
-                logger.info("Successfully fetched JWKS")
-            except Exception as e:
-                logger.exception(f"Failed to fetch JWKS: {e}")
-                raise Exception("Failed to fetch JWKS for token validation")
-        
-        # At this point, _jwks_cache cannot be None because we either
-        # have a previously cached value or we just set it (or raised an exception)
-        assert self._jwks_cache is not None
-        return self._jwks_cache
-
-    def _get_signing_key(self, token_header: Dict[str, Any]) -> str:
-        """Get the signing key for token validation"""
-        jwks = self._get_jwks()
-        
-        # Find the key that matches the token's kid
+    def _get_expected_issuer(self) -> Optional[str]:
+        """Issuer claim of tokens from the configured user pool (None when not checked)"""
+        if self.is_localstack or not self.cognito_config["user_pool_id"]:
+            return None
+        region = self.cognito_config["region"]
+        return f"https://cognito-idp.{region}.amazonaws.com/{self.cognito_config['user_pool_id']}"
+
+    def start(self) -> None:
+        """Load the signing keys in the background and keep them refreshed"""
+        if self.cognito_config["user_pool_id"]:
+            self.key_store.start()
+
+    def stop(self) -> None:
+        """Stop refreshing the signing keys"""
+        self.key_store.stop()
+
+    async def aclose(self) -> None:
+        """Stop refreshing the signing keys and release the async HTTP client"""
+        await self.key_store.aclose()
+
+    def _get_signing_key(self, token_header: Dict[str, Any], refetch: bool = True) -> Key:
+        """Get the parsed signing key for the token's kid"""
         kid = token_header.get("kid")
         if not kid:
             raise Exception("Token header missing 'kid' field")
 
-        for key in jwks.get("keys", []):
-            if key.get("kid") == kid:
-                # Convert JWK to PEM format
-                from jose.backends.rsa_backend import RSAKey
-                return RSAKey(key, ALGORITHMS.RS256).to_pem().decode('utf-8')
-        
-        raise Exception(f"Unable to find signing key with kid: {kid}")
+        return self.key_store.get_key(kid, refetch=refetch)
+
+    def _dispatch(self, token: str) -> Tuple[TokenIssuer, Dict[str, Any]]:
+        """
+        Pick the verifier for a token from its unverified header (alg, kid) and issuer,
+        so each token is checked by exactly one verifier.
+        """
+        try:
+            header = jose_jwt.get_unverified_header(token)
+        except JWTError:
+            raise Exception("Token validation failed: Invalid token format")
+
+        alg = header.get("alg", "")
+        if alg.startswith("HS"):
+            if not self.is_development:
+                raise Exception("Token validation failed: Invalid Cognito token")
+            return TokenIssuer.LOCAL, header
+
+        if alg == "RS256" and header.get("kid"):
+            # Reject foreign tokens before they can trigger a JWKS refetch for an unknown kid
+            expected_issuer = self._get_expected_issuer()
+            if expected_issuer is not None:
+                try:
+                    issuer = jose_jwt.get_unverified_claims(token).get("iss")
+                except JWTError:
+                    raise Exception("Token validation failed: Invalid Cognito token")
+                if issuer is not None and issuer != expected_issuer:
+                    raise Exception("Token validation failed: Invalid Cognito token")
+            return TokenIssuer.COGNITO, header
+
+        if self.is_development:
+            raise Exception("Token validation failed: Invalid token format")
+        raise Exception("Token validation failed: Invalid Cognito token")
 
     def validate_token(self, token: str) -> TokenData:
         """
         Validate JWT token and return token data.
-        Tries Cognito validation first, then falls back to local token validation in dev mode.
+        Cognito (RS256) tokens are verified against the user pool keys; local (HS256) tokens
+        are accepted in dev mode only. Verified tokens are cached until they expire, so
+        repeated requests skip signature checks.
         """
-        # First, try to validate as Cognito token
+        token_data = self.token_cache.get(token)
+        if token_data is not None:
+            return token_data
+
+        token_data = self._validate_uncached(token)
+        self.token_cache.set(token, token_data, token_data.exp)
+        return token_data
+
+    async def avalidate_token(self, token: str) -> TokenData:
+        """
+        Async variant of validate_token for use on the event loop.
+        A missing signing key is fetched without blocking, shared by concurrent requests.
+        """
+        token_data = self.token_cache.get(token)
+        if token_data is not None:
+            return token_data
+
+        issuer, header = self._dispatch(token)
+        if issuer == TokenIssuer.COGNITO:
+            try:
+                await self.key_store.aget_key(header["kid"])
+            except KeyError as e:
+                # Reported by the validation below, which only uses keys already loaded
+                logger.debug(f"Signing key lookup failed: {e}")
+
+        token_data = self._verify(token, issuer, header, refetch_keys=False)
+        self.token_cache.set(token, token_data, token_data.exp)
+        return token_data
+
+    def _validate_uncached(self, token: str) -> TokenData:
+        """Fully validate a token (signature, claims and expiry)"""
+        issuer, header = self._dispatch(token)
+        return self._verify(token, issuer, header)
+
+    def _verify(
+        self,
+        token: str,
+        issuer: TokenIssuer,
+        header: Dict[str, Any],
+        refetch_keys: bool = True
+    ) -> TokenData:
+        """Run the verifier selected by _dispatch"""
+        if issuer == TokenIssuer.LOCAL:
+            try:
+                return self._validate_local_token(token)
+            except Exception as local_error:
+                logger.debug(f"Local token validation failed: {local_error}")
+                raise Exception("Token validation failed: Invalid token format")
+
         try:
-            return self._validate_cognito_token(token)
+            return self._validate_cognito_token(token, refetch_keys=refetch_keys, unverified_header=header)
         except Exception as cognito_error:
             logger.debug(f"Cognito token validation failed: {cognito_error}")
-
-            # In development mode, try local token validation as fallback
-            if self.is_development:
-                try:
-                    return self._validate_local_token(token)
-                except Exception as local_error:
-                    logger.debug(f"Local token validation failed: {local_error}")
-                    raise Exception("Token validation failed: Invalid token format")
-            else:
-                # In production, only Cognito tokens are allowed
-                raise Exception("Token validation failed: Invalid Cognito token")
-
-    def _validate_cognito_token(self, token: str) -> TokenData:
+            raise Exception("Token validation failed: Invalid Cognito token")
+
+    def _validate_cognito_token(
+        self,
+        token: str,
+        refetch_keys: bool = True,
+        unverified_header: Optional[Dict[str, Any]] = None
+    ) -> TokenData:
         """Validate Cognito JWT token"""
         try:
-            # Decode token header to get key ID
-            unverified_header = jose_jwt.get_unverified_header(token)
-
-            # Get signing key
-            signing_key = self._get_signing_key(unverified_header)
-
-            # Verify and decode token
-            payload = jose_jwt.decode(
-                token,
-                signing_key,
-                algorithms=["RS256"],
-                audience=self.cognito_config["client_id"],
-                options={"verify_exp": True}
-            )
+            payload = self._decode_cognito_token(token, refetch_keys, unverified_header)
 
             # Extract token data
             username = payload.get("cognito:username") or payload.get("username")
@@ -128,7 +201,8 @@ class JWTValidator:
             return TokenData(
                 username=username,
                 user_sub=user_sub,
-                email=email
+                email=email,
+                exp=int(exp) if exp else None
             )
 
         except JWTError as e:
@@ -138,6 +212,56 @@ class JWTValidator:
             logger.error(f"Cognito token validation failed: {e}")
             raise Exception("Cognito token validation failed")
 
+    def _decode_cognito_token(
+        self,
+        token: str,
+        refetch_keys: bool = True,
+        unverified_header: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Verify a Cognito token's signature, audience and expiry and return its claims"""
+        # Decode token header to get key ID
+        if unverified_header is None:
+            unverified_header = jose_jwt.get_unverified_header(token)
+
+        # Get signing key
+        signing_key = self._get_signing_key(unverified_header, refetch=refetch_keys)
+
+        # Verify and decode token
+        return jose_jwt.decode(
+            token,
+            signing_key,
+            algorithms=["RS256"],
+            audience=self.cognito_config["client_id"],
+            options={"verify_exp": True}
+        )
+
+    async def averify_id_token(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a Cognito ID token (e.g. the one returned by InitiateAuth) and return its claims.
+
+        Raises:
+            Exception: If the token is not a valid ID token of the configured user pool
+        """
+        issuer, header = self._dispatch(token)
+        if issuer != TokenIssuer.COGNITO:
+            raise Exception("Token validation failed: Not a Cognito token")
+
+        try:
+            await self.key_store.aget_key(header["kid"])
+        except KeyError as e:
+            # Reported by the verification below, which only uses keys already loaded
+            logger.debug(f"Signing key lookup failed: {e}")
+
+        try:
+            claims = self._decode_cognito_token(token, refetch_keys=False, unverified_header=header)
+        except Exception as e:
+            logger.debug(f"Cognito ID token verification failed: {e}")
+            raise Exception("Token validation failed: Invalid Cognito token")
+
+        if claims.get("token_use") != "id":
+            raise Exception("Token validation failed: Not an ID token")
+        return claims
+
     def _validate_local_token(self, token: str) -> TokenData:
         """Validate local development token (only in dev mode)"""
         if not self.is_development:
@@ -164,7 +288,8 @@ class JWTValidator:
             return TokenData(
                 username=username,
                 user_sub=user_sub,
-                email=email
+                email=email,
+                exp=int(exp) if exp else None
             )
 
         except JWTError as e:
@@ -174,6 +299,10 @@ class JWTValidator:
             logger.error(f"Local token validation failed: {e}")
             raise Exception("Local token validation failed")
 
+    def revoke_token(self, token: str) -> None:
+        """Stop trusting a cached verification of this token (e.g. on sign-out)"""
+        self.token_cache.revoke_token(token)
+
     def decode_token_without_verification(self, token: str) -> Dict[str, Any]:
         """Decode token without verification (for debugging)"""
         try:
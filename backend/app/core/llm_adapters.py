@@ -0,0 +1,186 @@
+"""
+Native InvokeModel request/response adapters for each Bedrock model family.
+
+Each adapter precompiles the JSON request body for a given LLMConfig into a prefix and
+suffix around the prompt, so building a request is a single escape-and-concatenate
+instead of assembling and serializing a dict on every call.
+"""
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple, Type
+
+from app.core.llm_service import LLMConfig, LLMStreamEvent, ModelFamily
+
+# Marker substituted with the prompt when a template is compiled
+_PROMPT_PLACEHOLDER = "\u0000prompt\u0000"
+
+
+def _compile_template(template: Dict[str, Any]) -> Tuple[str, str]:
+    """Serialize a request template once and split it around the prompt placeholder."""
+    serialized = json.dumps(template, separators=(",", ":"))
+    prefix, suffix = serialized.split(json.dumps(_PROMPT_PLACEHOLDER)[1:-1])
+    return prefix, suffix
+
+
+class NativeModelAdapter(ABC):
+    """Builds InvokeModel request bodies and parses responses for one model family."""
+
+    family: ModelFamily
+
+    def __init__(self, config: LLMConfig):
+        """
+        Initialize the adapter and precompile its request template.
+
+        Args:
+            config: Inference settings baked into the template
+        """
+        self.config = config
+        self._prefix, self._suffix = _compile_template(self._request_template(config))
+
+    @abstractmethod
+    def _request_template(self, config: LLMConfig) -> Dict[str, Any]:
+        """Request body with _PROMPT_PLACEHOLDER inside a string where the prompt goes."""
+
+    def build_body(self, message: str) -> str:
+        """Serialized request body for a single user message."""
+        return self._prefix + json.dumps(message)[1:-1] + self._suffix
+
+    @abstractmethod
+    def parse_response(self, body: Dict[str, Any]) -> str:
+        """Extract the generated text from an InvokeModel response body."""
+
+    @abstractmethod
+    def parse_usage(self, body: Dict[str, Any]) -> Tuple[int, int]:
+        """Extract (input_tokens, output_tokens) from an InvokeModel response body."""
+
+    @abstractmethod
+    def parse_stream_chunk(self, chunk: Dict[str, Any]) -> Optional[LLMStreamEvent]:
+        """Translate an InvokeModelWithResponseStream chunk into a stream event."""
+
+
+class ClaudeAdapter(NativeModelAdapter):
+    """Anthropic Messages API on Bedrock."""
+
+    family = ModelFamily.CLAUDE
+
+    def _request_template(self, config: LLMConfig) -> Dict[str, Any]:
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": config.max_tokens,
+            "temperature": config.temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [{"type": "text", "text": _PROMPT_PLACEHOLDER}],
+                }
+            ],
+        }
+
+    def parse_response(self, body: Dict[str, Any]) -> str:
+        for block in body.get("content", []):
+            if block.get("type", "text") == "text":
+                return block["text"]
+        raise ValueError(f"Could not extract response text from: {body}")
+
+    def parse_usage(self, body: Dict[str, Any]) -> Tuple[int, int]:
+        usage = body.get("usage") or {}
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    def parse_stream_chunk(self, chunk: Dict[str, Any]) -> Optional[LLMStreamEvent]:
+        chunk_type = chunk.get("type")
+        if chunk_type == "content_block_delta":
+            delta = chunk.get("delta", {})
+            if delta.get("type") == "text_delta":
+                return LLMStreamEvent(text=delta.get("text", ""))
+            if delta.get("type") == "thinking_delta":
+                return LLMStreamEvent(reasoning_text=delta.get("thinking", ""))
+        elif chunk_type == "message_delta":
+            stop_reason = chunk.get("delta", {}).get("stop_reason")
+            if stop_reason:
+                return LLMStreamEvent(stop_reason=stop_reason)
+        return None
+
+
+class LlamaAdapter(NativeModelAdapter):
+    """Meta Llama 3 instruct models, prompted with the Llama 3 chat template."""
+
+    family = ModelFamily.LLAMA
+
+    def _request_template(self, config: LLMConfig) -> Dict[str, Any]:
+        template = {
+            "prompt": (
+                "<|begin_of_text|><|start_header_id|>user<|end_header_id|>\n\n"
+                f"{_PROMPT_PLACEHOLDER}<|eot_id|>"
+                "<|start_header_id|>assistant<|end_header_id|>\n\n"
+            ),
+            "max_gen_len": config.max_tokens,
+            "temperature": config.temperature,
+        }
+        if config.top_p is not None:
+            template["top_p"] = config.top_p
+        return template
+
+    def parse_response(self, body: Dict[str, Any]) -> str:
+        if "generation" not in body:
+            raise ValueError(f"Could not extract response text from: {body}")
+        return body["generation"]
+
+    def parse_usage(self, body: Dict[str, Any]) -> Tuple[int, int]:
+        return body.get("prompt_token_count", 0), body.get("generation_token_count", 0)
+
+    def parse_stream_chunk(self, chunk: Dict[str, Any]) -> Optional[LLMStreamEvent]:
+        text = chunk.get("generation") or ""
+        stop_reason = chunk.get("stop_reason")
+        if text or stop_reason:
+            return LLMStreamEvent(text=text, stop_reason=stop_reason)
+        return None
+
+
+class NovaAdapter(NativeModelAdapter):
+    """Amazon Nova models (messages-v1 schema)."""
+
+    family = ModelFamily.NOVA
+
+    def _request_template(self, config: LLMConfig) -> Dict[str, Any]:
+        inference_config = {"maxTokens": config.max_tokens, "temperature": config.temperature}
+        if config.top_p is not None:
+            inference_config["topP"] = config.top_p
+        return {
+            "schemaVersion": "messages-v1",
+            "messages": [{"role": "user", "content": [{"text": _PROMPT_PLACEHOLDER}]}],
+            "inferenceConfig": inference_config,
+        }
+
+    def parse_response(self, body: Dict[str, Any]) -> str:
+        try:
+            return body["output"]["message"]["content"][0]["text"]
+        except (KeyError, IndexError) as e:
+            raise ValueError(f"Could not extract response text from: {body}") from e
+
+    def parse_usage(self, body: Dict[str, Any]) -> Tuple[int, int]:
+        usage = body.get("usage") or {}
+        return usage.get("inputTokens", 0), usage.get("outputTokens", 0)
+
+    def parse_stream_chunk(self, chunk: Dict[str, Any]) -> Optional[LLMStreamEvent]:
+        if "contentBlockDelta" in chunk:
+            text = chunk["contentBlockDelta"].get("delta", {}).get("text")
+            if text:
+                return LLMStreamEvent(text=text)
+        elif "messageStop" in chunk:
+            return LLMStreamEvent(stop_reason=chunk["messageStop"].get("stopReason"))
+        return None
+
+
+NATIVE_ADAPTERS: Dict[ModelFamily, Type[NativeModelAdapter]] = {
+    ModelFamily.CLAUDE: ClaudeAdapter,
+    ModelFamily.LLAMA: LlamaAdapter,
+    ModelFamily.NOVA: NovaAdapter,
+}
+
+
+def create_native_adapter(family: ModelFamily, config: LLMConfig) -> NativeModelAdapter:
+    """Create the native adapter for a model family."""
+    adapter_class = NATIVE_ADAPTERS.get(family)
+    if adapter_class is None:
+        raise ValueError(f"Native API not implemented for model family: {family}")
+    return adapter_class(config)
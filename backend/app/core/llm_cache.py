@@ -0,0 +1,234 @@
+"""
+Response cache for LLM calls.
+Provides an in-process LRU tier with TTL and an optional database tier shared across workers.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+def make_cache_key(model_id: str, config: BaseModel, kind: str, payload: Any) -> str:
+    """
+    Build a stable cache key for an LLM call.
+
+    Args:
+        model_id: Bedrock model ID
+        config: LLMConfig used for the call (temperature, top_p, max_tokens, reasoning)
+        kind: API used for the call ("converse" or "generate")
+        payload: JSON-serializable request content (serialized messages or the prompt)
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON form of the inputs
+    """
+    canonical = json.dumps(
+        {
+            "model_id": str(model_id),
+            "config": config.model_dump(mode="json"),
+            "kind": kind,
+            "payload": payload,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CacheStats(BaseModel):
+    """Hit/miss counters for the response cache."""
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.persistent_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DatabaseLLMCacheStore:
+    """
+    Database-backed cache tier shared by all workers.
+    Failures are logged and treated as misses so the cache never breaks an LLM call.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            session_factory: Callable returning a new Session (defaults to app.db.SessionLocal)
+        """
+        if session_factory is None:
+            from app.db import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a non-expired cached response by key."""
+        from app.models.llm_cache import LLMCacheEntry
+
+        db = self.session_factory()
+        try:
+            entry = (
+                db.query(LLMCacheEntry)
+                .filter(LLMCacheEntry.cache_key == key, LLMCacheEntry.expires_at > datetime.now(timezone.utc))
+                .first()
+            )
+            return dict(entry.response) if entry else None
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def set(self, key: str, model_id: str, value: Dict[str, Any], ttl_seconds: float) -> None:
+        """Store a response under key, replacing any previous entry."""
+        from app.models.llm_cache import LLMCacheEntry
+
+        db = self.session_factory()
+        try:
+            db.merge(LLMCacheEntry(
+                cache_key=key,
+                model_id=str(model_id),
+                response=value,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"LLM cache write failed: {e}")
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return the number removed."""
+        from app.models.llm_cache import LLMCacheEntry
+
+        db = self.session_factory()
+        try:
+            removed = (
+                db.query(LLMCacheEntry)
+                .filter(LLMCacheEntry.expires_at <= datetime.now(timezone.utc))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
+
+class LLMResponseCache:
+    """
+    Two-tier response cache for LLMClient.
+
+    Lookups check the in-process LRU first, then the optional database tier; database
+    hits are promoted into the LRU. Responses are stored as plain dicts so any
+    response model can be rebuilt from them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        persistent_store: Optional[DatabaseLLMCacheStore] = None,
+        bypass_nonzero_temperature: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in the in-process tier
+            ttl_seconds: Time-to-live for cached responses in both tiers
+            persistent_store: Optional shared tier (e.g. DatabaseLLMCacheStore)
+            bypass_nonzero_temperature: Skip the cache for sampled (temperature > 0) calls
+            clock: Monotonic clock, injectable for tests
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent_store = persistent_store
+        self.bypass_nonzero_temperature = bypass_nonzero_temperature
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def should_cache(self, config: BaseModel) -> bool:
+        """Check whether a call with the given LLMConfig may use the cache."""
+        if self.bypass_nonzero_temperature and getattr(config, "temperature", 0) > 0:
+            with self._lock:
+                self._stats.bypasses += 1
+            return False
+        return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response, or None on a miss."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats.memory_hits += 1
+                    return dict(value)
+                del self._entries[key]
+
+        if self.persistent_store is not None:
+            value = self.persistent_store.get(key)
+            if value is not None:
+                self._set_local(key, value)
+                with self._lock:
+                    self._stats.persistent_hits += 1
+                return value
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def set(self, key: str, model_id: str, value: Dict[str, Any]) -> None:
+        """Store a response in every tier."""
+        self._set_local(key, value)
+        if self.persistent_store is not None:
+            self.persistent_store.set(key, model_id, value, self.ttl_seconds)
+
+    def _set_local(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries from the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit/miss counters."""
+        with self._lock:
+            return self._stats.model_copy()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,186 @@
+"""
+Context window management for multi-turn conversations.
+
+Keeps the system prompt and the most recent turns inside a token budget so long chats
+do not grow request latency, cost and context-length errors without bound. Older turns
+are dropped, or folded into a summary when a summarizer is configured.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from app.core.config_service import config_service
+from app.core.llm_metrics import estimate_text_tokens
+from app.core.llm_service import ContentBlock, LLMClient, LLMResponse, Message, MessageRole
+
+# Tokens the model spends on role and turn framing for every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+Summarizer = Callable[[List[Message]], str]
+
+
+def _message_key(message: Message) -> Tuple[Hashable, ...]:
+    return (message.role.value, *(block.text for block in message.content))
+
+
+class ContextWindowManager:
+    """
+    Trims conversation history to a token budget.
+
+    System messages are always kept. Remaining turns are kept newest first until the
+    budget is reached; the window never starts with an assistant turn, since Bedrock
+    requires conversations to open with a user message. Token counts are cached per
+    message content, so re-fitting a growing conversation only estimates the new turns.
+    """
+
+    def __init__(
+        self,
+        max_input_tokens: int = 8000,
+        summarizer: Optional[Summarizer] = None,
+        summary_budget_tokens: int = 500,
+        token_estimator: Callable[[str], int] = estimate_text_tokens,
+        max_cached_messages: int = 4096,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            max_input_tokens: Budget for all messages sent to the model, summary included
+            summarizer: Optional callable condensing dropped turns into a summary text
+            summary_budget_tokens: Part of the budget reserved for the summary
+            token_estimator: Function estimating the token count of a text
+            max_cached_messages: Maximum number of per-message token counts kept
+        """
+        if max_input_tokens < 1:
+            raise ValueError("max_input_tokens must be at least 1")
+        if summarizer is not None and summary_budget_tokens >= max_input_tokens:
+            raise ValueError("summary_budget_tokens must be smaller than max_input_tokens")
+
+        self.max_input_tokens = max_input_tokens
+        self.summarizer = summarizer
+        self.summary_budget_tokens = summary_budget_tokens
+        self.token_estimator = token_estimator
+        self.max_cached_messages = max_cached_messages
+        self._token_counts: "OrderedDict[Tuple[Hashable, ...], int]" = OrderedDict()
+        self._summaries: "OrderedDict[Tuple[Tuple[Hashable, ...], ...], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count_tokens(self, message: Message) -> int:
+        """Estimated token count of a message, served from the cache when seen before."""
+        key = _message_key(message)
+        with self._lock:
+            count = self._token_counts.get(key)
+            if count is not None:
+                self._token_counts.move_to_end(key)
+                return count
+
+        count = MESSAGE_OVERHEAD_TOKENS + sum(self.token_estimator(block.text) for block in message.content)
+        with self._lock:
+            self._token_counts[key] = count
+            while len(self._token_counts) > self.max_cached_messages:
+                self._token_counts.popitem(last=False)
+        return count
+
+    def count_conversation_tokens(self, messages: List[Message]) -> int:
+        """Estimated token count of a whole conversation."""
+        return sum(self.count_tokens(message) for message in messages)
+
+    def fit(self, messages: List[Message]) -> List[Message]:
+        """
+        Trim a conversation to the token budget.
+
+        Args:
+            messages: Full conversation, oldest first
+
+        Returns:
+            System messages followed by the most recent turns that fit. When turns were
+            dropped and a summarizer is configured, their summary is added as a system
+            message. The latest message is always kept, even if it alone exceeds the budget.
+        """
+        system_messages = [message for message in messages if message.role == MessageRole.SYSTEM]
+        turns = [message for message in messages if message.role != MessageRole.SYSTEM]
+
+        budget = self.max_input_tokens - self.count_conversation_tokens(system_messages)
+        if self.count_conversation_tokens(turns) <= budget:
+            return messages
+
+        if self.summarizer is not None:
+            budget -= self.summary_budget_tokens
+
+        kept = 0
+        used = 0
+        for message in reversed(turns):
+            tokens = self.count_tokens(message)
+            if kept and used + tokens > budget:
+                break
+            used += tokens
+            kept += 1
+
+        start = len(turns) - kept
+        # Never open the window with an assistant turn
+        while start < len(turns) - 1 and turns[start].role != MessageRole.USER:
+            start += 1
+
+        dropped, recent = turns[:start], turns[start:]
+        if dropped and self.summarizer is not None:
+            summary = self._summarize(dropped)
+            if summary:
+                system_messages = system_messages + [Message(
+                    role=MessageRole.SYSTEM,
+                    content=[ContentBlock(text=f"Summary of the earlier conversation:\n{summary}")]
+                )]
+
+        return system_messages + recent
+
+    def _summarize(self, dropped: List[Message]) -> str:
+        # The dropped prefix usually repeats across turns, so summaries are cached by it
+        key = tuple(_message_key(message) for message in dropped)
+        with self._lock:
+            summary = self._summaries.get(key)
+        if summary is not None:
+            return summary
+
+        summary = self.summarizer(dropped)
+        with self._lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > 64:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def clear(self) -> None:
+        """Drop all cached token counts and summaries."""
+        with self._lock:
+            self._token_counts.clear()
+            self._summaries.clear()
+
+
+def make_llm_summarizer(client: LLMClient, max_words: int = 150) -> Summarizer:
+    """
+    Build a summarizer that condenses dropped turns with an LLM (usually a cheap model).
+
+    Args:
+        client: LLMClient used to write the summary
+        max_words: Target summary length
+
+    Returns:
+        Callable usable as ContextWindowManager.summarizer
+    """
+    def summarize(messages: List[Message]) -> str:
+        transcript = "\n".join(
+            f"{message.role.value}: {' '.join(block.text for block in message.content)}"
+            for message in messages
+        )
+        prompt = (
+            f"Summarize the following conversation in at most {max_words} words. "
+            f"Keep facts, decisions and open questions.\n\n{transcript}"
+        )
+        response = client.converse([Message(role=MessageRole.USER, content=[ContentBlock(text=prompt)])], LLMResponse)
+        return response.text.strip()
+
+    return summarize
+
+
+# Global instance
+context_window_manager = ContextWindowManager(
+    max_input_tokens=config_service.get("llm_context_max_tokens", 8000)
+)
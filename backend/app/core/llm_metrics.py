@@ -0,0 +1,228 @@
+"""
+Token accounting and cost metering for LLM calls.
+
+Every LLMClient call is recorded into a metrics sink that aggregates in memory per
+(user, model) and periodically flushes one row per aggregate to the llm_usage table,
+statsD-style, so recording a call never touches the database.
+"""
+import contextvars
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+# USD per 1,000 input / output tokens (on-demand pricing)
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "anthropic.claude-3-haiku-20240307-v1:0": (0.00025, 0.00125),
+    "anthropic.claude-3-sonnet-20240229-v1:0": (0.003, 0.015),
+    "us.anthropic.claude-3-7-sonnet-20250219-v1:0": (0.003, 0.015),
+    "meta.llama3-8b-instruct-v1:0": (0.0003, 0.0006),
+    "amazon.nova-lite-v1:0": (0.00006, 0.00024),
+}
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Rough token count for text that Bedrock does not meter separately (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def estimate_cost(model_id: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimate the cost of a call in USD (0.0 for models without pricing)."""
+    input_price, output_price = MODEL_PRICING.get(str(model_id), (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1000
+
+
+# User on whose behalf LLM calls are made, set by the API layer
+current_llm_user: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_llm_user", default=None)
+
+
+@contextmanager
+def llm_user_context(user_id: Optional[str]) -> Iterator[None]:
+    """Attribute LLM calls made inside the block to the given user."""
+    token = current_llm_user.set(user_id)
+    try:
+        yield
+    finally:
+        current_llm_user.reset(token)
+
+
+class LLMCallRecord(BaseModel):
+    """Metrics for a single LLM call."""
+    model_id: str
+    user_id: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reasoning_tokens: int = 0
+    latency_ms: float = 0.0
+    cache_hit: bool = False
+    success: bool = True
+
+
+class UsageAggregate(BaseModel):
+    """Summed metrics for a group of calls."""
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reasoning_tokens: int = 0
+    total_latency_ms: float = 0.0
+    cost_usd: float = 0.0
+
+    @property
+    def avg_latency_ms(self) -> float:
+        return self.total_latency_ms / self.calls if self.calls else 0.0
+
+    def add(self, record: LLMCallRecord) -> None:
+        self.calls += 1
+        self.errors += 0 if record.success else 1
+        self.cache_hits += 1 if record.cache_hit else 0
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.reasoning_tokens += record.reasoning_tokens
+        self.total_latency_ms += record.latency_ms
+        if not record.cache_hit:
+            self.cost_usd += estimate_cost(record.model_id, record.input_tokens, record.output_tokens)
+
+    def merge(self, other: "UsageAggregate") -> None:
+        for field in UsageAggregate.model_fields:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+UsageKey = Tuple[Optional[str], str]  # (user_id, model_id)
+
+
+class LLMCallRecorder(Protocol):
+    """Anything LLMClient can report its calls to (LLMMetricsSink, or a wrapper around one)."""
+
+    def record(self, record: LLMCallRecord) -> None:
+        ...
+
+
+class LLMMetricsSink:
+    """
+    In-memory aggregator for LLM call metrics with periodic flush to the database.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        """
+        Initialize the sink.
+
+        Args:
+            session_factory: Callable returning a new Session (defaults to app.db.SessionLocal)
+        """
+        self._session_factory = session_factory
+        self._pending: Dict[UsageKey, UsageAggregate] = {}
+        self._pending_since: Optional[datetime] = None
+        self._totals: Dict[UsageKey, UsageAggregate] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, record: LLMCallRecord) -> None:
+        """Add a call to the in-memory aggregates."""
+        key = (record.user_id, record.model_id)
+        with self._lock:
+            if self._pending_since is None:
+                self._pending_since = datetime.now(timezone.utc)
+            self._pending.setdefault(key, UsageAggregate()).add(record)
+            self._totals.setdefault(key, UsageAggregate()).add(record)
+
+    def totals_by_model(self) -> Dict[str, UsageAggregate]:
+        """Aggregates per model since process start."""
+        return self._group_totals(lambda key: key[1])
+
+    def totals_by_user(self) -> Dict[Optional[str], UsageAggregate]:
+        """Aggregates per user since process start."""
+        return self._group_totals(lambda key: key[0])
+
+    def _group_totals(self, group: Callable[[UsageKey], Optional[str]]) -> Dict:
+        grouped: Dict[Optional[str], UsageAggregate] = {}
+        with self._lock:
+            for key, aggregate in self._totals.items():
+                grouped.setdefault(group(key), UsageAggregate()).merge(aggregate)
+        return grouped
+
+    def flush(self) -> int:
+        """
+        Write pending aggregates to the llm_usage table.
+
+        Returns:
+            Number of rows written. On failure the aggregates are kept for the next flush.
+        """
+        from app.models.llm_usage import LLMUsage
+
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                period_start, self._pending_since = self._pending_since, None
+            if not pending:
+                return 0
+
+            period_end = datetime.now(timezone.utc)
+            rows: List[LLMUsage] = [
+                LLMUsage(
+                    period_start=period_start,
+                    period_end=period_end,
+                    user_id=user_id,
+                    model_id=model_id,
+                    **aggregate.model_dump()
+                )
+                for (user_id, model_id), aggregate in pending.items()
+            ]
+
+            if self._session_factory is None:
+                from app.db import SessionLocal
+                self._session_factory = SessionLocal
+
+            db = self._session_factory()
+            try:
+                db.add_all(rows)
+                db.commit()
+                return len(rows)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to flush LLM usage metrics: {e}")
+                with self._lock:
+                    for key, aggregate in pending.items():
+                        self._pending.setdefault(key, UsageAggregate()).merge(aggregate)
+                    if self._pending_since is None or (period_start and period_start < self._pending_since):
+                        self._pending_since = period_start
+                return 0
+            finally:
+                db.close()
+
+    def start(self, interval_seconds: float = 60.0) -> None:
+        """Start flushing in a background thread every interval_seconds."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run() -> None:
+            while not self._stop_event.wait(interval_seconds):
+                self.flush()
+
+        self._thread = threading.Thread(target=run, name="llm-metrics-flush", daemon=True)
+        self._thread.start()
+        logger.info(f"LLM metrics flusher started with {interval_seconds}s interval")
+
+    def stop(self) -> None:
+        """Stop the background flusher and write whatever is still pending."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+# Global instance
+llm_metrics_sink = LLMMetricsSink()
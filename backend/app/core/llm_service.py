@@ -1,15 +1,44 @@
 from enum import Enum
-from typing import Dict, List, Optional, Any, Type, TypeVar, Generic, Union, cast
+from typing import TYPE_CHECKING, Dict, Iterator, AsyncIterator, List, Optional, Any, Callable, Tuple, Type, TypeVar, Generic, Union, cast
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
 import json
+import math
+import threading
+import time
 try:
-    import boto3
     from botocore.exceptions import ClientError
+    from app.core.aws_clients import aws_client_registry
     BOTO3_AVAILABLE = True
 except ImportError:
     BOTO3_AVAILABLE = False
 from pydantic import BaseModel, Field
+from app.core.config_service import config_service
+from app.core.exceptions import LLMError, LLMThrottledError
+from app.core.llm_cache import LLMResponseCache, make_cache_key
+from app.core.llm_metrics import (
+    LLMCallRecord, LLMCallRecorder, current_llm_user, estimate_text_tokens, llm_metrics_sink
+)
+from app.core.rate_limiter import (
+    AdaptiveRateLimiter, RateLimiterRegistry, RetryPolicy, THROTTLING_ERROR_CODES
+)
+
+if TYPE_CHECKING:
+    from app.core.llm_adapters import NativeModelAdapter
+    from app.core.llm_context import ContextWindowManager
 
 T = TypeVar('T', bound=BaseModel)
+R = TypeVar('R')
+
+# Default number of Bedrock calls a single client runs concurrently on the async path
+DEFAULT_MAX_CONCURRENCY = 16
+
+# One adaptive limiter per model, shared by every client in the process
+llm_rate_limiters = RateLimiterRegistry(
+    lambda: AdaptiveRateLimiter(rate=config_service.get("bedrock_requests_per_second", 20.0))
+)
 
 class ModelFamily(str, Enum):
     CLAUDE = "claude"
@@ -28,6 +57,17 @@ class ModelName(str, Enum):
     # Amazon Nova models
     NOVA_LITE = "amazon.nova-lite-v1:0"
 
+def resolve_model_family(model_id: str) -> Optional[ModelFamily]:
+    """Determine the model family from a Bedrock model ID (None if unsupported)"""
+    model_id = str(getattr(model_id, "value", model_id))
+    if "anthropic" in model_id:
+        return ModelFamily.CLAUDE
+    elif "meta" in model_id or "llama" in model_id:
+        return ModelFamily.LLAMA
+    elif "amazon" in model_id or "nova" in model_id:
+        return ModelFamily.NOVA
+    return None
+
 class MessageRole(str, Enum):
     USER = "user"
     ASSISTANT = "assistant"
@@ -47,39 +87,125 @@ class ReasoningConfig(BaseModel):
 class LLMConfig(BaseModel):
     max_tokens: int = 512
     temperature: float = 0.5
-    top_p: float = 0.9
+    # None leaves top_p unset (extended thinking rejects it)
+    top_p: Optional[float] = 0.9
     reasoning: Optional[ReasoningConfig] = None
 
 class LLMResponse(BaseModel):
     text: str
     reasoning_text: Optional[str] = None
 
+class LLMStreamEvent(BaseModel):
+    """A single increment of a streamed response"""
+    text: str = ""
+    reasoning_text: str = ""
+    stop_reason: Optional[str] = None
+
+class BatchItemResult(BaseModel, Generic[T]):
+    """Outcome of one conversation in a batch"""
+    index: int
+    response: Optional[T] = None
+    error: Optional[str] = None
+    latency_ms: float
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+class BatchResult(BaseModel, Generic[T]):
+    """Outcome of a batch, with items in the same order as the input"""
+    items: List[BatchItemResult[T]]
+    total_latency_ms: float
+    succeeded: int
+    failed: int
+    mean_latency_ms: float
+    p50_latency_ms: float
+    p99_latency_ms: float
+
+    @property
+    def responses(self) -> List[Optional[T]]:
+        return [item.response for item in self.items]
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def _summarize_batch(items: List[BatchItemResult[T]], total_latency_ms: float) -> BatchResult[T]:
+    latencies = sorted(item.latency_ms for item in items)
+    failed = sum(1 for item in items if not item.succeeded)
+    return BatchResult[T](
+        items=items,
+        total_latency_ms=total_latency_ms,
+        succeeded=len(items) - failed,
+        failed=failed,
+        mean_latency_ms=sum(latencies) / len(latencies) if latencies else 0.0,
+        p50_latency_ms=_percentile(latencies, 50),
+        p99_latency_ms=_percentile(latencies, 99),
+    )
+
 class LLMClient(Generic[T]):
     def __init__(
         self,
         model_id: ModelName,
         region_name: str = "us-east-1",
-        config: Optional[LLMConfig] = None
+        config: Optional[LLMConfig] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: Optional[LLMResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        metrics_sink: Optional[LLMCallRecorder] = None,
+        context_manager: Optional["ContextWindowManager"] = None
     ):
         if not BOTO3_AVAILABLE:
             raise ImportError("boto3 is required for AWS Bedrock integration. Please install it with 'pip install boto3'.")
-            
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         self.model_id = model_id
-        self.client = boto3.client("bedrock-runtime", region_name=region_name)
+        self.max_concurrency = max_concurrency
+        # Clients are shared process-wide; the pool is never smaller than the concurrency limit
+        # so in-flight calls don't queue on urllib3. Retries are handled by _invoke so they can
+        # feed the rate limiter, so botocore makes a single attempt.
+        self.client = aws_client_registry.get_client(
+            "bedrock-runtime",
+            region_name=region_name,
+            max_pool_connections=max(max_concurrency, aws_client_registry.max_pool_connections),
+            retries={"total_max_attempts": 1, "mode": "standard"}
+        )
         self.config = config or LLMConfig()
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=config_service.get("bedrock_max_attempts", 4)
+        )
+        self.rate_limiter = rate_limiter or llm_rate_limiters.get(str(model_id))
+        self.metrics_sink = metrics_sink or llm_metrics_sink
+        self.context_manager = context_manager
+        # Resolved once; the native adapter is rebuilt only when the config object changes
+        self.family = resolve_model_family(model_id)
+        self._native_adapter: Optional["NativeModelAdapter"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
     
     def _get_model_family(self) -> ModelFamily:
-        if "anthropic" in self.model_id:
-            return ModelFamily.CLAUDE
-        elif "meta" in self.model_id or "llama" in self.model_id:
-            return ModelFamily.LLAMA
-        elif "amazon" in self.model_id or "nova" in self.model_id:
-            return ModelFamily.NOVA
-        else:
+        if self.family is None:
             raise ValueError(f"Unsupported model: {self.model_id}")
+        return self.family
+
+    def _get_native_adapter(self) -> "NativeModelAdapter":
+        adapter = self._native_adapter
+        if adapter is None or adapter.config is not self.config:
+            from app.core.llm_adapters import create_native_adapter
+            adapter = self._native_adapter = create_native_adapter(self._get_model_family(), self.config)
+        return adapter
     
     def _prepare_conversation_api_request(self, messages: List[Message]) -> Dict:
-        return {
+        if self.context_manager is not None:
+            messages = self.context_manager.fit(messages)
+
+        request: Dict[str, Any] = {
             "modelId": self.model_id,
             "messages": [
                 {
@@ -87,32 +213,30 @@ class LLMClient(Generic[T]):
                     "content": [{"text": content_block.text} for content_block in msg.content]
                 }
                 for msg in messages
+                if msg.role != MessageRole.SYSTEM
             ],
             "inferenceConfig": {
                 "maxTokens": self.config.max_tokens,
-                "temperature": self.config.temperature,
-                "topP": self.config.top_p
+                "temperature": self.config.temperature
             }
         }
+        if self.config.top_p is not None:
+            request["inferenceConfig"]["topP"] = self.config.top_p
+
+        # The Converse API takes system prompts separately from the turns
+        system = [
+            {"text": content_block.text}
+            for msg in messages
+            if msg.role == MessageRole.SYSTEM
+            for content_block in msg.content
+        ]
+        if system:
+            request["system"] = system
+        return request
     
-    def _prepare_native_api_request(self, message: str) -> Dict:
-        family = self._get_model_family()
-        
-        if family == ModelFamily.CLAUDE:
-            return {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": self.config.max_tokens,
-                "temperature": self.config.temperature,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [{"type": "text", "text": message}],
-                    }
-                ],
-            }
-        
-        # Similar implementations for other model families would go here
-        raise ValueError(f"Native API not implemented for model family: {family}")
+    def _prepare_native_api_request(self, message: str) -> str:
+        """Serialized InvokeModel body for the model family, built from a precompiled template"""
+        return self._get_native_adapter().build_body(message)
     
     def _extract_response_text(self, response: Dict) -> str:
         family = self._get_model_family()
@@ -153,28 +277,134 @@ class LLMClient(Generic[T]):
         
         return None
     
+    def _invoke(self, operation: Callable[..., R], **kwargs: Any) -> R:
+        """
+        Call a Bedrock operation through the rate limiter, retrying retryable errors
+        with jittered exponential backoff. Throttles slow the limiter down; successes
+        let it speed back up.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                result = operation(**kwargs)
+            except ClientError as e:
+                error_code = e.response.get("Error", {}).get("Code")
+                if error_code in THROTTLING_ERROR_CODES:
+                    self.rate_limiter.on_throttle()
+
+                attempt += 1
+                if not self.retry_policy.is_retryable(error_code) or attempt >= self.retry_policy.max_attempts:
+                    raise
+                time.sleep(self.retry_policy.compute_delay(attempt - 1))
+            else:
+                self.rate_limiter.on_success()
+                return result
+
+    def _wrap_error(self, action: str, error: Exception) -> LLMError:
+        """Convert a failure into an LLMError, keeping the Bedrock error code"""
+        if isinstance(error, LLMError):
+            return error
+        error_code = None
+        if isinstance(error, ClientError):
+            error_code = error.response.get("Error", {}).get("Code")
+        error_class = LLMThrottledError if error_code in THROTTLING_ERROR_CODES else LLMError
+        return error_class(
+            f"Error {action} model '{self.model_id}': {error}",
+            error_code=error_code,
+            details={"model_id": str(self.model_id)}
+        )
+
+    def _extract_usage(self, response: Dict) -> Tuple[int, int]:
+        """Get (input_tokens, output_tokens) from a Converse response or InvokeModel headers"""
+        usage = response.get("usage") or {}
+        if "inputTokens" in usage:
+            return usage.get("inputTokens", 0), usage.get("outputTokens", 0)
+
+        headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+        return (
+            int(headers.get("x-amzn-bedrock-input-token-count", 0)),
+            int(headers.get("x-amzn-bedrock-output-token-count", 0))
+        )
+
+    def _record_call(
+        self,
+        start: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        reasoning_tokens: int = 0,
+        cache_hit: bool = False,
+        success: bool = True
+    ) -> None:
+        """Report a finished call to the metrics sink, attributed to the current LLM user"""
+        self.metrics_sink.record(LLMCallRecord(
+            model_id=getattr(self.model_id, "value", str(self.model_id)),
+            user_id=current_llm_user.get(),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            reasoning_tokens=reasoning_tokens,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            cache_hit=cache_hit,
+            success=success
+        ))
+
+    def _cache_key(self, kind: str, payload: Any) -> Optional[str]:
+        """Get the response cache key for a call, or None if the call should not be cached"""
+        if self.cache is None or not self.cache.should_cache(self.config):
+            return None
+        return make_cache_key(self.model_id, self.config, kind, payload)
+
+    def _to_response_model(self, response_dict: Dict[str, Any], response_model: Type[T]) -> T:
+        """Parse a response dict into the provided Pydantic model"""
+        if response_dict.get("reasoning_text") is None or "reasoning_text" not in response_model.model_fields:
+            response_dict = {key: value for key, value in response_dict.items() if key != "reasoning_text"}
+        return response_model.model_validate(response_dict)
+
     def generate(self, message: str, response_model: Type[T]) -> T:
         """Generate a response for a single message"""
+        start = time.perf_counter()
+        cache_key = self._cache_key("generate", message)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_call(start, cache_hit=True)
+                return self._to_response_model(cached, response_model)
+
         try:
-            request = self._prepare_native_api_request(message)
-            json_request = json.dumps(request)
-            
-            response = self.client.invoke_model(
+            adapter = self._get_native_adapter()
+            response = self._invoke(
+                self.client.invoke_model,
                 modelId=self.model_id,
-                body=json_request
+                body=adapter.build_body(message)
             )
             
             model_response = json.loads(response["body"].read())
-            response_text = self._extract_response_text(model_response)
-            
-            # Parse the response into the provided Pydantic model
-            return response_model.model_validate({"text": response_text})
+            response_dict: Dict[str, Any] = {"text": adapter.parse_response(model_response)}
+            input_tokens, output_tokens = self._extract_usage(response)
+            if not (input_tokens or output_tokens):
+                input_tokens, output_tokens = adapter.parse_usage(model_response)
             
         except Exception as e:
-            raise Exception(f"Error invoking model '{self.model_id}': {e}")
+            self._record_call(start, success=False)
+            raise self._wrap_error("invoking", e) from e
+
+        self._record_call(start, input_tokens, output_tokens)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, self.model_id, response_dict)
+
+        return self._to_response_model(response_dict, response_model)
     
     def converse(self, messages: List[Message], response_model: Type[T]) -> T:
         """Generate a response for a conversation"""
+        start = time.perf_counter()
+        cache_key = self._cache_key("converse", [msg.model_dump(mode="json") for msg in messages])
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_call(start, cache_hit=True)
+                return self._to_response_model(cached, response_model)
+
         try:
             request = self._prepare_conversation_api_request(messages)
             
@@ -182,33 +412,290 @@ class LLMClient(Generic[T]):
             if reasoning_config:
                 request["additionalModelRequestFields"] = reasoning_config
             
-            response = self.client.converse(**request)
+            response = self._invoke(self.client.converse, **request)
             
-            response_text = self._extract_response_text(response)
-            reasoning_text = self._extract_reasoning_text(response) if self.config.reasoning else None
-            
-            # Create a response dict based on the response_model fields
-            response_dict: Dict[str, Any] = {"text": response_text}
-            if reasoning_text is not None and "reasoning_text" in response_model.__annotations__:
-                response_dict["reasoning_text"] = reasoning_text
-            
-            # Parse the response into the provided Pydantic model
-            return response_model.model_validate(response_dict)
+            response_dict: Dict[str, Any] = {
+                "text": self._extract_response_text(response),
+                "reasoning_text": self._extract_reasoning_text(response) if self.config.reasoning else None
+            }
+            input_tokens, output_tokens = self._extract_usage(response)
             
         except Exception as e:
-            raise Exception(f"Error in conversation with model '{self.model_id}': {e}")
+            self._record_call(start, success=False)
+            raise self._wrap_error("in conversation with", e) from e
+
+        # Bedrock does not report reasoning tokens separately, so they are estimated from the text
+        reasoning_text = response_dict["reasoning_text"]
+        self._record_call(
+            start,
+            input_tokens,
+            output_tokens,
+            reasoning_tokens=estimate_text_tokens(reasoning_text) if isinstance(reasoning_text, str) else 0
+        )
+
+        if cache_key is not None:
+            self.cache.set(cache_key, self.model_id, response_dict)
+
+        # Parse the response into the provided Pydantic model
+        return self._to_response_model(response_dict, response_model)
+
+    def _converse_item(self, index: int, messages: List[Message], response_model: Type[T]) -> BatchItemResult[T]:
+        """Run one conversation of a batch, capturing its error instead of raising"""
+        start = time.perf_counter()
+        try:
+            response = self.converse(messages, response_model)
+            error = None
+        except Exception as e:
+            response, error = None, str(e)
+        return BatchItemResult[T](
+            index=index,
+            response=response,
+            error=error,
+            latency_ms=(time.perf_counter() - start) * 1000
+        )
+
+    def _batch_workers(self, max_concurrency: Optional[int], batch_size: int) -> int:
+        # Never exceed the client's connection pool, which is sized to max_concurrency
+        limit = min(max_concurrency or self.max_concurrency, self.max_concurrency)
+        if limit < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        return max(1, min(limit, batch_size))
+
+    def batch_converse(
+        self,
+        conversations: List[List[Message]],
+        response_model: Type[T],
+        max_concurrency: Optional[int] = None
+    ) -> BatchResult[T]:
+        """
+        Run many conversations against this model on a bounded thread pool.
+
+        Results keep the input order. A failing item is recorded with its error
+        and does not abort the rest of the batch.
+        """
+        start = time.perf_counter()
+        workers = self._batch_workers(max_concurrency, len(conversations))
+
+        # Each worker runs in a copy of the caller's context so usage stays attributed to the caller
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-batch") as pool:
+            items = list(pool.map(
+                lambda indexed: context.copy().run(self._converse_item, indexed[0], indexed[1], response_model),
+                enumerate(conversations)
+            ))
+
+        return _summarize_batch(items, (time.perf_counter() - start) * 1000)
+
+    async def abatch_converse(
+        self,
+        conversations: List[List[Message]],
+        response_model: Type[T],
+        max_concurrency: Optional[int] = None
+    ) -> BatchResult[T]:
+        """Async variant of batch_converse bounded by an asyncio semaphore"""
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self._batch_workers(max_concurrency, len(conversations)))
+
+        async def run(index: int, messages: List[Message]) -> BatchItemResult[T]:
+            async with semaphore:
+                return await self._run_in_executor(self._converse_item, index, messages, response_model)
+
+        items = await asyncio.gather(*[run(index, messages) for index, messages in enumerate(conversations)])
+        return _summarize_batch(list(items), (time.perf_counter() - start) * 1000)
+
+    def _parse_converse_stream_event(self, event: Dict) -> Optional[LLMStreamEvent]:
+        """Translate a ConverseStream event into a stream event, skipping bookkeeping events"""
+        if "contentBlockDelta" in event:
+            delta = event["contentBlockDelta"].get("delta", {})
+            if "text" in delta:
+                return LLMStreamEvent(text=delta["text"])
+            reasoning = delta.get("reasoningContent") or {}
+            if reasoning.get("text"):
+                return LLMStreamEvent(reasoning_text=reasoning["text"])
+        elif "messageStop" in event:
+            return LLMStreamEvent(stop_reason=event["messageStop"].get("stopReason"))
+        return None
+
+    def _parse_native_stream_chunk(self, chunk: Dict) -> Optional[LLMStreamEvent]:
+        """Translate an InvokeModelWithResponseStream chunk into a stream event"""
+        return self._get_native_adapter().parse_stream_chunk(chunk)
+
+    def generate_stream(self, message: str) -> Iterator[LLMStreamEvent]:
+        """Stream the response for a single message as it is generated"""
+        start = time.perf_counter()
+        invocation_metrics: Dict[str, Any] = {}
+        reasoning_chars = 0
+        failed = False
+        try:
+            response = self._invoke(
+                self.client.invoke_model_with_response_stream,
+                modelId=self.model_id,
+                body=self._prepare_native_api_request(message)
+            )
+
+            for event in response["body"]:
+                chunk = event.get("chunk")
+                if not chunk:
+                    continue
+                payload = json.loads(chunk["bytes"])
+                # Bedrock appends token counts to the final chunk for every model family
+                invocation_metrics = payload.get("amazon-bedrock-invocationMetrics") or invocation_metrics
+                stream_event = self._parse_native_stream_chunk(payload)
+                if stream_event is not None:
+                    reasoning_chars += len(stream_event.reasoning_text)
+                    yield stream_event
+
+        except Exception as e:
+            failed = True
+            raise self._wrap_error("streaming from", e) from e
+        finally:
+            self._record_call(
+                start,
+                invocation_metrics.get("inputTokenCount", 0),
+                invocation_metrics.get("outputTokenCount", 0),
+                reasoning_tokens=(reasoning_chars + 3) // 4,
+                success=not failed
+            )
+
+    def converse_stream(self, messages: List[Message]) -> Iterator[LLMStreamEvent]:
+        """Stream the response for a conversation as it is generated"""
+        start = time.perf_counter()
+        usage: Dict[str, Any] = {}
+        reasoning_chars = 0
+        failed = False
+        try:
+            request = self._prepare_conversation_api_request(messages)
+
+            reasoning_config = self._prepare_reasoning_config()
+            if reasoning_config:
+                request["additionalModelRequestFields"] = reasoning_config
+
+            response = self._invoke(self.client.converse_stream, **request)
+
+            for event in response["stream"]:
+                if "metadata" in event:
+                    usage = event["metadata"].get("usage") or {}
+                    continue
+                stream_event = self._parse_converse_stream_event(event)
+                if stream_event is not None:
+                    reasoning_chars += len(stream_event.reasoning_text)
+                    yield stream_event
+
+        except Exception as e:
+            failed = True
+            raise self._wrap_error("streaming conversation with", e) from e
+        finally:
+            self._record_call(
+                start,
+                usage.get("inputTokens", 0),
+                usage.get("outputTokens", 0),
+                reasoning_tokens=(reasoning_chars + 3) // 4,
+                success=not failed
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the worker pool that runs blocking Bedrock calls for the async API"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix="llm-client"
+                    )
+        return self._executor
+
+    async def _run_in_executor(self, func: Callable[..., R], *args: Any) -> R:
+        """Run a blocking call on the client's worker pool without blocking the event loop.
+
+        The pool has ``max_concurrency`` workers, so additional calls wait in the pool's
+        queue instead of opening more Bedrock connections.
+        """
+        loop = asyncio.get_running_loop()
+        # Carry the caller's context (e.g. the current LLM user) into the worker thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(context.run, func, *args))
+
+    async def agenerate(self, message: str, response_model: Type[T]) -> T:
+        """Async variant of generate that runs inference off the event loop"""
+        return await self._run_in_executor(self.generate, message, response_model)
+
+    async def aconverse(self, messages: List[Message], response_model: Type[T]) -> T:
+        """Async variant of converse that runs inference off the event loop"""
+        return await self._run_in_executor(self.converse, messages, response_model)
+
+    async def _aiter_in_executor(self, iterator_factory: Callable[[], Iterator[R]]) -> AsyncIterator[R]:
+        """Drive a blocking iterator on the worker pool and hand its items to the event loop.
+
+        If the consumer stops early (e.g. the HTTP client disconnects) the worker stops
+        pulling from the underlying stream at the next item.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        cancelled = threading.Event()
+
+        def produce() -> None:
+            try:
+                for item in iterator_factory():
+                    if cancelled.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        producer = loop.run_in_executor(self._get_executor(), contextvars.copy_context().run, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            await asyncio.shield(producer)
+
+    async def agenerate_stream(self, message: str) -> AsyncIterator[LLMStreamEvent]:
+        """Async variant of generate_stream"""
+        async for event in self._aiter_in_executor(lambda: self.generate_stream(message)):
+            yield event
+
+    async def aconverse_stream(self, messages: List[Message]) -> AsyncIterator[LLMStreamEvent]:
+        """Async variant of converse_stream"""
+        async for event in self._aiter_in_executor(lambda: self.converse_stream(messages)):
+            yield event
+
+    def close(self) -> None:
+        """Shut down the worker pool used by the async API"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
 
 class LLMFactory:
     @staticmethod
     def create_client(
         model_name: ModelName,
         region_name: str = "us-east-1",
-        config: Optional[LLMConfig] = None
+        config: Optional[LLMConfig] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: Optional[LLMResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics_sink: Optional[LLMCallRecorder] = None,
+        context_manager: Optional["ContextWindowManager"] = None
     ) -> LLMClient:
         return LLMClient(
             model_id=model_name,
             region_name=region_name,
-            config=config
+            config=config,
+            max_concurrency=max_concurrency,
+            cache=cache,
+            retry_policy=retry_policy,
+            metrics_sink=metrics_sink,
+            context_manager=context_manager
         )
 
 # Example usage:
@@ -242,3 +729,40 @@ class LLMFactory:
 # # Generate a response with a custom model
 # custom_response = client.generate("How's the weather today?", CustomResponse)
 # print(custom_response.text)
+#
+# # Inside an async route, use the non-blocking variants
+# response = await client.aconverse(
+#     [Message(role=MessageRole.USER, content=[ContentBlock(text="Hello!")])],
+#     LLMResponse
+# )
+#
+# # Cache repeated questions in-process and in the shared database tier
+# from backend.app.core.llm_cache import LLMResponseCache, DatabaseLLMCacheStore
+# cached_client = LLMFactory.create_client(
+#     ModelName.CLAUDE_3_HAIKU,
+#     cache=LLMResponseCache(ttl_seconds=600, persistent_store=DatabaseLLMCacheStore())
+# )
+#
+# # Re-score many prompts at once; failures are reported per item
+# batch = client.batch_converse(conversations, LLMResponse, max_concurrency=8)
+# print(batch.succeeded, batch.failed, batch.p99_latency_ms)
+#
+# # Stream text deltas as they are generated
+# async for event in client.aconverse_stream(messages):
+#     print(event.text, end="")
+#
+# # Keep long chats inside a token budget, summarizing dropped turns with a cheap model
+# from backend.app.core.llm_context import ContextWindowManager, make_llm_summarizer
+# summarizer = make_llm_summarizer(LLMFactory.create_client(ModelName.CLAUDE_3_HAIKU))
+# chat_client = LLMFactory.create_client(
+#     ModelName.CLAUDE_3_7_SONNET,
+#     context_manager=ContextWindowManager(max_input_tokens=16000, summarizer=summarizer)
+# )
+#
+# # Cheap classification through the native InvokeModel API (Llama 3 / Nova templates are precompiled)
+# classifier = LLMFactory.create_client(ModelName.NOVA_LITE, config=LLMConfig(max_tokens=8, temperature=0.0))
+# label = classifier.generate("Classify the sentiment of: 'great product'", LLMResponse).text
+#
+# # Let the router pick the cheapest adequate model, with fallback on throttling
+# from backend.app.core.model_router import model_router, RoutingHints
+# answer = model_router.converse(messages, LLMResponse, RoutingHints(max_latency_ms=2000))
@@ -0,0 +1,338 @@
+"""
+Cost-aware routing of LLM requests across models.
+
+Requests are classified by estimated prompt size, whether reasoning is needed and
+caller hints, then sent to the cheapest model tier that can handle them. Within a
+tier, models that were recently throttled or exceed the caller's latency budget are
+tried last, and throttled calls fall back to the next candidate.
+"""
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.config_service import config_service
+from app.core.exceptions import LLMThrottledError
+from app.core.llm_context import ContextWindowManager, context_window_manager
+from app.core.llm_metrics import LLMCallRecord, LLMCallRecorder, estimate_text_tokens, llm_metrics_sink
+from app.core.llm_service import (
+    LLMClient, LLMConfig, LLMFactory, Message, ModelName, ReasoningConfig
+)
+from app.core.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class RequestComplexity(str, Enum):
+    SIMPLE = "simple"
+    STANDARD = "standard"
+    COMPLEX = "complex"
+
+
+# Candidate models per tier, cheapest adequate model first
+DEFAULT_ROUTES: Dict[RequestComplexity, List[ModelName]] = {
+    RequestComplexity.SIMPLE: [ModelName.NOVA_LITE, ModelName.LLAMA_3_8B, ModelName.CLAUDE_3_HAIKU],
+    RequestComplexity.STANDARD: [ModelName.CLAUDE_3_HAIKU, ModelName.CLAUDE_3_7_SONNET],
+    RequestComplexity.COMPLEX: [ModelName.CLAUDE_3_7_SONNET, ModelName.CLAUDE_3_SONNET],
+}
+
+# Models that accept the extended thinking (reasoning) configuration
+REASONING_MODELS = frozenset({ModelName.CLAUDE_3_7_SONNET})
+
+# Output tokens left for the answer on top of the thinking budget
+THINKING_ANSWER_TOKENS = 1024
+
+
+def thinking_config(config: LLMConfig) -> LLMConfig:
+    """
+    Copy of a config with extended thinking enabled and the sampling settings thinking requires.
+
+    Thinking needs max_tokens above the thinking budget, temperature 1 and no top_p;
+    the caller's reasoning budget is kept when it already enables thinking.
+    """
+    reasoning = config.reasoning if config.reasoning and config.reasoning.enabled else ReasoningConfig()
+    return config.model_copy(update={
+        "reasoning": reasoning,
+        "max_tokens": max(config.max_tokens, reasoning.budget_tokens + THINKING_ANSWER_TOKENS),
+        "temperature": 1.0,
+        "top_p": None,
+    })
+
+
+class RoutingHints(BaseModel):
+    """Optional caller hints that steer routing"""
+    complexity: Optional[RequestComplexity] = None
+    requires_reasoning: bool = False
+    max_latency_ms: Optional[float] = None
+
+
+class RouteStats(BaseModel):
+    """Exponentially weighted statistics for one model"""
+    calls: int = 0
+    errors: int = 0
+    throttles: int = 0
+    latency_ms: float = 0.0
+    input_tokens: float = 0.0
+    output_tokens: float = 0.0
+    throttle_rate: float = 0.0
+    last_throttled_at: Optional[float] = None
+
+
+class _RouteStatsRecorder:
+    """Call recorder that updates the router's stats and forwards every call to the shared sink"""
+
+    def __init__(self, router: "ModelRouter", target: LLMCallRecorder):
+        self._router = router
+        self._target = target
+
+    def record(self, record: LLMCallRecord) -> None:
+        if not record.cache_hit:
+            self._router._observe(record)
+        self._target.record(record)
+
+
+class ModelRouter:
+    """
+    Routing layer over LLMFactory that picks the cheapest adequate model per request.
+    """
+
+    def __init__(
+        self,
+        region_name: str = "us-east-1",
+        config: Optional[LLMConfig] = None,
+        routes: Optional[Dict[RequestComplexity, List[ModelName]]] = None,
+        simple_max_tokens: int = 400,
+        complex_min_tokens: int = 4000,
+        throttle_cooldown_seconds: float = 30.0,
+        smoothing: float = 0.2,
+        metrics_sink: Optional[LLMCallRecorder] = None,
+        context_manager: Optional[ContextWindowManager] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            region_name: AWS region for the underlying clients
+            config: LLMConfig shared by all routed clients
+            routes: Candidate models per complexity tier, in preference order
+            simple_max_tokens: Prompts up to this many estimated tokens are SIMPLE
+            complex_min_tokens: Prompts from this many estimated tokens are COMPLEX
+            throttle_cooldown_seconds: How long a throttled model is tried last
+            smoothing: Weight of the newest observation in the moving averages
+            metrics_sink: Sink receiving usage of routed calls (defaults to the global sink)
+            context_manager: Optional history trimming applied by every routed client
+            clock: Monotonic clock, injectable for tests
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be between 0 and 1")
+
+        self.region_name = region_name
+        self.config = config or LLMConfig()
+        self.routes = routes or DEFAULT_ROUTES
+        self.simple_max_tokens = simple_max_tokens
+        self.complex_min_tokens = complex_min_tokens
+        self.throttle_cooldown_seconds = throttle_cooldown_seconds
+        self.smoothing = smoothing
+        self.context_manager = context_manager
+        self._sink = _RouteStatsRecorder(self, metrics_sink or llm_metrics_sink)
+        self._clients: Dict[Tuple[ModelName, bool], LLMClient] = {}
+        self._stats: Dict[str, RouteStats] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def classify(self, messages: List[Message], hints: Optional[RoutingHints] = None) -> RequestComplexity:
+        """Classify a conversation by hints, reasoning needs and estimated prompt size"""
+        hints = hints or RoutingHints()
+        if hints.complexity is not None:
+            return hints.complexity
+        if hints.requires_reasoning:
+            return RequestComplexity.COMPLEX
+
+        prompt_tokens = sum(estimate_text_tokens(block.text) for msg in messages for block in msg.content)
+        if prompt_tokens <= self.simple_max_tokens:
+            return RequestComplexity.SIMPLE
+        if prompt_tokens >= self.complex_min_tokens:
+            return RequestComplexity.COMPLEX
+        return RequestComplexity.STANDARD
+
+    def candidates(self, messages: List[Message], hints: Optional[RoutingHints] = None) -> List[ModelName]:
+        """
+        Models to try for a request, in order.
+
+        The tier's preference order is kept, except that models throttled within the
+        cooldown or slower than the caller's latency budget move to the back.
+        """
+        hints = hints or RoutingHints()
+        models = list(self.routes[self.classify(messages, hints)])
+        if hints.requires_reasoning:
+            models = [model for model in models if model in REASONING_MODELS] or models
+
+        with self._lock:
+            stats = {model: self._stats.get(model.value) for model in models}
+        now = self._clock()
+
+        def demoted(model: ModelName) -> Tuple[bool, bool]:
+            model_stats = stats[model]
+            if model_stats is None:
+                return False, False
+            throttled = (
+                model_stats.last_throttled_at is not None
+                and now - model_stats.last_throttled_at < self.throttle_cooldown_seconds
+            )
+            too_slow = hints.max_latency_ms is not None and model_stats.latency_ms > hints.max_latency_ms
+            return throttled, too_slow
+
+        return sorted(models, key=demoted)
+
+    def get_client(
+        self, model: ModelName, reasoning: bool = False, config: Optional[LLMConfig] = None
+    ) -> LLMClient:
+        """
+        Get a client for a model.
+
+        Without a config this is the shared client, created on first use. With a
+        config (e.g. a caller's per-request settings) a new client is built from it,
+        still reporting to the router's stats, and the caller must close it.
+        """
+        if config is not None:
+            return self._create_client(model, self._client_config(model, reasoning, config))
+
+        key = (model, reasoning and model in REASONING_MODELS)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                config = self._client_config(model, key[1], self.config)
+                client = self._clients[key] = self._create_client(model, config)
+            return client
+
+    def select_client(
+        self, messages: List[Message], hints: Optional[RoutingHints] = None, config: Optional[LLMConfig] = None
+    ) -> LLMClient:
+        """
+        Client of the preferred model, for callers that cannot fall back mid-call (e.g. streaming).
+
+        As with get_client, a client built from a caller's config must be closed by the caller.
+        """
+        hints = self._routing_hints(hints, config)
+        return self.get_client(self.candidates(messages, hints)[0], hints.requires_reasoning, config)
+
+    def converse(
+        self,
+        messages: List[Message],
+        response_model: Type[T],
+        hints: Optional[RoutingHints] = None,
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        """Route a conversation, falling back to the next candidate when a model is throttled"""
+        hints = self._routing_hints(hints, config)
+        candidates = self.candidates(messages, hints)
+        for index, model in enumerate(candidates):
+            client = self.get_client(model, hints.requires_reasoning, config)
+            try:
+                return client.converse(messages, response_model)
+            except LLMThrottledError:
+                self._observe_throttle(model)
+                if index == len(candidates) - 1:
+                    raise
+                logger.warning(f"Model {model.value} throttled, falling back to {candidates[index + 1].value}")
+            finally:
+                if config is not None:
+                    client.close()
+        raise ValueError("No models configured for this route")
+
+    async def aconverse(
+        self,
+        messages: List[Message],
+        response_model: Type[T],
+        hints: Optional[RoutingHints] = None,
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        """Async variant of converse"""
+        hints = self._routing_hints(hints, config)
+        candidates = self.candidates(messages, hints)
+        for index, model in enumerate(candidates):
+            client = self.get_client(model, hints.requires_reasoning, config)
+            try:
+                return await client.aconverse(messages, response_model)
+            except LLMThrottledError:
+                self._observe_throttle(model)
+                if index == len(candidates) - 1:
+                    raise
+                logger.warning(f"Model {model.value} throttled, falling back to {candidates[index + 1].value}")
+            finally:
+                if config is not None:
+                    client.close()
+        raise ValueError("No models configured for this route")
+
+    @staticmethod
+    def _routing_hints(hints: Optional[RoutingHints], config: Optional[LLMConfig]) -> RoutingHints:
+        """Caller hints, requiring reasoning when the caller's config enables it"""
+        hints = hints or RoutingHints()
+        if config is not None and config.reasoning and config.reasoning.enabled and not hints.requires_reasoning:
+            hints = hints.model_copy(update={"requires_reasoning": True})
+        return hints
+
+    @staticmethod
+    def _client_config(model: ModelName, reasoning: bool, config: LLMConfig) -> LLMConfig:
+        """Config for a routed client: thinking settings on reasoning models, no reasoning elsewhere"""
+        if model not in REASONING_MODELS:
+            return config.model_copy(update={"reasoning": None}) if config.reasoning else config
+        return thinking_config(config) if reasoning else config
+
+    def _create_client(self, model: ModelName, config: LLMConfig) -> LLMClient:
+        return LLMFactory.create_client(
+            model_name=model,
+            region_name=self.region_name,
+            config=config,
+            metrics_sink=self._sink,
+            context_manager=self.context_manager
+        )
+
+    def stats(self) -> Dict[str, RouteStats]:
+        """Snapshot of the per-model routing statistics"""
+        with self._lock:
+            return {model_id: stats.model_copy() for model_id, stats in self._stats.items()}
+
+    def _ewma(self, current: float, value: float, first: bool) -> float:
+        return value if first else current + self.smoothing * (value - current)
+
+    def _observe(self, record: LLMCallRecord) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(record.model_id, RouteStats())
+            # Averages are seeded by the first successful call; failed calls carry no timings
+            first = stats.calls - stats.errors == 0
+            stats.calls += 1
+            if not record.success:
+                stats.errors += 1
+                return
+            stats.latency_ms = self._ewma(stats.latency_ms, record.latency_ms, first)
+            stats.input_tokens = self._ewma(stats.input_tokens, record.input_tokens, first)
+            stats.output_tokens = self._ewma(stats.output_tokens, record.output_tokens, first)
+            # Not seeded: throttles seen before the first success must still count
+            stats.throttle_rate = self._ewma(stats.throttle_rate, 0.0, False)
+
+    def _observe_throttle(self, model: ModelName) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(model.value, RouteStats())
+            stats.throttles += 1
+            stats.last_throttled_at = self._clock()
+            stats.throttle_rate = self._ewma(stats.throttle_rate, 1.0, False)
+
+    def close(self) -> None:
+        """Shut down the worker pools of all routed clients"""
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.close()
+
+
+# Global instance
+model_router = ModelRouter(
+    region_name=config_service.get_aws_credentials()["region"],
+    context_manager=context_window_manager
+)
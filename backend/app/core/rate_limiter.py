@@ -0,0 +1,159 @@
+"""
+Client-side rate limiting and retry helpers for calls to throttled AWS services.
+"""
+import random
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Optional
+
+from pydantic import BaseModel
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts to throttling signals.
+
+    The rate grows additively on every success and is cut multiplicatively on every
+    throttle (AIMD), so the client converges on the rate the service actually grants.
+    """
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        burst: Optional[float] = None,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Initial requests per second
+            burst: Bucket capacity (defaults to the initial rate)
+            min_rate: Lower bound for the adapted rate
+            max_rate: Upper bound for the adapted rate (defaults to the initial rate)
+            increase_step: Requests per second added after each success
+            decrease_factor: Multiplier applied to the rate after each throttle
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        if rate <= 0 or min_rate <= 0:
+            raise ValueError("rate and min_rate must be positive")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.burst = burst or rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self._rate = min(max(rate, min_rate), self.max_rate)
+        self._tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate in requests per second."""
+        with self._lock:
+            return self._rate
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for the bucket to refill if necessary.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if a token was taken, False if the timeout elapsed first
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self._rate
+
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
+
+    def on_success(self) -> None:
+        """Record a successful call (additive increase)."""
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+    def on_throttle(self) -> None:
+        """Record a throttled call (multiplicative decrease) and drain the bucket."""
+        with self._lock:
+            self._refill()
+            self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiterRegistry:
+    """Process-wide registry holding one limiter per key (e.g. per model)."""
+
+    def __init__(self, factory: Callable[[], AdaptiveRateLimiter]):
+        """
+        Initialize the registry.
+
+        Args:
+            factory: Callable creating the limiter for a key seen for the first time
+        """
+        self._factory = factory
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> AdaptiveRateLimiter:
+        """Get the limiter for key, creating it on first use."""
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = self._factory()
+            return limiter
+
+
+# Error codes that signal the caller is sending too fast
+THROTTLING_ERROR_CODES: FrozenSet[str] = frozenset({
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+})
+
+# Error codes worth retrying with backoff
+RETRYABLE_ERROR_CODES: FrozenSet[str] = THROTTLING_ERROR_CODES | frozenset({
+    "ServiceUnavailableException",
+    "ServiceUnavailable",
+    "InternalServerException",
+    "ModelNotReadyException",
+})
+
+
+class RetryPolicy(BaseModel):
+    """Retry with capped, fully jittered exponential backoff."""
+    max_attempts: int = 4
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    retryable_error_codes: FrozenSet[str] = RETRYABLE_ERROR_CODES
+
+    def is_retryable(self, error_code: Optional[str]) -> bool:
+        return error_code in self.retryable_error_codes
+
+    def compute_delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
@@ -0,0 +1,127 @@
+"""
+Cache of verified JWTs.
+
+Clients send the same bearer token on every request, so the result of a full
+signature verification is kept until the token expires (or a shorter TTL), keyed by
+a hash of the token so raw tokens are never held in memory.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from app.schemas.auth import TokenData
+
+# Returns True when a cached identity must no longer be trusted
+RevocationCheck = Callable[[TokenData], bool]
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified TokenData with expiry capped at the token's exp."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of tokens kept
+            max_ttl_seconds: Upper bound on how long a verification result is reused
+            clock: Wall clock in epoch seconds (compared with the exp claim), injectable for tests
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, TokenData]]" = OrderedDict()
+        self._revocation_checks: List[RevocationCheck] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[TokenData]:
+        """Get the cached verification result for a token, or None."""
+        key = self._key(token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, token_data = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            checks = list(self._revocation_checks)
+
+        if any(check(token_data) for check in checks):
+            self.revoke_token(token)
+            return None
+        return token_data
+
+    def set(self, token: str, token_data: TokenData, exp: Optional[float] = None) -> None:
+        """
+        Cache a verified token.
+
+        Args:
+            token: The raw bearer token
+            token_data: Verified identity extracted from it
+            exp: The token's exp claim in epoch seconds (None caches for max_ttl_seconds)
+        """
+        now = self._clock()
+        expires_at = now + self.max_ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+
+        with self._lock:
+            self._entries[self._key(token)] = (expires_at, token_data)
+            self._entries.move_to_end(self._key(token))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revoke_token(self, token: str) -> None:
+        """Forget a single token (e.g. on sign-out)."""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def revoke_user(self, user_sub: Optional[str] = None, username: Optional[str] = None) -> int:
+        """
+        Forget every cached token of a user.
+
+        Returns:
+            Number of tokens removed
+        """
+        with self._lock:
+            keys = [
+                key for key, (_, token_data) in self._entries.items()
+                if (user_sub is not None and token_data.user_sub == user_sub)
+                or (username is not None and token_data.username == username)
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def add_revocation_check(self, check: RevocationCheck) -> None:
+        """Register a hook consulted on every cache hit; returning True evicts the entry."""
+        with self._lock:
+            self._revocation_checks.append(check)
+
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
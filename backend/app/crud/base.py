@@ -2,9 +2,14 @@
 Base DAO classes for database operations.
 """
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Type, Optional, List
+from functools import lru_cache
+from typing import Generic, TypeVar, Type, Optional, List, Sequence
+from typing_extensions import TypedDict
+from sqlalchemy import RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from app.schemas.pagination import CursorPage, SerializedPage, decode_cursor, encode_cursor
 
 # Type variables for generic DAO
 ModelType = TypeVar("ModelType")  # SQLAlchemy model
@@ -13,7 +18,55 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
-class BaseDAO(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType], ABC):
+@lru_cache(maxsize=None)
+def _row_list_adapter(model: type, schema: Type[BaseModel]) -> TypeAdapter:
+    """
+    TypeAdapter validating and serializing a list of rows of the schema's columns.
+
+    Rows are typed by the columns' Python types rather than by the schema, so values
+    already validated on write (e.g. EmailStr syntax) are only type-checked on read;
+    fields come out in schema order with the schema's JSON representation.
+    """
+    columns = model.__table__.columns
+    fields = {}
+    for name in schema.model_fields:
+        if name not in columns:
+            raise ValueError(f"{schema.__name__}.{name} is not a column of {model.__tablename__}")
+        python_type = columns[name].type.python_type
+        fields[name] = Optional[python_type] if columns[name].nullable else python_type
+    return TypeAdapter(List[TypedDict(f"{schema.__name__}Row", fields)])
+
+
+class _KeysetPagination:
+    """Shared query building for the get_page methods of BaseDAO and AsyncBaseDAO."""
+
+    def _keyset_select(self, cursor: Optional[str], limit: int, *entities):
+        # One row past the page tells whether a next page exists
+        stmt = select(*(entities or (self.model,))).order_by(self.model.id).limit(limit + 1)
+        if cursor is not None:
+            stmt = stmt.where(self.model.id > decode_cursor(cursor))
+        return stmt
+
+    def _to_page(self, db_objs: List[ModelType], limit: int) -> CursorPage[SchemaType]:
+        items = self._to_schema_list(db_objs[:limit])
+        next_cursor = encode_cursor(db_objs[limit - 1].id) if len(db_objs) > limit else None
+        return CursorPage[self.schema](items=items, next_cursor=next_cursor)
+
+    def _schema_columns(self) -> list:
+        """Table columns of the response schema's fields, to select plain rows instead of ORM objects."""
+        columns = self.model.__table__.columns
+        return [columns[name] for name in self.schema.model_fields]
+
+    def _to_serialized_page(self, rows: Sequence[RowMapping], limit: int) -> SerializedPage:
+        # One validation pass over the whole page, rendered to JSON by pydantic-core,
+        # instead of ORM hydration, model_validate per object and the response_model pass
+        adapter = _row_list_adapter(self.model, self.schema)
+        content = adapter.dump_json(adapter.validate_python(rows[:limit]))
+        next_cursor = encode_cursor(rows[limit - 1]["id"]) if len(rows) > limit else None
+        return SerializedPage.model_construct(content=content, next_cursor=next_cursor)
+
+
+class BaseDAO(_KeysetPagination, Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType], ABC):
     """
     Abstract base class for Data Access Objects.
     Provides common CRUD operations that return Pydantic objects.
@@ -38,6 +91,37 @@ class BaseDAO(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType]
         """Convert list of SQLAlchemy models to list of Pydantic schemas."""
         return [self._to_schema(obj) for obj in db_objs]
 
+    def get_page(self, db: Session, *, cursor: Optional[str] = None, limit: int = 100) -> CursorPage[SchemaType]:
+        """
+        Get one page of records ordered by id, continuing after the cursor.
+
+        Unlike get_multi's offset, the cost does not grow with the page depth.
+
+        Args:
+            db: Database session
+            cursor: next_cursor of the previous page (None for the first page)
+            limit: Maximum number of records in the page
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        db_objs = db.execute(self._keyset_select(cursor, limit)).scalars().all()
+        return self._to_page(db_objs, limit)
+
+    def get_page_json(self, db: Session, *, cursor: Optional[str] = None, limit: int = 100) -> SerializedPage:
+        """
+        Like get_page, but returns the page serialized to JSON for list endpoints.
+
+        Selects only the schema's columns as rows and validates and serializes them in
+        one pass, so large pages skip ORM object hydration and per-object model
+        validation. Every schema field must be a column of the model.
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        rows = db.execute(self._keyset_select(cursor, limit, *self._schema_columns())).mappings().all()
+        return self._to_serialized_page(rows, limit)
+
     @abstractmethod
     def get(self, db: Session, id: int) -> Optional[SchemaType]:
         """Get a single record by ID."""
@@ -45,7 +129,7 @@ class BaseDAO(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType]
 
     @abstractmethod
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[SchemaType]:
-        """Get multiple records with pagination."""
+        """Get multiple records with offset pagination (legacy; prefer get_page)."""
         pass
 
     @abstractmethod
@@ -62,3 +146,69 @@ class BaseDAO(Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType]
     def delete(self, db: Session, *, id: int) -> bool:
         """Delete a record by ID."""
         pass
+
+
+
+class AsyncBaseDAO(_KeysetPagination, Generic[ModelType, SchemaType, CreateSchemaType, UpdateSchemaType], ABC):
+    """
+    Abstract base class for Data Access Objects used with an AsyncSession.
+    Counterpart of BaseDAO for async request handlers; returns Pydantic objects.
+    """
+
+    def __init__(self, model: Type[ModelType], schema: Type[SchemaType]):
+        """
+        Initialize DAO with model and schema types.
+
+        Args:
+            model: SQLAlchemy model class
+            schema: Pydantic schema class for responses
+        """
+        self.model = model
+        self.schema = schema
+
+    def _to_schema(self, db_obj: ModelType) -> SchemaType:
+        """Convert SQLAlchemy model to Pydantic schema."""
+        return self.schema.model_validate(db_obj)
+
+    def _to_schema_list(self, db_objs: List[ModelType]) -> List[SchemaType]:
+        """Convert list of SQLAlchemy models to list of Pydantic schemas."""
+        return [self._to_schema(obj) for obj in db_objs]
+
+    async def get_page(
+        self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[SchemaType]:
+        """Async variant of BaseDAO.get_page."""
+        db_objs = (await db.execute(self._keyset_select(cursor, limit))).scalars().all()
+        return self._to_page(db_objs, limit)
+
+    async def get_page_json(
+        self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> SerializedPage:
+        """Async variant of BaseDAO.get_page_json."""
+        rows = (await db.execute(self._keyset_select(cursor, limit, *self._schema_columns()))).mappings().all()
+        return self._to_serialized_page(rows, limit)
+
+    @abstractmethod
+    async def get(self, db: AsyncSession, id: int) -> Optional[SchemaType]:
+        """Get a single record by ID."""
+        pass
+
+    @abstractmethod
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[SchemaType]:
+        """Get multiple records with offset pagination (legacy; prefer get_page)."""
+        pass
+
+    @abstractmethod
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> SchemaType:
+        """Create a new record."""
+        pass
+
+    @abstractmethod
+    async def update(self, db: AsyncSession, *, db_obj: ModelType, obj_in: UpdateSchemaType) -> SchemaType:
+        """Update an existing record."""
+        pass
+
+    @abstractmethod
+    async def delete(self, db: AsyncSession, *, id: int) -> bool:
+        """Delete a record by ID."""
+        pass
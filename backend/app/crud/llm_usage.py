@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.llm_usage import LLMUsage
+from app.schemas.llm import LLMUsageSummary
+
+
+class LLMUsageDAO:
+    """
+    Data Access Object for aggregated LLM usage.
+    Returns Pydantic objects instead of SQLAlchemy models.
+    """
+
+    def get_usage_by_model(self, db: Session, since: Optional[datetime] = None) -> List[LLMUsageSummary]:
+        """Get usage totals per model, optionally only for periods ending after since."""
+        return [
+            LLMUsageSummary(model_id=key, **totals)
+            for key, totals in self._aggregate(db, LLMUsage.model_id, since)
+        ]
+
+    def get_usage_by_user(self, db: Session, since: Optional[datetime] = None) -> List[LLMUsageSummary]:
+        """Get usage totals per user, optionally only for periods ending after since."""
+        return [
+            LLMUsageSummary(user_id=key, **totals)
+            for key, totals in self._aggregate(db, LLMUsage.user_id, since)
+        ]
+
+    def _aggregate(self, db: Session, group_column, since: Optional[datetime]):
+        calls = func.sum(LLMUsage.calls)
+        query = db.query(
+            group_column,
+            calls,
+            func.sum(LLMUsage.errors),
+            func.sum(LLMUsage.cache_hits),
+            func.sum(LLMUsage.input_tokens),
+            func.sum(LLMUsage.output_tokens),
+            func.sum(LLMUsage.reasoning_tokens),
+            func.sum(LLMUsage.total_latency_ms),
+            func.sum(LLMUsage.cost_usd),
+        )
+        if since is not None:
+            query = query.filter(LLMUsage.period_end >= since)
+
+        rows = query.group_by(group_column).order_by(func.sum(LLMUsage.cost_usd).desc()).all()
+        for key, calls, errors, cache_hits, input_tokens, output_tokens, reasoning_tokens, latency, cost in rows:
+            yield key, {
+                "calls": calls or 0,
+                "errors": errors or 0,
+                "cache_hits": cache_hits or 0,
+                "input_tokens": input_tokens or 0,
+                "output_tokens": output_tokens or 0,
+                "reasoning_tokens": reasoning_tokens or 0,
+                "avg_latency_ms": (latency or 0.0) / calls if calls else 0.0,
+                "cost_usd": cost or 0.0,
+            }
@@ -1,8 +1,115 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import case, cast, exists, func, literal, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.models.first_admin_claim import FirstAdminClaim
 from app.models.user import User, UserRole
-from app.schemas.user import UserResponse, UserCreate, UserUpdate
-from app.crud.base import BaseDAO
+from app.schemas.pagination import CursorPage, SerializedPage
+from app.schemas.user import UserResponse, UserCreate, UserSearchFilters, UserSearchMode, UserUpdate
+from app.crud.base import AsyncBaseDAO, BaseDAO
+from app.core.identity_cache import apublish_user_change, identity_cache, publish_user_change
+
+
+def _dialect_insert(dialect: str):
+    """INSERT construct with ON CONFLICT support for the database dialect."""
+    return postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+
+def _claim_first_admin_statement(dialect: str):
+    """Take the one-time first-admin claim; affects one row only for the first user."""
+    return _dialect_insert(dialect)(FirstAdminClaim).values(id=1).on_conflict_do_nothing()
+
+
+def _create_statement(dialect: str, obj_in: UserCreate, claimed: bool = False):
+    """
+    INSERT ... ON CONFLICT (email) ... RETURNING for UserDAO.create and AsyncUserDAO.create.
+
+    On PostgreSQL the first-admin claim is a data-modifying CTE of the same statement,
+    so claim and insert are one round trip. SQLite has no DML in CTEs; callers run
+    _claim_first_admin_statement first (its single writer already serializes the claim)
+    and pass whether it claimed.
+    """
+    role = obj_in.role or UserRole.USER
+
+    if dialect == "postgresql":
+        claim = _claim_first_admin_statement(dialect).returning(FirstAdminClaim.id).cte("claim")
+        claimed_role = cast(
+            case((exists(select(claim.c.id)), literal(UserRole.ADMIN.name)), else_=literal(role.name)),
+            User.role.type
+        )
+        stmt = postgresql.insert(User).from_select(
+            ["username", "email", "full_name", "role", "cognito_sub"],
+            select(
+                literal(obj_in.username),
+                literal(obj_in.email),
+                literal(obj_in.full_name),
+                claimed_role,
+                literal(obj_in.cognito_sub)
+            )
+        )
+    else:
+        stmt = sqlite.insert(User).values(
+            username=obj_in.username,
+            email=obj_in.email,
+            full_name=obj_in.full_name,
+            role=UserRole.ADMIN if claimed else role,
+            cognito_sub=obj_in.cognito_sub
+        )
+
+    return stmt.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={
+            "cognito_sub": func.coalesce(User.cognito_sub, stmt.excluded.cognito_sub),
+            "full_name": func.coalesce(User.full_name, stmt.excluded.full_name),
+        }
+    ).returning(*User.__table__.columns)
+
+
+def _find_existing_statement(emails: List[str], usernames: List[str]):
+    """SELECT of the users holding any of the emails or usernames, for find_existing."""
+    return select(User.email, User.username).where(or_(User.email.in_(emails), User.username.in_(usernames)))
+
+
+def _bulk_create_statement(dialect: str):
+    """Batched INSERT ... ON CONFLICT DO NOTHING ... RETURNING for bulk_create."""
+    return _dialect_insert(dialect)(User).on_conflict_do_nothing().returning(*User.__table__.columns)
+
+
+def _bulk_create_params(users: List[UserCreate]) -> List[dict]:
+    return [
+        {
+            "username": user.username,
+            "email": user.email,
+            "full_name": user.full_name,
+            "role": user.role or UserRole.USER,
+            "cognito_sub": user.cognito_sub,
+        }
+        for user in users
+    ]
+
+
+def _search_criteria(filters: UserSearchFilters) -> list:
+    """
+    WHERE criteria for UserDAO.search and AsyncUserDAO.search.
+
+    The text is matched case-insensitively with ILIKE, which PostgreSQL serves from the
+    pg_trgm GIN indexes on email, username and full_name.
+    """
+    criteria = []
+    if filters.query:
+        escaped = filters.query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{escaped}%" if filters.mode == UserSearchMode.PREFIX else f"%{escaped}%"
+        criteria.append(or_(
+            User.email.ilike(pattern, escape="\\"),
+            User.username.ilike(pattern, escape="\\"),
+            User.full_name.ilike(pattern, escape="\\"),
+        ))
+    if filters.role is not None:
+        criteria.append(User.role == filters.role)
+    if filters.is_active is not None:
+        criteria.append(User.is_active == filters.is_active)
+    return criteria
 
 
 class UserDAO(BaseDAO[User, UserResponse, UserCreate, UserUpdate]):
@@ -20,8 +127,8 @@ class UserDAO(BaseDAO[User, UserResponse, UserCreate, UserUpdate]):
         return self._to_schema(user) if user else None
 
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[UserResponse]:
-        """Get multiple users with pagination."""
-        users = db.query(User).offset(skip).limit(limit).all()
+        """Get multiple users with offset pagination (legacy; prefer get_page)."""
+        users = db.query(User).order_by(User.id).offset(skip).limit(limit).all()
         return self._to_schema_list(users)
 
     def get_by_email(self, db: Session, email: str) -> Optional[UserResponse]:
@@ -40,22 +147,77 @@ class UserDAO(BaseDAO[User, UserResponse, UserCreate, UserUpdate]):
         return self._to_schema(user) if user else None
 
     def create(self, db: Session, *, obj_in: UserCreate) -> UserResponse:
-        """Create a new user."""
-        # Check if this is the first user (make them admin)
-        user_count = db.query(User).count()
-        role = UserRole.ADMIN if user_count == 0 else obj_in.role
+        """
+        Create a new user, or return the existing user with the same email.
 
-        user = User(
-            username=obj_in.username,
-            email=obj_in.email,
-            full_name=obj_in.full_name,
-            role=role,
-            cognito_sub=obj_in.cognito_sub
-        )
-        db.add(user)
+        The user is written by one INSERT ... ON CONFLICT (email) ... RETURNING statement,
+        so retried signups are idempotent and no follow-up SELECT is needed. The first user
+        becomes admin by claiming the single first_admin_claim row in the same statement,
+        which needs no count over users and lets only one of several concurrent first
+        signups win.
+        """
+        dialect = db.get_bind().dialect.name
+        claimed = False
+        if dialect != "postgresql":
+            claimed = db.execute(_claim_first_admin_statement(dialect)).rowcount == 1
+
+        row = db.execute(_create_statement(dialect, obj_in, claimed)).one()
         db.commit()
-        db.refresh(user)
-        return self._to_schema(user)
+        return self.schema.model_validate(dict(row._mapping))
+
+    def search(
+        self, db: Session, filters: UserSearchFilters, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[UserResponse]:
+        """
+        Search users by email/username/full name text and role/is_active, keyset-paginated by ID.
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        stmt = self._keyset_select(cursor, limit).where(*_search_criteria(filters))
+        return self._to_page(db.execute(stmt).scalars().all(), limit)
+
+    def search_json(
+        self, db: Session, filters: UserSearchFilters, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> SerializedPage:
+        """Like search, but returns the page serialized to JSON (see BaseDAO.get_page_json)."""
+        stmt = self._keyset_select(cursor, limit, *self._schema_columns()).where(*_search_criteria(filters))
+        return self._to_serialized_page(db.execute(stmt).mappings().all(), limit)
+
+    def find_existing(
+        self, db: Session, emails: Iterable[str], usernames: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Find which of the given emails and usernames are already taken, in one query.
+
+        Returns:
+            (existing emails, existing usernames)
+        """
+        emails, usernames = list(emails), list(usernames)
+        if not emails and not usernames:
+            return set(), set()
+        rows = db.execute(_find_existing_statement(emails, usernames)).all()
+        return {row.email for row in rows}, {row.username for row in rows}
+
+    def bulk_create(self, db: Session, users: List[UserCreate]) -> List[UserResponse]:
+        """
+        Insert many users with one batched INSERT ... ON CONFLICT DO NOTHING ... RETURNING.
+
+        Rows whose email, username or cognito_sub is already taken (e.g. by a concurrent
+        signup) are skipped. Roles are taken as given; the first-admin claim is marked as
+        used so a later signup is not promoted over the imported users.
+
+        Returns:
+            The users actually created
+        """
+        if not users:
+            return []
+
+        dialect = db.get_bind().dialect.name
+        db.execute(_claim_first_admin_statement(dialect))
+        rows = db.execute(_bulk_create_statement(dialect), _bulk_create_params(users)).all()
+        db.commit()
+        return [self.schema.model_validate(dict(row._mapping)) for row in rows]
 
     def update(self, db: Session, *, db_obj: User, obj_in: UserUpdate) -> UserResponse:
         """Update an existing user."""
@@ -63,7 +225,9 @@ class UserDAO(BaseDAO[User, UserResponse, UserCreate, UserUpdate]):
         for field, value in update_data.items():
             setattr(db_obj, field, value)
 
+        publish_user_change(db, db_obj.id)
         db.commit()
+        identity_cache.invalidate(db_obj.id)
         db.refresh(db_obj)
         return self._to_schema(db_obj)
 
@@ -81,7 +245,9 @@ class UserDAO(BaseDAO[User, UserResponse, UserCreate, UserUpdate]):
             return False
 
         db.delete(user)
+        publish_user_change(db, id)
         db.commit()
+        identity_cache.invalidate(id)
         return True
 
     def get_count(self, db: Session) -> int:
@@ -111,6 +277,126 @@ class UserDAO(BaseDAO[User, UserResponse, UserCreate, UserUpdate]):
         return self.create(db, obj_in=user_create)
 
 
+class AsyncUserDAO(AsyncBaseDAO[User, UserResponse, UserCreate, UserUpdate]):
+    """
+    Data Access Object for User operations on an AsyncSession.
+    Async counterpart of UserDAO for request handlers; returns Pydantic objects.
+    """
+
+    def __init__(self):
+        super().__init__(User, UserResponse)
+
+    async def _get_one(self, db: AsyncSession, *criteria) -> Optional[UserResponse]:
+        user = (await db.execute(select(User).where(*criteria).limit(1))).scalar_one_or_none()
+        return self._to_schema(user) if user else None
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[UserResponse]:
+        """Get a user by ID."""
+        return await self._get_one(db, User.id == id)
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[UserResponse]:
+        """Get multiple users with offset pagination (legacy; prefer get_page)."""
+        users = (await db.execute(select(User).order_by(User.id).offset(skip).limit(limit))).scalars().all()
+        return self._to_schema_list(users)
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[UserResponse]:
+        """Get a user by email."""
+        return await self._get_one(db, User.email == email)
+
+    async def get_by_username(self, db: AsyncSession, username: str) -> Optional[UserResponse]:
+        """Get a user by username."""
+        return await self._get_one(db, User.username == username)
+
+    async def get_by_cognito_sub(self, db: AsyncSession, cognito_sub: str) -> Optional[UserResponse]:
+        """Get a user by Cognito sub (user ID)."""
+        return await self._get_one(db, User.cognito_sub == cognito_sub)
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> UserResponse:
+        """
+        Create a new user, or return the existing user with the same email.
+
+        Same single-statement upsert and first-admin claim as UserDAO.create.
+        """
+        dialect = db.get_bind().dialect.name
+        claimed = False
+        if dialect != "postgresql":
+            claimed = (await db.execute(_claim_first_admin_statement(dialect))).rowcount == 1
+
+        row = (await db.execute(_create_statement(dialect, obj_in, claimed))).one()
+        await db.commit()
+        return self.schema.model_validate(dict(row._mapping))
+
+    async def find_existing(
+        self, db: AsyncSession, emails: Iterable[str], usernames: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Async variant of UserDAO.find_existing."""
+        emails, usernames = list(emails), list(usernames)
+        if not emails and not usernames:
+            return set(), set()
+        rows = (await db.execute(_find_existing_statement(emails, usernames))).all()
+        return {row.email for row in rows}, {row.username for row in rows}
+
+    async def bulk_create(self, db: AsyncSession, users: List[UserCreate]) -> List[UserResponse]:
+        """Async variant of UserDAO.bulk_create."""
+        if not users:
+            return []
+
+        dialect = db.get_bind().dialect.name
+        await db.execute(_claim_first_admin_statement(dialect))
+        rows = (await db.execute(_bulk_create_statement(dialect), _bulk_create_params(users))).all()
+        await db.commit()
+        return [self.schema.model_validate(dict(row._mapping)) for row in rows]
+
+    async def search(
+        self, db: AsyncSession, filters: UserSearchFilters, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[UserResponse]:
+        """Async variant of UserDAO.search."""
+        stmt = self._keyset_select(cursor, limit).where(*_search_criteria(filters))
+        return self._to_page((await db.execute(stmt)).scalars().all(), limit)
+
+    async def search_json(
+        self, db: AsyncSession, filters: UserSearchFilters, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> SerializedPage:
+        """Async variant of UserDAO.search_json."""
+        stmt = self._keyset_select(cursor, limit, *self._schema_columns()).where(*_search_criteria(filters))
+        return self._to_serialized_page((await db.execute(stmt)).mappings().all(), limit)
+
+    async def update(self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate) -> UserResponse:
+        """Update an existing user."""
+        update_data = obj_in.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        await apublish_user_change(db, db_obj.id)
+        await db.commit()
+        identity_cache.invalidate(db_obj.id)
+        await db.refresh(db_obj)
+        return self._to_schema(db_obj)
+
+    async def update_by_id(self, db: AsyncSession, user_id: int, obj_in: UserUpdate) -> Optional[UserResponse]:
+        """Update a user by ID."""
+        user = await db.get(User, user_id)
+        if not user:
+            return None
+        return await self.update(db, db_obj=user, obj_in=obj_in)
+
+    async def delete(self, db: AsyncSession, *, id: int) -> bool:
+        """Delete a user by ID."""
+        user = await db.get(User, id)
+        if not user:
+            return False
+
+        await db.delete(user)
+        await apublish_user_change(db, id)
+        await db.commit()
+        identity_cache.invalidate(id)
+        return True
+
+    async def get_count(self, db: AsyncSession) -> int:
+        """Get the total number of users."""
+        return (await db.execute(select(func.count()).select_from(User))).scalar_one()
+
+
 # Keep the old UserCRUD class for backward compatibility during migration
 class UserCRUD:
     """
@@ -185,7 +471,9 @@ class UserCRUD:
             if hasattr(user, key):
                 setattr(user, key, value)
 
+        publish_user_change(db, user_id)
         db.commit()
+        identity_cache.invalidate(user_id)
         db.refresh(user)
         return user
 
@@ -197,5 +485,7 @@ class UserCRUD:
             return False
 
         db.delete(user)
+        publish_user_change(db, user_id)
         db.commit()
+        identity_cache.invalidate(user_id)
         return True
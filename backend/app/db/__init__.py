@@ -1,13 +1,25 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # Get database URL from config service
 from app.core.config_service import config_service
+from app.db.pool import engine_options, instrument_pool
 
 DATABASE_URL = config_service.get_database_url()
+ASYNC_DATABASE_URL = config_service.get_async_database_url()
 
-engine = create_engine(DATABASE_URL)
+# Sync engine for the CLI, migrations and the remaining sync code paths
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Async engine for request handlers, so DB-bound requests do not block the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Checkout wait times and in-use/overflow peaks, served by /health/db
+instrument_pool(engine)
+instrument_pool(async_engine.sync_engine)
+
+Base = declarative_base()
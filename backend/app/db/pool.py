@@ -0,0 +1,195 @@
+"""
+Database connection pool configuration and metrics.
+
+Pool size, overflow, timeout, recycling and pre-ping come from ConfigService. The
+queue pools used for PostgreSQL time every checkout (waiting for a free connection,
+opening a new one and the pre-ping) and record in-use and overflow peaks, so pools
+can be sized from data; pool_stats() returns the numbers served by the admin-only
+/health/db endpoint.
+
+PgBouncer mode makes asyncpg compatible with PgBouncer's transaction pooling, which
+cannot keep named prepared statements across transactions.
+"""
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from pydantic import BaseModel
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config_service import config_service
+from app.core.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolStats(BaseModel):
+    """Point-in-time state of a connection pool plus checkout statistics since startup"""
+    pool_class: str
+    size: int = 0
+    max_overflow: int = 0
+    checked_out: int = 0
+    checked_in: int = 0
+    overflow: int = 0
+    peak_checked_out: int = 0
+    peak_overflow: int = 0
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_ms_avg: float = 0.0
+    wait_ms_p50: float = 0.0
+    wait_ms_p99: float = 0.0
+    wait_ms_max: float = 0.0
+
+
+class PoolMetrics:
+    """Thread-safe checkout counters and a window of recent checkout wait times."""
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize the metrics.
+
+        Args:
+            window: Number of recent checkouts the wait percentiles are computed over
+        """
+        self._lock = threading.Lock()
+        self._recent_waits: Deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+
+    def record_checkout(self, wait_ms: float, checked_out: int, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._recent_waits.append(wait_ms)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    @staticmethod
+    def _percentile(ordered, fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def snapshot(self, pool: Pool) -> PoolStats:
+        """Combine the pool's current state with the recorded statistics."""
+        stats = PoolStats(pool_class=type(pool).__name__)
+        if isinstance(pool, QueuePool):
+            stats.size = pool.size()
+            stats.max_overflow = pool._max_overflow
+            stats.checked_out = pool.checkedout()
+            stats.checked_in = pool.checkedin()
+            stats.overflow = max(0, pool.overflow())
+
+        with self._lock:
+            ordered = sorted(self._recent_waits)
+            stats.peak_checked_out = self.peak_checked_out
+            stats.peak_overflow = self.peak_overflow
+            stats.checkouts = self.checkouts
+            stats.timeouts = self.timeouts
+            stats.wait_ms_avg = self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+            stats.wait_ms_max = self.max_wait_ms
+        stats.wait_ms_p50 = self._percentile(ordered, 0.50)
+        stats.wait_ms_p99 = self._percentile(ordered, 0.99)
+        return stats
+
+
+class _TimedPoolMixin:
+    """Records checkout wait time, in-use and overflow peaks and timeouts into PoolMetrics."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            logger.warning(f"Timed out waiting for a database connection ({self.status()})")
+            raise
+        metrics.record_checkout(
+            (time.perf_counter() - start) * 1000, self.checkedout(), max(0, self.overflow())
+        )
+        return connection
+
+    def recreate(self):
+        # Engine.dispose() replaces the pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool that records checkout metrics."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (used by async engines) that records checkout metrics."""
+
+
+def engine_options(
+    database_url: str,
+    is_async: bool = False,
+    pool_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Keyword arguments for create_engine/create_async_engine from the pool configuration.
+
+    SQLite keeps SQLAlchemy's default pooling: it has no server connections to size.
+
+    Args:
+        database_url: URL the engine connects to
+        is_async: Build options for create_async_engine
+        pool_config: Pool settings (defaults to ConfigService.get_database_pool_config())
+    """
+    if database_url.startswith("sqlite"):
+        return {}
+
+    pool_config = pool_config or config_service.get_database_pool_config()
+    options: Dict[str, Any] = {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": pool_config["pool_size"],
+        "max_overflow": pool_config["max_overflow"],
+        "pool_timeout": pool_config["pool_timeout"],
+        "pool_recycle": pool_config["pool_recycle"],
+        "pool_pre_ping": pool_config["pool_pre_ping"],
+    }
+
+    if pool_config["pgbouncer_mode"] and "+asyncpg" in database_url:
+        # Transaction pooling may run each statement on a different server connection:
+        # never reuse prepared statements, and give each one a unique name
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return options
+
+
+def instrument_pool(engine: Engine) -> PoolMetrics:
+    """Attach PoolMetrics to an engine's pool (pools other than the timed ones only report their state)."""
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+    return metrics
+
+
+def pool_stats(engine: Engine) -> PoolStats:
+    """Current PoolStats of an engine (pass async_engine.sync_engine for an async engine)."""
+    metrics = getattr(engine.pool, "metrics", None) or PoolMetrics()
+    return metrics.snapshot(engine.pool)
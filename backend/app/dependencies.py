@@ -1,12 +1,18 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db import SessionLocal
+from app.db import AsyncSessionLocal, SessionLocal
 from app.core.jwt_utils import jwt_validator
+from app.core.identity_cache import identity_cache
 from app.models.user import UserRole
-from app.crud.user import UserDAO
-from app.services.user_service import UserService
+from app.crud.user import AsyncUserDAO, UserDAO
+from app.services.user_service import AsyncUserService, UserService
+from app.services.user_import_service import UserImportService
+from app.services.cognito_service import cognito_service
+from app.crud.llm_usage import LLMUsageDAO
+from app.services.llm_usage_service import LLMUsageService
 from app.schemas.auth import TokenData
 from app.schemas.user import UserResponse
 
@@ -25,6 +31,14 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for an async database session, for async route handlers.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_user_dao() -> UserDAO:
     """
     Dependency for UserDAO instance.
@@ -39,6 +53,41 @@ def get_user_service(user_dao: UserDAO = Depends(get_user_dao)) -> UserService:
     return UserService(user_dao)
 
 
+def get_async_user_dao() -> AsyncUserDAO:
+    """
+    Dependency for AsyncUserDAO instance.
+    """
+    return AsyncUserDAO()
+
+
+def get_async_user_service(user_dao: AsyncUserDAO = Depends(get_async_user_dao)) -> AsyncUserService:
+    """
+    Dependency for AsyncUserService instance.
+    """
+    return AsyncUserService(user_dao)
+
+
+def get_user_import_service(user_dao: AsyncUserDAO = Depends(get_async_user_dao)) -> UserImportService:
+    """
+    Dependency for UserImportService instance.
+    """
+    return UserImportService(user_dao, cognito_service)
+
+
+def get_llm_usage_dao() -> LLMUsageDAO:
+    """
+    Dependency for LLMUsageDAO instance.
+    """
+    return LLMUsageDAO()
+
+
+def get_llm_usage_service(llm_usage_dao: LLMUsageDAO = Depends(get_llm_usage_dao)) -> LLMUsageService:
+    """
+    Dependency for LLMUsageService instance.
+    """
+    return LLMUsageService(llm_usage_dao)
+
+
 async def get_current_user_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> TokenData:
@@ -53,7 +102,7 @@ async def get_current_user_token(
 
     try:
         token = credentials.credentials
-        token_data = jwt_validator.validate_token(token)
+        token_data = await jwt_validator.avalidate_token(token)
 
         if token_data.username is None and token_data.user_sub is None:
             raise credentials_exception
@@ -65,21 +114,31 @@ async def get_current_user_token(
 
 async def get_current_user(
     token_data: TokenData = Depends(get_current_user_token),
-    db: Session = Depends(get_db),
-    user_service: UserService = Depends(get_user_service)
+    db: AsyncSession = Depends(get_async_db),
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ) -> UserResponse:
     """
     Dependency to get current user from database.
     Returns UserResponse (Pydantic model) instead of SQLAlchemy model.
+    Users are served from the identity cache when possible, so most requests do not
+    query the database.
     """
-    user = None
+    user = identity_cache.get(user_sub=token_data.user_sub, username=token_data.username)
 
-    # Try to find user by cognito_sub first, then by username
-    if token_data.user_sub:
-        user = user_service.get_user_by_cognito_sub(db, cognito_sub=token_data.user_sub)
+    if user is None:
+        generation = identity_cache.generation
 
-    if not user and token_data.username:
-        user = user_service.get_user_by_username(db, username=token_data.username)
+        # Try to find user by cognito_sub first, then by username
+        if token_data.user_sub:
+            user = await user_service.get_user_by_cognito_sub(db, cognito_sub=token_data.user_sub)
+
+        if not user and token_data.username:
+            user = await user_service.get_user_by_username(db, username=token_data.username)
+
+        if user is not None:
+            identity_cache.set(
+                user, user_sub=token_data.user_sub, username=token_data.username, generation=generation
+            )
 
     if user is None:
         raise HTTPException(
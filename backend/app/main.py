@@ -1,11 +1,21 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.routers import router as api_router
-from app.core.config_service import settings
+from app.routers.user import NEXT_CURSOR_HEADER
+from app.core.config_service import settings, config_service
+from app.core.jwt_utils import jwt_validator
+from app.core.identity_cache import identity_invalidation_listener
+from app.services.cognito_service import cognito_service
+from app.core.llm_metrics import llm_metrics_sink
+from app.core.model_router import model_router
+from app.db import async_engine, engine
+from app.db.pool import pool_stats
 from app.db.init_db import init_db
 from app.core.logging_service import get_logger
+from app.dependencies import get_current_admin_user
+from app.schemas.user import UserResponse
 from app.middlewaremiddleware.logging_middleware import RequestLoggingMiddleware
 
 # Configure logging
@@ -22,10 +32,22 @@ async def lifespan(_: FastAPI):
         logger.error("Database setup failed", service="database", status="failed")
         raise RuntimeError("Failed to initialize database")
 
+    llm_metrics_sink.start(interval_seconds=config_service.get("llm_metrics_flush_interval_seconds", 60.0))
+    # Fetch signing keys off the request path so the first request does not wait on JWKS
+    jwt_validator.start()
+    # Drop cached users changed by other workers
+    identity_invalidation_listener.start()
+
     yield
 
     # Shutdown logic
     logger.info("Application shutting down")
+    identity_invalidation_listener.stop()
+    cognito_service.close()
+    model_router.close()
+    await jwt_validator.aclose()
+    llm_metrics_sink.stop()
+    await async_engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -55,6 +77,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # 2. Request logging middleware
@@ -71,9 +94,16 @@ async def read_root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db")
+async def database_pool_health(current_user: UserResponse = Depends(get_current_admin_user)):
+    """Connection pool state and checkout statistics of the sync and async engines (admin only)."""
+    return {
+        "sync": pool_stats(engine),
+        "async": pool_stats(async_engine.sync_engine),
+    }
+
 if __name__ == "__main__":
     import uvicorn
-    from app.core.config_service import config_service
 
     # Get host and port from configuration
     host = config_service.get("host", "0.0.0.0")
@@ -2,5 +2,8 @@
 
 from app.db import Base
 from .user import User
+from .llm_cache import LLMCacheEntry
+from .llm_usage import LLMUsage
+from .first_admin_claim import FirstAdminClaim
 
-__all__ = ["User", "Base"]  # Export your models for easier access
\ No newline at end of file
+__all__ = ["User", "LLMCacheEntry", "LLMUsage", "FirstAdminClaim", "Base"]  # Export your models for easier access
\ No newline at end of file
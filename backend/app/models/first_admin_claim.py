@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.sql import func
+from app.db import Base
+
+
+class FirstAdminClaim(Base):
+    """
+    SQLAlchemy model for the one-time first-admin promotion.
+    Holds at most one row: the signup that inserts it becomes the admin. The primary
+    key makes concurrent first signups race on a unique index instead of a count.
+    """
+    __tablename__ = "first_admin_claim"
+
+    id = Column(Integer, primary_key=True)
+    claimed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, DateTime, JSON, String
+from sqlalchemy.sql import func
+from app.db import Base
+
+
+class LLMCacheEntry(Base):
+    """
+    SQLAlchemy model for the shared LLM response cache tier
+    """
+    __tablename__ = "llm_response_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 of model, config and messages
+    model_id = Column(String, nullable=False, index=True)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
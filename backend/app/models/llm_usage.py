@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Float, Integer, String
+from app.db import Base
+
+
+class LLMUsage(Base):
+    """
+    SQLAlchemy model for aggregated LLM usage.
+    Each row sums the calls of one user on one model between two metric flushes.
+    """
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    period_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    period_end = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(String, nullable=True, index=True)
+    model_id = Column(String, nullable=False, index=True)
+    calls = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    cache_hits = Column(Integer, nullable=False, default=0)
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    reasoning_tokens = Column(Integer, nullable=False, default=0)
+    total_latency_ms = Column(Float, nullable=False, default=0.0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
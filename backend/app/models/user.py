@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Enum
+from sqlalchemy import DDL, Boolean, Column, Index, Integer, String, Enum, event
 from sqlalchemy.sql import expression
 from app.db import Base
 import enum
@@ -23,3 +23,25 @@ class User(Base):
     is_active = Column(Boolean, server_default=expression.true(), nullable=False)
     role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
     cognito_sub = Column(String, unique=True, index=True, nullable=True)  # Cognito user ID
+
+    __table_args__ = (
+        # Trigram indexes serve the ILIKE prefix/substring matching of user search
+        *(
+            Index(
+                f"ix_users_{column}_trgm", column,
+                postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+            ).ddl_if(dialect="postgresql")
+            for column in ("email", "username", "full_name")
+        ),
+        # Role/is_active filtered searches, paged by id
+        Index("ix_users_role_is_active_id", "role", "is_active", "id"),
+    )
+
+
+# The trigram indexes need the pg_trgm extension (created by the migration; this
+# covers databases built with create_all)
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
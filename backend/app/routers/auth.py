@@ -1,31 +1,37 @@
 """
 Authentication router for user registration, login, and token management.
 """
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
-from app.dependencies import get_db, get_current_active_user, get_user_service
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_async_db, get_async_user_service, get_current_active_user
 from app.schemas.auth import (
     SignUpRequest, SignUpResponse, ConfirmSignUpRequest, ConfirmSignUpResponse,
     SignInRequest, SignInResponse, RefreshTokenRequest, RefreshTokenResponse,
     UserInfo, MessageResponse
 )
-from app.schemas.user import UserResponse, UserUpdate
+from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.services.cognito_service import cognito_service
-from app.services.user_service import UserService
+from app.services.user_service import AsyncUserService
 from app.core.logging_service import get_logger
 from app.utils.username_utils import validate_and_normalize_email
 from app.core.exceptions import CognitoError, ValidationError
+from app.core.jwt_utils import jwt_validator
 
 logger = get_logger(__name__)
 
 auth_router = APIRouter()
 
+# Sign-out accepts, but does not require, the bearer token
+optional_security = HTTPBearer(auto_error=False)
+
 
 @auth_router.post("/signup", response_model=SignUpResponse)
 async def sign_up(
     request: SignUpRequest,
-    db: Session = Depends(get_db),
-    user_service: UserService = Depends(get_user_service)
+    db: AsyncSession = Depends(get_async_db),
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ):
     """
     Register a new user with Cognito and create user record in database.
@@ -40,9 +46,10 @@ async def sign_up(
                 detail=str(e)
             )
 
-        # Check if user already exists in database
-        existing_email = user_service.get_user_by_email(db, normalized_email)
-        if existing_email:
+        # Check if user already exists in database; imported users without a Cognito
+        # account (no cognito_sub) complete their registration here instead
+        existing_email = await user_service.get_user_by_email(db, normalized_email)
+        if existing_email and existing_email.cognito_sub:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -55,13 +62,15 @@ async def sign_up(
             full_name=request.full_name or ""
         )
 
-        # Create user record in database
-        user_service.create_user_from_params(
-            db=db,
-            username=normalized_email,  # Use email as username
-            email=normalized_email,
-            full_name=request.full_name,
-            cognito_sub=cognito_response["user_sub"]
+        # Create user record in database (links the Cognito account to an imported row)
+        await user_service.create_user(
+            db,
+            UserCreate(
+                username=normalized_email,  # Use email as username
+                email=normalized_email,
+                full_name=request.full_name,
+                cognito_sub=cognito_response["user_sub"]
+            )
         )
 
         logger.info(f"User {normalized_email} signed up successfully")
@@ -128,8 +137,8 @@ async def confirm_sign_up(request: ConfirmSignUpRequest):
 @auth_router.post("/signin", response_model=SignInResponse)
 async def sign_in(
     request: SignInRequest,
-    db: Session = Depends(get_db),
-    user_service: UserService = Depends(get_user_service)
+    db: AsyncSession = Depends(get_async_db),
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ):
     """
     Sign in user and return access tokens.
@@ -141,26 +150,28 @@ async def sign_in(
             password=request.password
         )
 
-        # Get user info from Cognito
-        user_info = await cognito_service.get_user_info(tokens["access_token"])
+        # Read user info from the ID token (GetUser is only a fallback)
+        user_info = await cognito_service.get_sign_in_user_info(tokens)
 
         # Get or update user in database
-        user = user_service.get_user_by_cognito_sub(db, user_info["user_sub"])
+        user = await user_service.get_user_by_cognito_sub(db, user_info["user_sub"])
         if not user:
             # User might exist with email but no cognito_sub
-            user = user_service.get_user_by_email(db, request.email)
+            user = await user_service.get_user_by_email(db, request.email)
             if user:
                 # Update user with cognito_sub
                 user_update = UserUpdate(cognito_sub=user_info["user_sub"])
-                user = user_service.update_user(db, user.id, user_update)
+                user = await user_service.update_user(db, user.id, user_update)
             else:
                 # Create new user record
-                user = user_service.create_user_from_params(
-                    db=db,
-                    username=request.email,  # Use email as username
-                    email=user_info["email"],
-                    full_name=user_info["name"],
-                    cognito_sub=user_info["user_sub"]
+                user = await user_service.create_user(
+                    db,
+                    UserCreate(
+                        username=request.email,  # Use email as username
+                        email=user_info["email"],
+                        full_name=user_info["name"],
+                        cognito_sub=user_info["user_sub"]
+                    )
                 )
 
         if not user:
@@ -243,10 +254,14 @@ async def get_current_user_info(current_user: UserResponse = Depends(get_current
 
 
 @auth_router.post("/signout", response_model=MessageResponse)
-async def sign_out():
+async def sign_out(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
     """
     Sign out user (client should discard tokens).
+    The presented token is also dropped from the verified-token cache.
     """
+    if credentials is not None:
+        jwt_validator.revoke_token(credentials.credentials)
+
     return MessageResponse(
         message="Signed out successfully. Please discard your tokens."
     )
@@ -0,0 +1,118 @@
+"""
+LLM router for conversational endpoints backed by AWS Bedrock.
+"""
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.dependencies import get_db, get_current_active_user, get_current_admin_user, get_llm_usage_service
+from app.schemas.llm import ConverseRequest, LLMUsageSummary
+from app.schemas.user import UserResponse
+from app.core.config_service import config_service
+from app.core.exceptions import LLMThrottledError
+from app.core.llm_context import context_window_manager
+from app.core.llm_metrics import llm_user_context
+from app.core.llm_service import LLMClient, LLMFactory, ModelName
+from app.core.model_router import model_router
+from app.services.llm_usage_service import LLMUsageService
+from app.core.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+llm_router = APIRouter()
+
+
+def _format_sse(event: str, data: str) -> str:
+    """Format a single server-sent event"""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _stream_events(
+    client: LLMClient,
+    request: ConverseRequest,
+    user: UserResponse,
+    owns_client: bool = True
+) -> AsyncIterator[str]:
+    """Relay stream events from the LLM client as server-sent events"""
+    username = user.username
+    try:
+        with llm_user_context(str(user.id)):
+            async for event in client.aconverse_stream(request.messages):
+                yield _format_sse("delta", event.model_dump_json(exclude_defaults=True))
+        yield _format_sse("done", "{}")
+    except LLMThrottledError as e:
+        logger.warning(f"Streaming conversation throttled for {username}: {e}")
+        yield _format_sse("error", json.dumps({"detail": "The model is busy. Please try again shortly."}))
+    except Exception as e:
+        # Headers are already sent at this point, so report the failure in-band
+        logger.error(f"Streaming conversation failed for {username}: {e}")
+        yield _format_sse("error", json.dumps({"detail": "The model failed to generate a response."}))
+    finally:
+        # Shared routed clients stay open across requests
+        if owns_client:
+            client.close()
+
+
+@llm_router.post("/converse/stream")
+async def converse_stream(
+    request: ConverseRequest,
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Stream a conversation response as server-sent events.
+    Emits `delta` events carrying text/reasoning increments, then a final `done` event.
+    When no model is given, the request is routed to the cheapest adequate model,
+    using the request's config when one is given.
+    """
+    # Routed clients are shared unless built from the request's config
+    owns_client = request.model is not None or request.config is not None
+    if request.model is not None:
+        client = LLMFactory.create_client(
+            model_name=request.model,
+            region_name=config_service.get_aws_credentials()["region"],
+            config=request.config,
+            context_manager=context_window_manager
+        )
+    else:
+        client = model_router.select_client(request.messages, request.routing, request.config)
+
+    logger.info(f"Starting streamed conversation for {current_user.username} with {ModelName(client.model_id).value}")
+
+    return StreamingResponse(
+        _stream_events(client, request, current_user, owns_client),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+# The usage endpoints flush the metrics sink and query through a sync Session, so they
+# are plain functions that FastAPI runs in its threadpool
+@llm_router.get("/usage/models", response_model=List[LLMUsageSummary])
+def get_usage_by_model(
+    since: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user),
+    llm_usage_service: LLMUsageService = Depends(get_llm_usage_service)
+):
+    """
+    Get LLM token, latency and cost totals per model (admin only).
+    """
+    return llm_usage_service.get_usage_by_model(db, since=since)
+
+
+@llm_router.get("/usage/users", response_model=List[LLMUsageSummary])
+def get_usage_by_user(
+    since: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user),
+    llm_usage_service: LLMUsageService = Depends(get_llm_usage_service)
+):
+    """
+    Get LLM token, latency and cost totals per user (admin only).
+    """
+    return llm_usage_service.get_usage_by_user(db, since=since)
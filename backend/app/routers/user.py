@@ -1,35 +1,124 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from sqlalchemy.orm import Session
-from app.schemas.user import UserResponse
-from app.services.user_service import UserService
-from app.dependencies import get_db, get_user_service
+import io
+from fastapi import APIRouter, HTTPException, Depends, File, Query, Response, UploadFile
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.exceptions import ValidationError
+from app.schemas.pagination import SerializedPage
+from app.models.user import UserRole
+from app.schemas.user import (
+    UserResponse, UserImportFormat, UserImportSummary, UserSearchFilters, UserSearchMode
+)
+from app.services.user_service import AsyncUserService
+from app.services.user_import_service import UserImportService, detect_import_format
+from app.dependencies import (
+    get_async_db, get_async_user_service, get_user_import_service, get_current_admin_user
+)
 
 user_router = APIRouter()
 
+# Response header carrying the cursor of the next page of GET /users/
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _page_response(page: SerializedPage) -> Response:
+    """Send a page serialized by the DAO as is; response_model then only documents the schema."""
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor is not None else None
+    return Response(content=page.content, media_type="application/json", headers=headers)
+
+
 @user_router.get("/users/", response_model=List[UserResponse])
 async def read_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    user_service: UserService = Depends(get_user_service)
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    """
+    Retrieve users ordered by ID.
+
+    Pages are keyset-paginated: pass the X-Next-Cursor response header as `cursor`
+    to get the next page; the header is absent on the last page. `skip` selects the
+    legacy offset mode, whose cost grows with the offset.
+    """
+    if skip:
+        if cursor is not None:
+            raise HTTPException(status_code=400, detail="Use either cursor or skip, not both")
+        return await user_service.get_users(db, skip=skip, limit=limit)
+
+    try:
+        page = await user_service.get_users_page_json(db, cursor=cursor, limit=limit)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    return _page_response(page)
+
+@user_router.get("/users/search", response_model=List[UserResponse])
+async def search_users(
+    q: Optional[str] = Query(None, max_length=255),
+    mode: UserSearchMode = UserSearchMode.CONTAINS,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    user_service: AsyncUserService = Depends(get_async_user_service),
+    current_user: UserResponse = Depends(get_current_admin_user)
 ):
     """
-    Retrieve all users.
+    Search users by email, username or full name (admin only).
+
+    `q` matches case-insensitively as a prefix or substring (`mode`); `role` and
+    `is_active` filter the results. Results are ordered by ID and paged like GET
+    /users/ through the X-Next-Cursor header.
     """
-    users = user_service.get_users(db, skip=skip, limit=limit)
-    return users
+    filters = UserSearchFilters(query=q, mode=mode, role=role, is_active=is_active)
+    try:
+        page = await user_service.search_users_json(db, filters, cursor=cursor, limit=limit)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    return _page_response(page)
 
 @user_router.get("/users/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    user_service: UserService = Depends(get_user_service)
+    db: AsyncSession = Depends(get_async_db),
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ):
     """
     Retrieve a specific user by ID.
     """
-    user = user_service.get_user_by_id(db, user_id=user_id)
+    user = await user_service.get_user_by_id(db, user_id=user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
\ No newline at end of file
+    return user
+
+@user_router.post("/users/import", response_model=UserImportSummary)
+async def import_users(
+    file: UploadFile = File(...),
+    file_format: Optional[UserImportFormat] = Query(None, alias="format"),
+    create_in_cognito: bool = False,
+    send_invites: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    import_service: UserImportService = Depends(get_user_import_service),
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    Bulk-create users from a CSV or JSONL upload (admin only).
+    The format is taken from the file name unless given; rows are streamed and
+    inserted in batches (the upload is read in a worker thread), and the response
+    reports the outcome of every row.
+
+    Users imported into the database only finish onboarding by signing up with their
+    email. Users also created in Cognito must be invited (send_invites) and sign in
+    once they have set a password from the invitation.
+    """
+    file_format = file_format or detect_import_format(file.filename, file.content_type)
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await import_service.import_users(
+            db, lines, file_format, create_in_cognito=create_in_cognito, send_invites=send_invites
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    finally:
+        lines.detach()
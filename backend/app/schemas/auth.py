@@ -76,6 +76,7 @@ class TokenData(BaseModel):
     username: Optional[str] = None
     user_sub: Optional[str] = None
     email: Optional[str] = None
+    exp: Optional[int] = None
 
 
 class PasswordChangeRequest(BaseModel):
@@ -0,0 +1,29 @@
+"""
+LLM schemas for API requests and responses.
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.core.llm_service import LLMConfig, Message, ModelName
+from app.core.model_router import RoutingHints
+
+
+class ConverseRequest(BaseModel):
+    """Request schema for a conversation with an LLM (routed to a model when none is given)"""
+    messages: List[Message] = Field(..., min_length=1)
+    model: Optional[ModelName] = None
+    config: Optional[LLMConfig] = None
+    routing: Optional[RoutingHints] = None
+
+
+class LLMUsageSummary(BaseModel):
+    """Aggregated LLM usage for a model or a user"""
+    model_id: Optional[str] = None
+    user_id: Optional[str] = None
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reasoning_tokens: int = 0
+    avg_latency_ms: float = 0.0
+    cost_usd: float = 0.0
@@ -0,0 +1,52 @@
+"""
+Cursor (keyset) pagination.
+
+Pages are ordered by id and continue after the last id of the previous page, so
+fetching any page costs one index range scan of page size, however deep it is.
+Cursors are opaque to clients: URL-safe base64 of a small JSON document.
+"""
+import base64
+import binascii
+import json
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.exceptions import ValidationError
+
+ItemType = TypeVar("ItemType")
+
+
+class CursorPage(BaseModel, Generic[ItemType]):
+    """One page of results and the cursor of the next page (None on the last page)."""
+    items: List[ItemType]
+    next_cursor: Optional[str] = None
+
+
+class SerializedPage(BaseModel):
+    """A page already rendered as a JSON array, returned to clients without re-validation."""
+    content: bytes
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(last_id: int) -> str:
+    """Build the cursor of the page following the row with this id."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Get the id a cursor continues after.
+
+    Raises:
+        ValidationError: If the cursor was not produced by encode_cursor
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValidationError("Invalid pagination cursor", error_code="InvalidCursor") from e
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValidationError("Invalid pagination cursor", error_code="InvalidCursor")
+    return last_id
@@ -1,5 +1,6 @@
+from enum import Enum
 from pydantic import BaseModel, ConfigDict, EmailStr
-from typing import Optional
+from typing import List, Optional
 from app.models.user import UserRole
 
 
@@ -38,4 +39,61 @@ class UserResponse(UserBase):
 
 class UserInDB(UserResponse):
     """Schema for user data as stored in database."""
-    pass
\ No newline at end of file
+    pass
+
+
+class UserSearchMode(str, Enum):
+    """How the search text is matched against email, username and full name."""
+    PREFIX = "prefix"
+    CONTAINS = "contains"
+
+
+class UserSearchFilters(BaseModel):
+    """Criteria of a user search; unset criteria do not filter."""
+    query: Optional[str] = None
+    mode: UserSearchMode = UserSearchMode.CONTAINS
+    role: Optional[UserRole] = None
+    is_active: Optional[bool] = None
+
+
+class UserImportFormat(str, Enum):
+    """File formats accepted by the bulk user import."""
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+class UserImportStatus(str, Enum):
+    """Outcome of one row of a bulk user import."""
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+
+class UserImportRow(BaseModel):
+    """One user in a bulk import file (username defaults to the email)."""
+    email: EmailStr
+    username: Optional[str] = None
+    full_name: Optional[str] = None
+    role: UserRole = UserRole.USER
+
+
+class UserImportResult(BaseModel):
+    """Result of importing one row."""
+    row: int
+    email: Optional[str] = None
+    status: UserImportStatus
+    user_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class UserImportSummary(BaseModel):
+    """Result of a bulk user import."""
+    total: int = 0
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    failed: int = 0
+    # Cognito users created for rows that were not inserted and could not be deleted again
+    cognito_orphans: int = 0
+    results: List[UserImportResult] = []
@@ -2,19 +2,36 @@
 Cognito service for handling authentication operations.
 Supports both LocalStack (development) and AWS Cognito (production).
 """
-import boto3
+import asyncio
+import contextvars
+import functools
 import hmac
 import hashlib
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Any
 from botocore.exceptions import ClientError
 from app.core.config_service import config_service
+from app.core.aws_clients import aws_client_registry
+from app.core.jwt_utils import jwt_validator
 from app.core.logging_service import get_logger
 from app.core.exceptions import CognitoError, get_user_friendly_error_message
 
 
 logger = get_logger(__name__)
 
+# Seconds an async call may take, including time queued for a worker, per Cognito operation
+DEFAULT_OPERATION_TIMEOUTS: Dict[str, float] = {
+    "initiate_auth": 5.0,
+    "get_user": 5.0,
+    "sign_up": 10.0,
+    "confirm_sign_up": 10.0,
+    "admin_confirm_sign_up": 10.0,
+    "admin_create_user": 10.0,
+    "admin_delete_user": 10.0,
+}
+
 
 class CognitoService:
     """Service for handling Cognito authentication operations"""
@@ -23,34 +40,86 @@ class CognitoService:
         self.config = config_service.get_cognito_config()
         self.aws_config = config_service.get_aws_credentials()
         self.is_localstack = config_service.is_localstack_enabled()
-        
+        self.max_concurrency = config_service.get("cognito_max_concurrency", 16)
+        self.timeout_seconds = config_service.get("cognito_timeout_seconds", 10.0)
+        self.operation_timeouts = dict(DEFAULT_OPERATION_TIMEOUTS)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
         # Initialize Cognito client
         self._init_client()
 
     def _init_client(self):
         """Initialize the Cognito client"""
         try:
-            session = boto3.Session(
+            # Use LocalStack endpoint if enabled
+            endpoint_url = self.config["endpoint_url"] if self.is_localstack and self.config["endpoint_url"] else None
+
+            self.client = aws_client_registry.get_client(
+                "cognito-idp",
+                region_name=self.config["region"],
+                endpoint_url=endpoint_url,
                 aws_access_key_id=self.aws_config["access_key_id"] or None,
                 aws_secret_access_key=self.aws_config["secret_access_key"] or None,
-                region_name=self.config["region"]
+                max_pool_connections=self.max_concurrency,
+                # Bound the worker thread too, not only the awaiting coroutine: one attempt,
+                # since botocore retries would keep the thread busy long after _call gave up
+                connect_timeout=self.timeout_seconds,
+                read_timeout=self.timeout_seconds,
+                retries={"total_max_attempts": 1, "mode": "standard"}
             )
-            
-            # Use LocalStack endpoint if enabled
-            if self.is_localstack and self.config["endpoint_url"]:
-                self.client = session.client(
-                    "cognito-idp",
-                    endpoint_url=self.config["endpoint_url"]
-                )
+
+            if endpoint_url:
                 logger.info("Initialized Cognito client with LocalStack endpoint")
             else:
-                self.client = session.client("cognito-idp")
                 logger.info("Initialized Cognito client with AWS endpoint")
                 
         except Exception as e:
             logger.error(f"Failed to initialize Cognito client: {e}")
             raise
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the bounded worker pool that runs blocking boto3 calls"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix="cognito"
+                    )
+        return self._executor
+
+    async def _call(self, operation: str, **params: Any) -> Dict[str, Any]:
+        """
+        Run a Cognito API call on the worker pool without blocking the event loop.
+
+        The call is bounded by the operation's timeout, which includes time spent waiting
+        for a free worker, so a burst of sign-ins fails fast instead of piling up.
+
+        Raises:
+            ClientError: If Cognito rejects the call
+            CognitoError: If the call times out
+        """
+        timeout = self.operation_timeouts.get(operation, self.timeout_seconds)
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        func = functools.partial(context.run, getattr(self.client, operation), **params)
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(self._get_executor(), func), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Cognito {operation} timed out after {timeout}s")
+            raise CognitoError(
+                "Authentication service is taking too long to respond. Please try again.",
+                error_code="Timeout"
+            )
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
     def _calculate_secret_hash(self, username: str) -> str:
         """Calculate the secret hash for Cognito client"""
         if not self.config["client_secret"]:
@@ -88,7 +157,7 @@ class CognitoService:
             if self.config["client_secret"]:
                 params["SecretHash"] = self._calculate_secret_hash(cognito_username)
 
-            response = self.client.sign_up(**params)
+            response = await self._call("sign_up", **params)
 
             # In development mode, auto-confirm the user
             user_confirmed = response.get("UserConfirmed", False)
@@ -119,7 +188,8 @@ class CognitoService:
     async def _admin_confirm_sign_up(self, email: str) -> None:
         """Admin confirm sign up for development mode"""
         try:
-            self.client.admin_confirm_sign_up(
+            await self._call(
+                "admin_confirm_sign_up",
                 UserPoolId=self.config["user_pool_id"],
                 Username=email
             )
@@ -146,7 +216,7 @@ class CognitoService:
             if self.config["client_secret"]:
                 params["SecretHash"] = self._calculate_secret_hash(cognito_username)
 
-            self.client.confirm_sign_up(**params)
+            await self._call("confirm_sign_up", **params)
             logger.info(f"User {email} confirmed successfully")
             return True
 
@@ -175,7 +245,7 @@ class CognitoService:
             if self.config["client_secret"]:
                 params["AuthParameters"]["SECRET_HASH"] = self._calculate_secret_hash(cognito_username)
 
-            response = self.client.initiate_auth(**params)
+            response = await self._call("initiate_auth", **params)
 
             auth_result = response["AuthenticationResult"]
             logger.info(f"User {email} signed in successfully")
@@ -199,7 +269,7 @@ class CognitoService:
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """Get user information from access token"""
         try:
-            response = self.client.get_user(AccessToken=access_token)
+            response = await self._call("get_user", AccessToken=access_token)
             
             user_attributes = {}
             for attr in response["UserAttributes"]:
@@ -220,6 +290,96 @@ class CognitoService:
             user_friendly_message = get_user_friendly_error_message(error_code, error_message)
             raise CognitoError(user_friendly_message, error_code=error_code)
 
+    async def admin_create_user(self, email: str, full_name: str = "", send_invite: bool = False) -> str:
+        """
+        Create a user in the user pool on behalf of an administrator (bulk provisioning).
+
+        Args:
+            email: Email address, used as the Cognito username
+            full_name: Optional display name
+            send_invite: Email Cognito's invitation with a temporary password
+
+        Returns:
+            The new user's sub
+        """
+        try:
+            user_attributes = [
+                {"Name": "email", "Value": email},
+                {"Name": "email_verified", "Value": "true"}
+            ]
+            if full_name:
+                user_attributes.append({"Name": "name", "Value": full_name})
+
+            params = {
+                "UserPoolId": self.config["user_pool_id"],
+                "Username": email,
+                "UserAttributes": user_attributes
+            }
+            if not send_invite:
+                params["MessageAction"] = "SUPPRESS"
+
+            response = await self._call("admin_create_user", **params)
+            attributes = {attr["Name"]: attr["Value"] for attr in response["User"].get("Attributes", [])}
+            logger.info(f"Admin created Cognito user {email}")
+            return attributes.get("sub") or response["User"]["Username"]
+
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            error_message = e.response["Error"]["Message"]
+            logger.error(f"Admin create user failed for {email}: {error_code} - {error_message}")
+            user_friendly_message = get_user_friendly_error_message(error_code, error_message)
+            raise CognitoError(user_friendly_message, error_code=error_code)
+
+    async def admin_delete_user(self, email: str) -> None:
+        """
+        Delete a user from the user pool on behalf of an administrator.
+
+        Used to roll back users created by admin_create_user whose database row could
+        not be inserted.
+
+        Args:
+            email: Email address, used as the Cognito username
+        """
+        try:
+            await self._call(
+                "admin_delete_user",
+                UserPoolId=self.config["user_pool_id"],
+                Username=email
+            )
+            logger.info(f"Admin deleted Cognito user {email}")
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            error_message = e.response["Error"]["Message"]
+            logger.error(f"Admin delete user failed for {email}: {error_code} - {error_message}")
+            user_friendly_message = get_user_friendly_error_message(error_code, error_message)
+            raise CognitoError(user_friendly_message, error_code=error_code)
+
+    async def get_sign_in_user_info(self, tokens: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get user information for a fresh sign-in.
+
+        The sub, email and name claims are read from the verified ID token returned by
+        sign_in, saving a GetUser round trip; GetUser is only called when the ID token
+        cannot be verified or lacks these claims.
+        """
+        id_token = tokens.get("id_token")
+        if id_token:
+            try:
+                claims = await jwt_validator.averify_id_token(id_token)
+                if claims.get("sub") and claims.get("email"):
+                    return {
+                        "username": claims.get("cognito:username") or claims.get("username"),
+                        "user_sub": claims["sub"],
+                        "email": claims["email"],
+                        "name": claims.get("name", ""),
+                        "email_verified": claims.get("email_verified") in (True, "true")
+                    }
+                logger.info("ID token lacks sub/email claims, falling back to GetUser")
+            except Exception as e:
+                logger.warning(f"Could not read user info from ID token, falling back to GetUser: {e}")
+
+        return await self.get_user_info(tokens["access_token"])
+
     async def refresh_token(self, refresh_token: str, email: str) -> Dict[str, Any]:
         """Refresh access token using refresh token"""
         try:
@@ -237,7 +397,7 @@ class CognitoService:
             if self.config["client_secret"]:
                 params["AuthParameters"]["SECRET_HASH"] = self._calculate_secret_hash(cognito_username)
 
-            response = self.client.initiate_auth(**params)
+            response = await self._call("initiate_auth", **params)
 
             auth_result = response["AuthenticationResult"]
             logger.info(f"Token refreshed successfully for {email}")
@@ -0,0 +1,60 @@
+"""
+LLM usage service for token and cost reporting.
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.crud.llm_usage import LLMUsageDAO
+from app.schemas.llm import LLMUsageSummary
+from app.core.llm_metrics import LLMMetricsSink, llm_metrics_sink
+from app.core.logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMUsageService:
+    """
+    Service layer for LLM usage reports.
+    Flushes this worker's pending metrics before reading so reports include recent calls.
+    """
+
+    def __init__(self, llm_usage_dao: LLMUsageDAO, metrics_sink: LLMMetricsSink = llm_metrics_sink):
+        """
+        Initialize LLMUsageService.
+
+        Args:
+            llm_usage_dao: LLMUsageDAO instance for database operations
+            metrics_sink: Sink holding not yet flushed metrics
+        """
+        self.llm_usage_dao = llm_usage_dao
+        self.metrics_sink = metrics_sink
+
+    def get_usage_by_model(self, db: Session, since: Optional[datetime] = None) -> List[LLMUsageSummary]:
+        """
+        Get token, latency and cost totals per model.
+
+        Args:
+            db: Database session
+            since: Only include usage recorded after this time
+
+        Returns:
+            List of LLMUsageSummary ordered by cost
+        """
+        logger.info(f"Getting LLM usage by model since {since}")
+        self.metrics_sink.flush()
+        return self.llm_usage_dao.get_usage_by_model(db, since=since)
+
+    def get_usage_by_user(self, db: Session, since: Optional[datetime] = None) -> List[LLMUsageSummary]:
+        """
+        Get token, latency and cost totals per user.
+
+        Args:
+            db: Database session
+            since: Only include usage recorded after this time
+
+        Returns:
+            List of LLMUsageSummary ordered by cost
+        """
+        logger.info(f"Getting LLM usage by user since {since}")
+        self.metrics_sink.flush()
+        return self.llm_usage_dao.get_usage_by_user(db, since=since)
@@ -0,0 +1,314 @@
+"""
+Bulk user import service.
+
+Rows are streamed from a CSV or JSONL source and written in batches: each batch costs
+one duplicate lookup and one batched insert, instead of a count, insert, commit and
+refresh per user. Users can optionally be pre-created in Cognito first, through a
+bounded number of concurrent calls.
+
+Imported users onboard in one of two ways. Users imported into the database only
+have no cognito_sub; signing up with their email creates the Cognito account and
+links it to the imported row. Users created in Cognito must be sent Cognito's
+invitation: its temporary password is the only way to set a password of their own.
+
+Nothing blocks the event loop: the source is read and parsed in a worker thread one
+batch at a time, and the database is used through an AsyncSession.
+"""
+import asyncio
+import csv
+import json
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import CognitoError, ValidationError
+from app.core.logging_service import get_logger
+from app.crud.user import AsyncUserDAO
+from app.schemas.user import (
+    UserCreate, UserImportFormat, UserImportResult, UserImportRow, UserImportStatus, UserImportSummary
+)
+from app.utils.username_utils import validate_and_normalize_email
+
+if TYPE_CHECKING:
+    from app.services.cognito_service import CognitoService
+
+logger = get_logger(__name__)
+
+# (row number, parsed row or None, error or None)
+ParsedRow = Tuple[int, Optional[UserImportRow], Optional[str]]
+
+
+def detect_import_format(filename: Optional[str], content_type: Optional[str] = None) -> UserImportFormat:
+    """Guess the import format from a file name or content type (CSV unless it looks like JSON)."""
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson", ".json")) or "json" in (content_type or ""):
+        return UserImportFormat.JSONL
+    return UserImportFormat.CSV
+
+
+def _parse_record(record: Dict[str, Any]) -> Tuple[Optional[UserImportRow], Optional[str]]:
+    # Blank CSV cells mean "not given"
+    record = {key: value for key, value in record.items() if value not in (None, "")}
+    try:
+        record["email"] = validate_and_normalize_email(record.get("email", ""))
+        row = UserImportRow(**record)
+    except PydanticValidationError as e:
+        return None, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+    except ValueError as e:
+        return None, str(e)
+    if not row.username:
+        row.username = row.email
+    return row, None
+
+
+def parse_user_import(lines: Iterable[str], file_format: UserImportFormat) -> Iterator[ParsedRow]:
+    """
+    Parse a user import source lazily.
+
+    Args:
+        lines: Text lines (e.g. an open file); CSV needs a header row with at least an email column
+        file_format: CSV or JSONL
+
+    Yields:
+        (1-based data row number, parsed row, error); exactly one of row and error is set
+    """
+    if file_format == UserImportFormat.CSV:
+        reader = csv.DictReader(lines)
+        for number, record in enumerate(reader, start=1):
+            normalized = {key.strip().lower(): value for key, value in record.items() if key}
+            yield (number, *_parse_record(normalized))
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield (number, *_parse_record(record))
+
+
+class UserImportService:
+    """
+    Service for provisioning users in bulk.
+    """
+
+    def __init__(
+        self,
+        user_dao: AsyncUserDAO,
+        cognito_service: Optional["CognitoService"] = None,
+        batch_size: int = 500,
+        cognito_concurrency: int = 8
+    ):
+        """
+        Initialize UserImportService.
+
+        Args:
+            user_dao: AsyncUserDAO instance for database operations
+            cognito_service: CognitoService used when users are pre-created in Cognito
+            batch_size: Rows per duplicate lookup and insert
+            cognito_concurrency: Maximum concurrent Cognito AdminCreateUser calls
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.user_dao = user_dao
+        self.cognito_service = cognito_service
+        self.batch_size = batch_size
+        self.cognito_concurrency = cognito_concurrency
+
+    async def import_users(
+        self,
+        db: AsyncSession,
+        lines: Iterable[str],
+        file_format: UserImportFormat,
+        create_in_cognito: bool = False,
+        send_invites: bool = False
+    ) -> UserImportSummary:
+        """
+        Import users from a CSV or JSONL source.
+
+        Args:
+            db: Async database session
+            lines: Text lines of the source, read lazily in a worker thread
+            file_format: CSV or JSONL
+            create_in_cognito: Create each new user in Cognito before inserting it
+            send_invites: Let Cognito email an invitation to users it creates (required with create_in_cognito)
+
+        Returns:
+            Counts and one result per row, in row order
+
+        Raises:
+            ValidationError: If users are created in Cognito without invitations
+        """
+        if create_in_cognito and self.cognito_service is None:
+            raise ValueError("A Cognito service is required to create users in Cognito")
+        if create_in_cognito and not send_invites:
+            # Without the invitation's temporary password the users could never sign in
+            raise ValidationError("Users created in Cognito must be sent an invitation (send_invites)")
+
+        summary = UserImportSummary()
+        seen_emails: set = set()
+        seen_usernames: set = set()
+        batch: List[Tuple[int, UserImportRow]] = []
+
+        parsed_rows = parse_user_import(lines, file_format)
+        while parsed := await asyncio.to_thread(list, islice(parsed_rows, self.batch_size)):
+            for number, row, error in parsed:
+                summary.total += 1
+                if row is None:
+                    self._add(summary, UserImportResult(row=number, status=UserImportStatus.INVALID, detail=error))
+                    continue
+                if row.email in seen_emails or row.username in seen_usernames:
+                    self._add(summary, UserImportResult(
+                        row=number, email=row.email, status=UserImportStatus.DUPLICATE,
+                        detail="Duplicate of an earlier row"
+                    ))
+                    continue
+                seen_emails.add(row.email)
+                seen_usernames.add(row.username)
+
+                batch.append((number, row))
+                if len(batch) >= self.batch_size:
+                    await self._import_batch(db, batch, summary, create_in_cognito, send_invites)
+                    batch = []
+
+        if batch:
+            await self._import_batch(db, batch, summary, create_in_cognito, send_invites)
+
+        summary.results.sort(key=lambda result: result.row)
+        logger.info(
+            f"Imported users: {summary.created} created, {summary.duplicates} duplicates, "
+            f"{summary.invalid} invalid, {summary.failed} failed of {summary.total}"
+        )
+        if summary.cognito_orphans:
+            logger.warning(
+                f"{summary.cognito_orphans} Cognito users of rows that were not imported could not be deleted"
+            )
+        return summary
+
+    async def _import_batch(
+        self,
+        db: AsyncSession,
+        batch: List[Tuple[int, UserImportRow]],
+        summary: UserImportSummary,
+        create_in_cognito: bool,
+        send_invites: bool
+    ) -> None:
+        existing_emails, existing_usernames = await self.user_dao.find_existing(
+            db, [row.email for _, row in batch], [row.username for _, row in batch]
+        )
+
+        fresh: List[Tuple[int, UserImportRow]] = []
+        for number, row in batch:
+            if row.email in existing_emails:
+                detail = "Email already registered"
+            elif row.username in existing_usernames:
+                detail = "Username already taken"
+            else:
+                fresh.append((number, row))
+                continue
+            self._add(summary, UserImportResult(
+                row=number, email=row.email, status=UserImportStatus.DUPLICATE, detail=detail
+            ))
+
+        cognito_subs: Dict[int, Optional[str]] = {}
+        if create_in_cognito and fresh:
+            created_in_cognito = []
+            outcomes = await self._create_cognito_users([row for _, row in fresh], send_invites)
+            for (number, row), outcome in zip(fresh, outcomes):
+                if isinstance(outcome, Exception):
+                    detail = outcome.message if isinstance(outcome, CognitoError) else str(outcome)
+                    self._add(summary, UserImportResult(
+                        row=number, email=row.email, status=UserImportStatus.FAILED, detail=detail
+                    ))
+                    continue
+                cognito_subs[number] = outcome
+                created_in_cognito.append((number, row))
+            fresh = created_in_cognito
+
+        created = await self.user_dao.bulk_create(db, [
+            UserCreate(
+                username=row.username,
+                email=row.email,
+                full_name=row.full_name,
+                role=row.role,
+                cognito_sub=cognito_subs.get(number)
+            )
+            for number, row in fresh
+        ])
+        created_by_email = {user.email: user for user in created}
+
+        # Rows that lost a race with a concurrent signup between the lookup and the insert
+        lost = [(number, row) for number, row in fresh if row.email not in created_by_email]
+        # Their Cognito users would be orphaned: delete them again (None or the exception per row)
+        rollback_by_number: Dict[int, Any] = {}
+        if create_in_cognito and lost:
+            rollbacks = await self._delete_cognito_users([row for _, row in lost])
+            rollback_by_number = dict(zip((number for number, _ in lost), rollbacks))
+
+        for number, row in fresh:
+            user = created_by_email.get(row.email)
+            if user is not None:
+                self._add(summary, UserImportResult(
+                    row=number, email=row.email, status=UserImportStatus.CREATED, user_id=user.id
+                ))
+                continue
+
+            detail = "Already registered"
+            if number in rollback_by_number:
+                error = rollback_by_number[number]
+                if error is None:
+                    detail = "Already registered; the Cognito user created for this row was deleted"
+                else:
+                    summary.cognito_orphans += 1
+                    message = error.message if isinstance(error, CognitoError) else str(error)
+                    detail = (
+                        f"Already registered; the Cognito user created for this row could not be deleted: {message}"
+                    )
+            self._add(summary, UserImportResult(
+                row=number, email=row.email, status=UserImportStatus.DUPLICATE, detail=detail
+            ))
+
+    async def _create_cognito_users(self, rows: List[UserImportRow], send_invites: bool) -> List[Any]:
+        """Create users in Cognito with bounded concurrency; returns a sub or an exception per row."""
+        semaphore = asyncio.Semaphore(self.cognito_concurrency)
+
+        async def create(row: UserImportRow) -> str:
+            async with semaphore:
+                return await self.cognito_service.admin_create_user(
+                    row.email, full_name=row.full_name or "", send_invite=send_invites
+                )
+
+        return await asyncio.gather(*(create(row) for row in rows), return_exceptions=True)
+
+    async def _delete_cognito_users(self, rows: List[UserImportRow]) -> List[Any]:
+        """Delete Cognito users with bounded concurrency; returns None or an exception per row."""
+        semaphore = asyncio.Semaphore(self.cognito_concurrency)
+
+        async def delete(row: UserImportRow) -> None:
+            async with semaphore:
+                await self.cognito_service.admin_delete_user(row.email)
+
+        return await asyncio.gather(*(delete(row) for row in rows), return_exceptions=True)
+
+    @staticmethod
+    def _add(summary: UserImportSummary, result: UserImportResult) -> None:
+        summary.results.append(result)
+        if result.status == UserImportStatus.CREATED:
+            summary.created += 1
+        elif result.status == UserImportStatus.DUPLICATE:
+            summary.duplicates += 1
+        elif result.status == UserImportStatus.INVALID:
+            summary.invalid += 1
+        else:
+            summary.failed += 1
@@ -2,9 +2,11 @@
 User service layer for business logic operations.
 """
 from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.crud.user import UserDAO
-from app.schemas.user import UserResponse, UserCreate, UserUpdate
+from app.crud.user import AsyncUserDAO, UserDAO
+from app.schemas.pagination import CursorPage, SerializedPage
+from app.schemas.user import UserResponse, UserCreate, UserSearchFilters, UserUpdate
 from app.models.user import UserRole
 from app.core.logging_service import get_logger
 
@@ -55,6 +57,47 @@ class UserService:
         logger.info(f"Getting users with skip={skip}, limit={limit}")
         return self.user_dao.get_multi(db, skip=skip, limit=limit)
 
+    def get_users_page(
+        self, db: Session, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[UserResponse]:
+        """
+        Get a page of users ordered by ID, continuing after a cursor.
+        
+        Args:
+            db: Database session
+            cursor: next_cursor of the previous page (None for the first page)
+            limit: Maximum number of records to return
+            
+        Returns:
+            CursorPage of UserResponse objects
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        logger.info(f"Getting users page with limit={limit}")
+        return self.user_dao.get_page(db, cursor=cursor, limit=limit)
+
+    def search_users(
+        self, db: Session, filters: UserSearchFilters, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[UserResponse]:
+        """
+        Search users by text, role and active state.
+        
+        Args:
+            db: Database session
+            filters: Search text, match mode and role/is_active filters
+            cursor: next_cursor of the previous page (None for the first page)
+            limit: Maximum number of records to return
+            
+        Returns:
+            CursorPage of matching UserResponse objects, ordered by ID
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        logger.info(f"Searching users with {filters.model_dump(exclude_none=True)}, limit={limit}")
+        return self.user_dao.search(db, filters, cursor=cursor, limit=limit)
+
     def get_user_by_email(self, db: Session, email: str) -> Optional[UserResponse]:
         """
         Get a user by email address.
@@ -192,3 +235,92 @@ class UserService:
             True if no users exist, False otherwise
         """
         return self.get_user_count(db) == 0
+
+
+class AsyncUserService:
+    """
+    Service layer for user operations on an AsyncSession.
+    Async counterpart of UserService, used by async request handlers.
+    """
+
+    def __init__(self, user_dao: AsyncUserDAO):
+        """
+        Initialize AsyncUserService with AsyncUserDAO dependency.
+
+        Args:
+            user_dao: AsyncUserDAO instance for database operations
+        """
+        self.user_dao = user_dao
+
+    async def get_user_by_id(self, db: AsyncSession, user_id: int) -> Optional[UserResponse]:
+        """Get a user by ID."""
+        logger.info(f"Getting user by ID: {user_id}")
+        return await self.user_dao.get(db, user_id)
+
+    async def get_users(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[UserResponse]:
+        """Get multiple users with offset pagination (legacy; prefer get_users_page)."""
+        logger.info(f"Getting users with skip={skip}, limit={limit}")
+        return await self.user_dao.get_multi(db, skip=skip, limit=limit)
+
+    async def get_users_page(
+        self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[UserResponse]:
+        """Get a page of users ordered by ID, continuing after a cursor."""
+        logger.info(f"Getting users page with limit={limit}")
+        return await self.user_dao.get_page(db, cursor=cursor, limit=limit)
+
+    async def get_users_page_json(
+        self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+    ) -> SerializedPage:
+        """Get a page of users ordered by ID, already serialized to JSON."""
+        logger.info(f"Getting users page with limit={limit}")
+        return await self.user_dao.get_page_json(db, cursor=cursor, limit=limit)
+
+    async def search_users(
+        self, db: AsyncSession, filters: UserSearchFilters, cursor: Optional[str] = None, limit: int = 100
+    ) -> CursorPage[UserResponse]:
+        """Search users by text, role and active state, ordered by ID."""
+        logger.info(f"Searching users with {filters.model_dump(exclude_none=True)}, limit={limit}")
+        return await self.user_dao.search(db, filters, cursor=cursor, limit=limit)
+
+    async def search_users_json(
+        self, db: AsyncSession, filters: UserSearchFilters, cursor: Optional[str] = None, limit: int = 100
+    ) -> SerializedPage:
+        """Search users by text, role and active state, already serialized to JSON."""
+        logger.info(f"Searching users with {filters.model_dump(exclude_none=True)}, limit={limit}")
+        return await self.user_dao.search_json(db, filters, cursor=cursor, limit=limit)
+
+    async def get_user_by_email(self, db: AsyncSession, email: str) -> Optional[UserResponse]:
+        """Get a user by email address."""
+        logger.info(f"Getting user by email: {email}")
+        return await self.user_dao.get_by_email(db, email)
+
+    async def get_user_by_username(self, db: AsyncSession, username: str) -> Optional[UserResponse]:
+        """Get a user by username."""
+        logger.info(f"Getting user by username: {username}")
+        return await self.user_dao.get_by_username(db, username)
+
+    async def get_user_by_cognito_sub(self, db: AsyncSession, cognito_sub: str) -> Optional[UserResponse]:
+        """Get a user by Cognito sub (user ID)."""
+        logger.info(f"Getting user by Cognito sub: {cognito_sub}")
+        return await self.user_dao.get_by_cognito_sub(db, cognito_sub)
+
+    async def create_user(self, db: AsyncSession, user_create: UserCreate) -> UserResponse:
+        """Create a new user, or return the existing user with the same email."""
+        logger.info(f"Creating user: {user_create.username}")
+        return await self.user_dao.create(db, obj_in=user_create)
+
+    async def update_user(self, db: AsyncSession, user_id: int, user_update: UserUpdate) -> Optional[UserResponse]:
+        """Update a user by ID; returns None if not found."""
+        logger.info(f"Updating user: {user_id}")
+        return await self.user_dao.update_by_id(db, user_id, user_update)
+
+    async def delete_user(self, db: AsyncSession, user_id: int) -> bool:
+        """Delete a user by ID; returns False if not found."""
+        logger.info(f"Deleting user: {user_id}")
+        return await self.user_dao.delete(db, id=user_id)
+
+    async def get_user_count(self, db: AsyncSession) -> int:
+        """Get the total number of users."""
+        logger.info("Getting user count")
+        return await self.user_dao.get_count(db)
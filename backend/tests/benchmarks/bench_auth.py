@@ -0,0 +1,257 @@
+"""
+Benchmarks for the authentication hot path.
+
+Mints RS256 tokens against a local JWKS stub and HS256 dev tokens with
+create_access_token, then drives them through JWTValidator, the
+get_current_user_token -> get_current_user -> get_current_active_user dependency
+chain and a minimal FastAPI endpoint backed by a temporary SQLite database.
+
+Run from backend/:
+
+    LOG_LEVEL=WARNING python -m tests.benchmarks.bench_auth --iterations 2000
+    LOG_LEVEL=WARNING python -m tests.benchmarks.bench_auth --save auth_baseline.json
+    LOG_LEVEL=WARNING python -m tests.benchmarks.bench_auth --baseline auth_baseline.json
+
+With --baseline the command exits non-zero when a benchmark loses more than
+--max-slowdown of its throughput or p99 latency.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+from jose import jwk, jwt as jose_jwt
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import dependencies
+from app.core.identity_cache import identity_cache
+from app.core.jwks import JWKSKeyStore
+from app.core.jwt_utils import JWTValidator, create_access_token
+from app.crud.user import AsyncUserDAO, UserDAO
+from app.db import Base
+from app.schemas.user import UserCreate, UserResponse
+from app.services.user_service import AsyncUserService, UserService
+from tests.benchmarks.harness import (
+    Benchmark, BenchmarkResult, compare_to_baseline, format_results, load_baseline, run_benchmark, save_results
+)
+
+BENCH_REGION = "us-east-1"
+BENCH_USER_POOL_ID = "us-east-1_bench"
+BENCH_CLIENT_ID = "bench-client"
+BENCH_KID = "bench-key"
+
+
+def make_jwks_stub(kid: str = BENCH_KID):
+    """Generate an RSA key pair; returns (private PEM, JWKS document with the public key)."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, algorithm="RS256").to_dict()
+    public_jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_pem, {"keys": [public_jwk]}
+
+
+class AuthBenchmarkEnvironment:
+    """Validator, signing keys, tokens and a seeded SQLite database for the auth benchmarks."""
+
+    def __init__(self, username: str = "bench", user_sub: str = "sub-bench"):
+        self.private_pem, self.jwks = make_jwks_stub()
+
+        async def fetch_jwks(url):
+            return self.jwks
+
+        self.validator = JWTValidator()
+        self.validator.is_development = True
+        self.validator.is_localstack = False
+        self.validator.cognito_config = {
+            **self.validator.cognito_config,
+            "region": BENCH_REGION,
+            "user_pool_id": BENCH_USER_POOL_ID,
+            "client_id": BENCH_CLIENT_ID,
+        }
+        self.validator.key_store = JWKSKeyStore(
+            self.validator._get_jwks_url(), fetcher=lambda url: self.jwks, async_fetcher=fetch_jwks
+        )
+        self.validator.key_store.refresh()
+
+        self.rs256_token = jose_jwt.encode(
+            {
+                "iss": f"https://cognito-idp.{BENCH_REGION}.amazonaws.com/{BENCH_USER_POOL_ID}",
+                "sub": user_sub,
+                "cognito:username": username,
+                "aud": BENCH_CLIENT_ID,
+                "token_use": "id",
+                "exp": int(time.time()) + 3600,
+            },
+            self.private_pem,
+            algorithm="RS256",
+            headers={"kid": BENCH_KID},
+        )
+        self.hs256_token = create_access_token({"username": username, "user_sub": user_sub})
+
+        # A file rather than :memory: so the sync seeding engine and the async engine
+        # share it; NullPool because every async benchmark runs on its own event loop
+        fd, self.db_path = tempfile.mkstemp(suffix=".db", prefix="bench_auth_")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.db_path}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=self.engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        with self.session_factory() as db:
+            UserService(UserDAO()).create_user(
+                db, UserCreate(username=username, email=f"{username}@example.com", cognito_sub=user_sub)
+            )
+
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}", poolclass=NullPool)
+        self.async_session_factory = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+        self.user_service = AsyncUserService(AsyncUserDAO())
+
+    def clear_caches(self) -> None:
+        """Forget verified tokens and cached users so the next request takes the cold path."""
+        self.validator.token_cache.clear()
+        identity_cache.clear()
+
+    async def resolve_user(self, token: str) -> UserResponse:
+        """Run the FastAPI authentication dependency chain for a bearer token."""
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        token_data = await dependencies.get_current_user_token(credentials)
+        async with self.async_session_factory() as db:
+            user = await dependencies.get_current_user(
+                token_data=token_data, db=db, user_service=self.user_service
+            )
+        return await dependencies.get_current_active_user(user)
+
+    def create_app(self) -> FastAPI:
+        """Minimal app with one endpoint behind get_current_active_user."""
+        app = FastAPI()
+
+        @app.get("/me")
+        async def read_me(user: UserResponse = Depends(dependencies.get_current_active_user)):
+            return {"id": user.id}
+
+        async def get_async_db():
+            async with self.async_session_factory() as db:
+                yield db
+
+        app.dependency_overrides[dependencies.get_async_db] = get_async_db
+        return app
+
+    def close(self) -> None:
+        self.engine.dispose()
+        os.remove(self.db_path)
+        identity_cache.clear()
+
+
+def build_benchmarks(env: AuthBenchmarkEnvironment) -> Dict[str, Benchmark]:
+    """Benchmarks by name; "cold" variants clear the token and identity caches on every call."""
+    client = TestClient(env.create_app())
+    headers = {"Authorization": f"Bearer {env.rs256_token}"}
+
+    def hs256_cold():
+        env.clear_caches()
+        env.validator.validate_token(env.hs256_token)
+
+    def rs256_cold():
+        env.clear_caches()
+        env.validator.validate_token(env.rs256_token)
+
+    def rs256_cached():
+        env.validator.validate_token(env.rs256_token)
+
+    async def rs256_async_cold():
+        env.clear_caches()
+        await env.validator.avalidate_token(env.rs256_token)
+
+    async def chain_cold():
+        env.clear_caches()
+        await env.resolve_user(env.rs256_token)
+
+    async def chain_warm():
+        await env.resolve_user(env.rs256_token)
+
+    async def chain_hs256_warm():
+        await env.resolve_user(env.hs256_token)
+
+    def http_cold():
+        env.clear_caches()
+        client.get("/me", headers=headers).raise_for_status()
+
+    def http_warm():
+        client.get("/me", headers=headers).raise_for_status()
+
+    return {
+        "jwt.hs256.cold": hs256_cold,
+        "jwt.rs256.cold": rs256_cold,
+        "jwt.rs256.cached": rs256_cached,
+        "jwt.rs256.async_cold": rs256_async_cold,
+        "deps.rs256.cold": chain_cold,
+        "deps.rs256.warm": chain_warm,
+        "deps.hs256.warm": chain_hs256_warm,
+        "http.rs256.cold": http_cold,
+        "http.rs256.warm": http_warm,
+    }
+
+
+def run_auth_benchmarks(
+    iterations: int = 1000,
+    warmup: int = 50,
+    name_filter: Optional[str] = None,
+) -> List[BenchmarkResult]:
+    """
+    Run the authentication benchmarks.
+
+    Args:
+        iterations: Timed calls per benchmark
+        warmup: Untimed calls per benchmark
+        name_filter: Only run benchmarks whose name contains this text
+    """
+    env = AuthBenchmarkEnvironment()
+    try:
+        with patch.object(dependencies, "jwt_validator", env.validator):
+            return [
+                run_benchmark(name, func, iterations=iterations, warmup=warmup)
+                for name, func in build_benchmarks(env).items()
+                if not name_filter or name_filter in name
+            ]
+    finally:
+        env.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the authentication hot path")
+    parser.add_argument("--iterations", type=int, default=1000, help="timed calls per benchmark")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed calls per benchmark")
+    parser.add_argument("--filter", dest="name_filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    results = run_auth_benchmarks(args.iterations, args.warmup, args.name_filter)
+    print(format_results(results))
+
+    if args.save:
+        save_results(results, args.save)
+
+    regressions = compare_to_baseline(results, load_baseline(args.baseline), args.max_slowdown)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
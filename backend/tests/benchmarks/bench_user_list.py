@@ -0,0 +1,168 @@
+"""
+Benchmarks for user list serialization.
+
+Compares the ORM path (hydrate User objects, UserResponse.model_validate each one,
+then FastAPI validates and serializes the list again through response_model) with
+the serialized fast path (select the columns as rows, validate and dump the list
+once with a TypeAdapter, return the JSON bytes as is), at the DAO level and through
+a FastAPI app on a temporary SQLite database.
+
+Run from backend/:
+
+    LOG_LEVEL=WARNING python -m tests.benchmarks.bench_user_list --iterations 200
+    LOG_LEVEL=WARNING python -m tests.benchmarks.bench_user_list --page-size 1000 --save list_baseline.json
+    LOG_LEVEL=WARNING python -m tests.benchmarks.bench_user_list --baseline list_baseline.json
+
+With --baseline the command exits non-zero when a benchmark loses more than
+--max-slowdown of its throughput or p99 latency.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import dependencies
+from app.crud.user import AsyncUserDAO, UserDAO
+from app.db import Base
+from app.routers.user import user_router
+from app.schemas.user import UserCreate, UserResponse
+from app.services.user_service import AsyncUserService
+from tests.benchmarks.harness import (
+    Benchmark, BenchmarkResult, compare_to_baseline, format_results, load_baseline, run_benchmark, save_results
+)
+
+
+class UserListBenchmarkEnvironment:
+    """Temporary SQLite database seeded with users, and an app serving both list paths."""
+
+    def __init__(self, user_count: int = 2000):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db", prefix="bench_user_list_")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.db_path}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=self.engine)
+        with sessionmaker(bind=self.engine)() as db:
+            UserDAO().bulk_create(db, [
+                UserCreate(username=f"user{i}", email=f"user{i}@example.com", full_name=f"User {i}")
+                for i in range(user_count)
+            ])
+
+        # NullPool because every async benchmark runs on its own event loop
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}", poolclass=NullPool)
+        self.async_session_factory = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+        self.user_service = AsyncUserService(AsyncUserDAO())
+
+    def create_app(self) -> FastAPI:
+        """App with the real GET /users/ and the previous ORM implementation at /orm-users/."""
+        app = FastAPI()
+        app.include_router(user_router)
+
+        @app.get("/orm-users/", response_model=List[UserResponse])
+        async def read_users_orm(
+            limit: int = 100,
+            db=Depends(dependencies.get_async_db),
+            user_service: AsyncUserService = Depends(dependencies.get_async_user_service),
+        ):
+            return (await user_service.get_users_page(db, limit=limit)).items
+
+        async def get_async_db():
+            async with self.async_session_factory() as db:
+                yield db
+
+        app.dependency_overrides[dependencies.get_async_db] = get_async_db
+        return app
+
+    def close(self) -> None:
+        self.engine.dispose()
+        os.remove(self.db_path)
+
+
+def build_benchmarks(env: UserListBenchmarkEnvironment, page_size: int) -> Dict[str, Benchmark]:
+    """Benchmarks by name; "orm" is the previous path, "json" the serialized fast path."""
+    client = TestClient(env.create_app())
+    dao = env.user_service.user_dao
+    params = {"limit": page_size}
+
+    async def dao_orm():
+        async with env.async_session_factory() as db:
+            await dao.get_page(db, limit=page_size)
+
+    async def dao_json():
+        async with env.async_session_factory() as db:
+            await dao.get_page_json(db, limit=page_size)
+
+    def http_orm():
+        client.get("/orm-users/", params=params).raise_for_status()
+
+    def http_json():
+        client.get("/users/", params=params).raise_for_status()
+
+    return {
+        f"dao.orm.{page_size}": dao_orm,
+        f"dao.json.{page_size}": dao_json,
+        f"http.orm.{page_size}": http_orm,
+        f"http.json.{page_size}": http_json,
+    }
+
+
+def run_user_list_benchmarks(
+    iterations: int = 200,
+    warmup: int = 10,
+    name_filter: Optional[str] = None,
+    user_count: int = 2000,
+    page_size: int = 500,
+) -> List[BenchmarkResult]:
+    """
+    Run the user list benchmarks.
+
+    Args:
+        iterations: Timed calls per benchmark
+        warmup: Untimed calls per benchmark
+        name_filter: Only run benchmarks whose name contains this text
+        user_count: Users seeded into the database
+        page_size: Users per listed page
+    """
+    env = UserListBenchmarkEnvironment(user_count)
+    try:
+        return [
+            run_benchmark(name, func, iterations=iterations, warmup=warmup)
+            for name, func in build_benchmarks(env, page_size).items()
+            if not name_filter or name_filter in name
+        ]
+    finally:
+        env.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark user list serialization")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per benchmark")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed calls per benchmark")
+    parser.add_argument("--filter", dest="name_filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--users", type=int, default=2000, help="users seeded into the database")
+    parser.add_argument("--page-size", type=int, default=500, help="users per listed page")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    results = run_user_list_benchmarks(args.iterations, args.warmup, args.name_filter, args.users, args.page_size)
+    print(format_results(results))
+
+    if args.save:
+        save_results(results, args.save)
+
+    regressions = compare_to_baseline(results, load_baseline(args.baseline), args.max_slowdown)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Minimal timing harness for the benchmark suites.
+
+Each benchmark runs a callable (sync or async) a fixed number of times after a
+warm-up and reports throughput and latency percentiles.
+"""
+import asyncio
+import inspect
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+Benchmark = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+class BenchmarkResult(BaseModel):
+    """Timing summary of one benchmark."""
+    name: str
+    iterations: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    max_us: float
+
+
+def _percentile(sorted_samples: List[float], percentile: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, round(percentile / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(name: str, samples_ns: List[int]) -> BenchmarkResult:
+    """Build a result from per-iteration durations in nanoseconds."""
+    samples_us = sorted(sample / 1000 for sample in samples_ns)
+    total_seconds = sum(samples_ns) / 1e9
+    return BenchmarkResult(
+        name=name,
+        iterations=len(samples_us),
+        ops_per_sec=len(samples_us) / total_seconds if total_seconds else float("inf"),
+        p50_us=_percentile(samples_us, 50),
+        p99_us=_percentile(samples_us, 99),
+        max_us=samples_us[-1],
+    )
+
+
+def run_benchmark(name: str, func: Benchmark, iterations: int = 1000, warmup: int = 50) -> BenchmarkResult:
+    """
+    Time a callable.
+
+    Args:
+        name: Label of the benchmark
+        func: Callable under test; coroutine functions are awaited on one event loop
+        iterations: Number of timed calls
+        warmup: Number of untimed calls made first (fills caches, imports, JIT-like warm-up)
+    """
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+
+    if inspect.iscoroutinefunction(func):
+        async def measure() -> List[int]:
+            for _ in range(warmup):
+                await func()
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter_ns()
+                await func()
+                samples.append(time.perf_counter_ns() - start)
+            return samples
+
+        return summarize(name, asyncio.run(measure()))
+
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+    return summarize(name, samples)
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Render results as a fixed-width table."""
+    width = max(len(result.name) for result in results)
+    lines = [f"{'benchmark':<{width}}  {'ops/sec':>12}  {'p50 (us)':>10}  {'p99 (us)':>10}  {'max (us)':>10}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}}  {result.ops_per_sec:>12,.0f}  {result.p50_us:>10,.1f}"
+            f"  {result.p99_us:>10,.1f}  {result.max_us:>10,.1f}"
+        )
+    return "\n".join(lines)
+
+
+def compare_to_baseline(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict[str, float]],
+    max_slowdown: float = 0.25,
+) -> List[str]:
+    """
+    Find benchmarks that regressed against a saved baseline.
+
+    Args:
+        results: Fresh results
+        baseline: Mapping of benchmark name to a saved result dict (see save_results)
+        max_slowdown: Allowed relative drop in ops/sec or rise in p99 before flagging
+
+    Returns:
+        One message per regression (empty when none)
+    """
+    regressions = []
+    for result in results:
+        saved = baseline.get(result.name)
+        if saved is None:
+            continue
+        if result.ops_per_sec < saved["ops_per_sec"] * (1 - max_slowdown):
+            regressions.append(
+                f"{result.name}: {result.ops_per_sec:,.0f} ops/sec vs {saved['ops_per_sec']:,.0f} in baseline"
+            )
+        if result.p99_us > saved["p99_us"] * (1 + max_slowdown):
+            regressions.append(f"{result.name}: p99 {result.p99_us:,.1f}us vs {saved['p99_us']:,.1f}us in baseline")
+    return regressions
+
+
+def save_results(results: List[BenchmarkResult], path: str) -> None:
+    """Write results as a JSON baseline."""
+    with open(path, "w") as f:
+        json.dump({result.name: result.model_dump() for result in results}, f, indent=2)
+
+
+def load_baseline(path: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """Read a JSON baseline written by save_results."""
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,56 @@
+"""
+Smoke tests for the authentication benchmark suite.
+
+They run every benchmark for a few iterations so the suite keeps working. The check
+of the cache speedups that the hot path relies on compares timings, so it only runs
+with --run-benchmarks. Full runs use bench_auth directly.
+"""
+import pytest
+
+from tests.benchmarks.bench_auth import run_auth_benchmarks
+from tests.benchmarks.harness import BenchmarkResult, compare_to_baseline, summarize
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def results():
+    return {result.name: result for result in run_auth_benchmarks(iterations=30, warmup=5)}
+
+
+def test_every_benchmark_runs(results):
+    """Test that all auth paths succeed end to end and report timings."""
+    assert set(results) == {
+        "jwt.hs256.cold", "jwt.rs256.cold", "jwt.rs256.cached", "jwt.rs256.async_cold",
+        "deps.rs256.cold", "deps.rs256.warm", "deps.hs256.warm", "http.rs256.cold", "http.rs256.warm",
+    }
+    for result in results.values():
+        assert result.iterations == 30
+        assert 0 < result.p50_us <= result.p99_us <= result.max_us
+        assert result.ops_per_sec > 0
+
+
+@pytest.mark.timing
+def test_cached_paths_are_faster_than_cold_paths(results):
+    """Test that the token and identity caches take signature checks and queries off the path."""
+    assert results["jwt.rs256.cached"].p50_us < results["jwt.rs256.cold"].p50_us
+    assert results["deps.rs256.warm"].p50_us < results["deps.rs256.cold"].p50_us
+
+
+def test_summarize_percentiles():
+    """Test throughput and percentile computation."""
+    result = summarize("x", [i * 1000 for i in range(1, 101)])
+
+    assert result.p50_us == 50
+    assert result.p99_us == 99
+    assert result.max_us == 100
+    assert result.ops_per_sec == pytest.approx(100 / (5050 * 1000 / 1e9))
+
+
+def test_compare_to_baseline_flags_regressions():
+    """Test that drops in throughput or rises in p99 beyond the threshold are reported."""
+    result = BenchmarkResult(name="a", iterations=10, ops_per_sec=700, p50_us=10, p99_us=20, max_us=30)
+
+    assert compare_to_baseline([result], {"a": {"ops_per_sec": 800, "p99_us": 19}}, max_slowdown=0.25) == []
+    regressions = compare_to_baseline([result], {"a": {"ops_per_sec": 1000, "p99_us": 10}}, max_slowdown=0.25)
+    assert len(regressions) == 2
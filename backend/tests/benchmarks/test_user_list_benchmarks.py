@@ -0,0 +1,50 @@
+"""
+Smoke tests for the user list serialization benchmarks.
+
+They run every benchmark for a few iterations so the suite keeps working and check
+that both list paths return the same body. The check that the serialized fast path
+is faster compares timings, so it only runs with --run-benchmarks. Full runs use
+bench_user_list directly.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.benchmarks.bench_user_list import UserListBenchmarkEnvironment, run_user_list_benchmarks
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def results():
+    return {
+        result.name: result
+        for result in run_user_list_benchmarks(iterations=10, warmup=2, user_count=300, page_size=200)
+    }
+
+
+def test_every_benchmark_runs(results):
+    """Test that both list paths succeed at the DAO and HTTP level and report timings."""
+    assert set(results) == {"dao.orm.200", "dao.json.200", "http.orm.200", "http.json.200"}
+    for result in results.values():
+        assert result.iterations == 10
+        assert 0 < result.p50_us <= result.p99_us <= result.max_us
+
+
+@pytest.mark.timing
+def test_serialized_path_is_faster(results):
+    """Test that skipping ORM hydration and the second validation pass pays off."""
+    assert results["dao.json.200"].p50_us < results["dao.orm.200"].p50_us
+
+
+def test_both_paths_return_the_same_body():
+    env = UserListBenchmarkEnvironment(user_count=30)
+    try:
+        client = TestClient(env.create_app())
+        orm = client.get("/orm-users/", params={"limit": 20})
+        fast = client.get("/users/", params={"limit": 20})
+
+        assert fast.headers["content-type"] == "application/json"
+        assert fast.json() == orm.json()
+        assert len(fast.json()) == 20
+    finally:
+        env.close()
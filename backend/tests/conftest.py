@@ -2,17 +2,40 @@
 Pytest configuration and shared fixtures for backend tests.
 """
 import pytest
+import pytest_asyncio
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.db import Base
-from app.crud.user import UserDAO
-from app.services.user_service import UserService
+from app.crud.user import AsyncUserDAO, UserDAO
+from app.services.user_service import AsyncUserService, UserService
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks", action="store_true", default=False,
+        help="run benchmark timing comparisons (too noisy for shared CI runners)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked timing unless --run-benchmarks is given."""
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_timing = pytest.mark.skip(reason="timing comparison; use --run-benchmarks to run it")
+    for item in items:
+        if "timing" in item.keywords:
+            item.add_marker(skip_timing)
 
 
 # Test database setup
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# NullPool: every test runs on its own event loop, so no connection may outlive it
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 @pytest.fixture
@@ -37,3 +60,22 @@ def user_dao():
 def user_service(user_dao):
     """Create a UserService instance with injected UserDAO."""
     return UserService(user_dao)
+
+
+@pytest_asyncio.fixture
+async def async_db(db):
+    """Create an async session on the test database (tables are managed by the db fixture)."""
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def async_user_dao():
+    """Create an AsyncUserDAO instance."""
+    return AsyncUserDAO()
+
+
+@pytest.fixture
+def async_user_service(async_user_dao):
+    """Create an AsyncUserService instance with injected AsyncUserDAO."""
+    return AsyncUserService(async_user_dao)
@@ -0,0 +1,116 @@
+"""
+Unit tests for AsyncUserDAO and the async database session dependency.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config_service import config_service
+from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.models.user import UserRole
+from tests.conftest import TestingAsyncSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_async_create_returns_pydantic_object(async_db, async_user_dao):
+    """Test that AsyncUserDAO.create returns a UserResponse and promotes the first user."""
+    result = await async_user_dao.create(async_db, obj_in=UserCreate(
+        username="testuser", email="test@example.com", full_name="Test User"
+    ))
+
+    assert isinstance(result, UserResponse)
+    assert result.username == "testuser"
+    assert result.role == UserRole.ADMIN
+    assert result.id is not None
+
+    second = await async_user_dao.create(async_db, obj_in=UserCreate(
+        username="other", email="other@example.com"
+    ))
+    assert second.role == UserRole.USER
+
+
+@pytest.mark.asyncio
+async def test_async_create_is_idempotent_per_email(async_db, async_user_dao):
+    """Test that a retried create returns the existing user and fills in missing fields."""
+    first = await async_user_dao.create(async_db, obj_in=UserCreate(username="amy", email="amy@example.com"))
+    again = await async_user_dao.create(async_db, obj_in=UserCreate(
+        username="amy", email="amy@example.com", cognito_sub="sub-amy"
+    ))
+
+    assert again.id == first.id
+    assert again.cognito_sub == "sub-amy"
+    assert await async_user_dao.get_count(async_db) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_lookups(async_db, async_user_dao):
+    """Test the get, get_by_* and get_multi lookups."""
+    created = await async_user_dao.create(async_db, obj_in=UserCreate(
+        username="bob", email="bob@example.com", cognito_sub="sub-bob"
+    ))
+    for i in range(3):
+        await async_user_dao.create(async_db, obj_in=UserCreate(username=f"user{i}", email=f"user{i}@example.com"))
+
+    assert (await async_user_dao.get(async_db, created.id)).username == "bob"
+    assert (await async_user_dao.get_by_email(async_db, "bob@example.com")).id == created.id
+    assert (await async_user_dao.get_by_username(async_db, "bob")).id == created.id
+    assert (await async_user_dao.get_by_cognito_sub(async_db, "sub-bob")).id == created.id
+    assert await async_user_dao.get(async_db, 9999) is None
+    assert await async_user_dao.get_by_username(async_db, "nobody") is None
+
+    page = await async_user_dao.get_multi(async_db, skip=1, limit=2)
+    assert len(page) == 2
+    assert all(isinstance(user, UserResponse) for user in page)
+
+
+@pytest.mark.asyncio
+async def test_async_update_and_delete(async_db, async_user_dao):
+    """Test update_by_id and delete, including missing users."""
+    created = await async_user_dao.create(async_db, obj_in=UserCreate(username="cy", email="cy@example.com"))
+
+    updated = await async_user_dao.update_by_id(async_db, created.id, UserUpdate(full_name="Cy", is_active=False))
+    assert updated.full_name == "Cy"
+    assert updated.is_active is False
+    assert await async_user_dao.update_by_id(async_db, 9999, UserUpdate(full_name="x")) is None
+
+    assert await async_user_dao.delete(async_db, id=created.id) is True
+    assert await async_user_dao.delete(async_db, id=created.id) is False
+    assert await async_user_dao.get_count(async_db) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions_share_the_engine(db, async_user_dao):
+    """Test that many requests can query concurrently, each on its own session."""
+    async with TestingAsyncSessionLocal() as session:
+        created = await async_user_dao.create(session, obj_in=UserCreate(username="dee", email="dee@example.com"))
+
+    async def lookup():
+        async with TestingAsyncSessionLocal() as session:
+            return await async_user_dao.get(session, created.id)
+
+    results = await asyncio.gather(*(lookup() for _ in range(20)))
+    assert {user.id for user in results} == {created.id}
+
+
+@pytest.mark.asyncio
+async def test_get_async_db_yields_async_session():
+    """Test that the dependency yields an AsyncSession and closes it afterwards."""
+    from app.dependencies import get_async_db
+
+    generator = get_async_db()
+    session = await generator.__anext__()
+    assert isinstance(session, AsyncSession)
+    await generator.aclose()
+
+
+@pytest.mark.parametrize("url,expected", [
+    ("postgresql://u:p@h:5432/db", "postgresql+asyncpg://u:p@h:5432/db"),
+    ("postgresql+psycopg2://u:p@h/db", "postgresql+asyncpg://u:p@h/db"),
+    ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+    ("postgresql+asyncpg://u:p@h/db", "postgresql+asyncpg://u:p@h/db"),
+])
+def test_async_database_url(monkeypatch, url, expected):
+    """Test that the async engine URL swaps in an async driver."""
+    monkeypatch.setattr(config_service, "get_database_url", lambda: url)
+    assert config_service.get_async_database_url() == expected
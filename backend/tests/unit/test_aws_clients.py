@@ -0,0 +1,57 @@
+"""
+Unit tests for the shared boto3 client registry.
+"""
+from app.core.aws_clients import AWSClientRegistry
+
+
+def test_same_parameters_share_one_client():
+    """Test that identical requests return the same pooled client."""
+    registry = AWSClientRegistry(max_pool_connections=25)
+
+    first = registry.get_client("bedrock-runtime", region_name="us-east-1")
+    second = registry.get_client("bedrock-runtime", region_name="us-east-1")
+
+    assert first is second
+    assert len(registry) == 1
+    assert first.meta.config.max_pool_connections == 25
+    assert first.meta.config.tcp_keepalive is True
+
+
+def test_distinct_parameters_get_distinct_clients():
+    """Test that region, endpoint, credentials and config are part of the key."""
+    registry = AWSClientRegistry()
+    base = registry.get_client("cognito-idp", region_name="us-east-1")
+
+    assert registry.get_client("cognito-idp", region_name="eu-west-1") is not base
+    assert registry.get_client(
+        "cognito-idp", region_name="us-east-1", endpoint_url="http://localhost:4566"
+    ) is not base
+    assert registry.get_client(
+        "cognito-idp", region_name="us-east-1",
+        aws_access_key_id="AKIDEXAMPLE", aws_secret_access_key="secret"
+    ) is not base
+    assert registry.get_client("cognito-idp", region_name="us-east-1", read_timeout=5) is not base
+    assert len(registry) == 5
+
+
+def test_client_config_overrides_are_applied():
+    """Test that pool size and botocore options reach the client config."""
+    registry = AWSClientRegistry()
+
+    client = registry.get_client(
+        "bedrock-runtime", region_name="us-east-1",
+        max_pool_connections=64, retries={"total_max_attempts": 1, "mode": "standard"}
+    )
+
+    assert client.meta.config.max_pool_connections == 64
+    assert client.meta.config.retries["total_max_attempts"] == 1
+
+
+def test_clear_drops_cached_clients():
+    """Test that clear forces new clients to be built."""
+    registry = AWSClientRegistry()
+    client = registry.get_client("secretsmanager", region_name="us-east-1")
+
+    registry.clear()
+
+    assert registry.get_client("secretsmanager", region_name="us-east-1") is not client
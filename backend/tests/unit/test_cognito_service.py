@@ -0,0 +1,115 @@
+"""
+Unit tests for running Cognito calls off the event loop.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from app.core.exceptions import CognitoError
+from app.services.cognito_service import CognitoService
+
+
+class SlowCognitoClient:
+    """Fake boto3 client whose calls block for a while and record concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def initiate_auth(self, **params):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return {"AuthenticationResult": {"AccessToken": "access", "IdToken": "id", "ExpiresIn": 3600}}
+
+
+@pytest.fixture
+def service():
+    service = CognitoService()
+    service.config = {
+        "user_pool_id": "test_pool_id",
+        "client_id": "test_client_id",
+        "client_secret": "",
+        "region": "us-east-1"
+    }
+    yield service
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_calls_do_not_block_the_event_loop(service):
+    """Test that the event loop keeps running while a Cognito call is in flight."""
+    service.client = SlowCognitoClient(delay=0.2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    tokens = await service.sign_in("alice@example.com", "password")
+    task.cancel()
+
+    assert tokens["access_token"] == "access"
+    assert ticks >= 5
+    assert all(name.startswith("cognito") for name in service.client.threads)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(service):
+    """Test that no more than max_concurrency calls reach Cognito at once."""
+    service.max_concurrency = 2
+    service.client = SlowCognitoClient(delay=0.05)
+
+    await asyncio.gather(*[service.sign_in(f"user{i}@example.com", "password") for i in range(6)])
+
+    assert service.client.max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_operation_timeout_raises_cognito_error(service):
+    """Test that a call exceeding its operation timeout fails with a CognitoError."""
+    service.client = SlowCognitoClient(delay=0.5)
+    service.operation_timeouts["initiate_auth"] = 0.05
+
+    with pytest.raises(CognitoError) as exc_info:
+        await service.sign_in("alice@example.com", "password")
+
+    assert exc_info.value.error_code == "Timeout"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_still_mapped(service):
+    """Test that Cognito errors raised in the worker keep their user-friendly mapping."""
+    from botocore.exceptions import ClientError
+
+    service.client = Mock()
+    service.client.initiate_auth.side_effect = ClientError(
+        {"Error": {"Code": "NotAuthorizedException", "Message": "Incorrect username or password."}},
+        "InitiateAuth"
+    )
+
+    with pytest.raises(CognitoError) as exc_info:
+        await service.sign_in("alice@example.com", "wrong")
+
+    assert exc_info.value.error_code == "NotAuthorizedException"
+
+
+def test_client_makes_a_single_attempt_per_call(service):
+    """Test that botocore does not retry, so a worker is never busy past the call's timeout."""
+    config = service.client.meta.config
+
+    assert config.retries["total_max_attempts"] == 1
+    assert config.read_timeout == service.timeout_seconds
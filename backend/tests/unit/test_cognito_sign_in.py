@@ -0,0 +1,113 @@
+"""
+Unit tests for reading sign-in user info from the Cognito ID token.
+"""
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from jose import jwt as jose_jwt
+
+from app.core.jwks import JWKSKeyStore
+from app.core.jwt_utils import JWTValidator
+from app.services.cognito_service import cognito_service
+from tests.unit.test_jwks import make_signing_key
+
+REGION = "us-east-1"
+USER_POOL_ID = "us-east-1_test"
+CLIENT_ID = "test-client"
+
+GET_USER_INFO = {
+    "username": "from-get-user",
+    "user_sub": "sub-get-user",
+    "email": "getuser@example.com",
+    "name": "Get User",
+    "email_verified": True,
+}
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return make_signing_key("k1")
+
+
+@pytest.fixture
+def validator(signing_key):
+    _, public_jwk = signing_key
+
+    async def fetch(url):
+        return {"keys": [public_jwk]}
+
+    validator = JWTValidator()
+    validator.is_localstack = False
+    validator.cognito_config = {
+        **validator.cognito_config, "region": REGION, "user_pool_id": USER_POOL_ID, "client_id": CLIENT_ID
+    }
+    validator.key_store = JWKSKeyStore("https://example.com/jwks.json", async_fetcher=fetch)
+    with patch("app.services.cognito_service.jwt_validator", validator):
+        yield validator
+
+
+def id_token(signing_key, **claims):
+    private_pem, _ = signing_key
+    payload = {
+        "iss": f"https://cognito-idp.{REGION}.amazonaws.com/{USER_POOL_ID}",
+        "sub": "sub-alice",
+        "cognito:username": "alice-uuid",
+        "email": "alice@example.com",
+        "name": "Alice",
+        "email_verified": True,
+        "aud": CLIENT_ID,
+        "token_use": "id",
+        "exp": int(time.time()) + 300,
+    }
+    payload.update(claims)
+    return jose_jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": "k1"})
+
+
+@pytest.mark.asyncio
+async def test_user_info_read_from_verified_id_token(validator, signing_key):
+    """Test that sign-in user info comes from the ID token without calling GetUser."""
+    tokens = {"access_token": "access", "id_token": id_token(signing_key)}
+
+    with patch.object(cognito_service, "get_user_info", new=AsyncMock(return_value=GET_USER_INFO)) as get_user:
+        user_info = await cognito_service.get_sign_in_user_info(tokens)
+
+    get_user.assert_not_called()
+    assert user_info == {
+        "username": "alice-uuid",
+        "user_sub": "sub-alice",
+        "email": "alice@example.com",
+        "name": "Alice",
+        "email_verified": True,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("claims", [
+    {"token_use": "access"},
+    {"aud": "another-client"},
+    {"exp": int(time.time()) - 10},
+    {"email": None},
+])
+async def test_get_user_fallback_for_unusable_id_tokens(validator, signing_key, claims):
+    """Test that GetUser is used when the ID token is not a valid, complete ID token."""
+    tokens = {"access_token": "access", "id_token": id_token(signing_key, **claims)}
+
+    with patch.object(cognito_service, "get_user_info", new=AsyncMock(return_value=GET_USER_INFO)) as get_user:
+        user_info = await cognito_service.get_sign_in_user_info(tokens)
+
+    get_user.assert_awaited_once_with("access")
+    assert user_info == GET_USER_INFO
+
+
+@pytest.mark.asyncio
+async def test_get_user_fallback_for_forged_id_token(validator):
+    """Test that an ID token signed with an unknown key is not trusted."""
+    forged = id_token(make_signing_key("k1"))
+    tokens = {"access_token": "access", "id_token": forged}
+
+    with patch.object(cognito_service, "get_user_info", new=AsyncMock(return_value=GET_USER_INFO)) as get_user:
+        user_info = await cognito_service.get_sign_in_user_info(tokens)
+
+    get_user.assert_awaited_once()
+    assert user_info["user_sub"] == "sub-get-user"
@@ -0,0 +1,149 @@
+"""
+Unit tests for connection pool configuration and pool metrics.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config_service import config_service
+from app.db.pool import (
+    PoolMetrics, TimedAsyncAdaptedQueuePool, TimedQueuePool, engine_options, instrument_pool, pool_stats
+)
+
+POOL_CONFIG = {
+    "pool_size": 3,
+    "max_overflow": 2,
+    "pool_timeout": 5.0,
+    "pool_recycle": 600,
+    "pool_pre_ping": True,
+    "pgbouncer_mode": False,
+}
+
+
+@pytest.fixture
+def timed_engine(tmp_path):
+    """File SQLite engine on a TimedQueuePool with one connection and no overflow."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    instrument_pool(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_engine_options_from_pool_config():
+    """Test that the pool settings are passed to the engine with the timed pools."""
+    options = engine_options("postgresql://u:p@h/db", pool_config=POOL_CONFIG)
+
+    assert options == {
+        "poolclass": TimedQueuePool,
+        "pool_size": 3,
+        "max_overflow": 2,
+        "pool_timeout": 5.0,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+    }
+    assert engine_options("postgresql+asyncpg://u:p@h/db", is_async=True, pool_config=POOL_CONFIG)["poolclass"] \
+        is TimedAsyncAdaptedQueuePool
+
+
+def test_engine_options_keep_sqlite_defaults():
+    assert engine_options("sqlite:///./app.db", pool_config=POOL_CONFIG) == {}
+
+
+def test_pgbouncer_mode_disables_prepared_statement_caching():
+    """Test that PgBouncer mode turns off asyncpg's statement caches and uses unique names."""
+    config = {**POOL_CONFIG, "pgbouncer_mode": True}
+
+    connect_args = engine_options("postgresql+asyncpg://u:p@h/db", is_async=True, pool_config=config)["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+    assert "connect_args" not in engine_options("postgresql://u:p@h/db", pool_config=config)
+
+
+def test_pool_config_read_from_environment(monkeypatch):
+    monkeypatch.setitem(config_service._config, "db_pool_size", 25)
+    monkeypatch.setitem(config_service._config, "db_pgbouncer_mode", True)
+
+    pool_config = config_service.get_database_pool_config()
+    assert pool_config["pool_size"] == 25
+    assert pool_config["pgbouncer_mode"] is True
+
+
+def test_checkouts_and_in_use_are_recorded(timed_engine):
+    """Test that checkouts record wait time and the in-use peak."""
+    with timed_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = pool_stats(timed_engine)
+        assert stats.checked_out == 1
+
+    stats = pool_stats(timed_engine)
+    assert stats.pool_class == "TimedQueuePool"
+    assert stats.size == 1
+    assert stats.checkouts == 1
+    assert stats.checked_out == 0
+    assert stats.checked_in == 1
+    assert stats.peak_checked_out == 1
+    assert stats.wait_ms_max >= stats.wait_ms_p50 >= 0.0
+
+
+def test_timeouts_are_counted(timed_engine):
+    """Test that an exhausted pool counts the checkout timeout."""
+    with timed_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            timed_engine.connect()
+
+    assert pool_stats(timed_engine).timeouts == 1
+
+
+def test_metrics_survive_dispose(timed_engine):
+    """Test that recreating the pool keeps counting into the same metrics."""
+    with timed_engine.connect():
+        pass
+    timed_engine.dispose()
+    with timed_engine.connect():
+        pass
+
+    assert pool_stats(timed_engine).checkouts == 2
+
+
+def test_percentiles_over_recent_window():
+    metrics = PoolMetrics(window=100)
+    for wait_ms in range(1, 101):
+        metrics.record_checkout(float(wait_ms), checked_out=1, overflow=0)
+
+    stats = metrics.snapshot(TimedQueuePool(lambda: None, pool_size=1))
+    assert stats.wait_ms_p50 == 51.0
+    assert stats.wait_ms_p99 == 100.0
+    assert stats.wait_ms_avg == 50.5
+
+
+def test_health_db_endpoint_reports_both_engines():
+    from app.dependencies import get_current_admin_user
+    from app.main import app
+    from app.models.user import UserRole
+    from app.schemas.user import UserResponse
+
+    admin = UserResponse(id=1, username="admin", email="admin@example.com", is_active=True, role=UserRole.ADMIN)
+    app.dependency_overrides[get_current_admin_user] = lambda: admin
+    try:
+        response = TestClient(app).get("/health/db")
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+    assert "checkouts" in response.json()["sync"]
+
+
+def test_health_db_endpoint_requires_authentication():
+    from app.main import app
+
+    client = TestClient(app)
+
+    assert client.get("/health/db").status_code in (401, 403)
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,168 @@
+"""
+Unit tests for the authenticated-user cache and its invalidation.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.identity_cache import IdentityCache, IdentityInvalidationListener, identity_cache
+from app.dependencies import get_current_user
+from app.models.user import UserRole
+from app.schemas.auth import TokenData
+from app.schemas.user import UserCreate, UserResponse, UserUpdate
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def user(id=1, username="alice", cognito_sub="sub-alice"):
+    return UserResponse(
+        id=id, username=username, email=f"{username}@example.com",
+        is_active=True, role=UserRole.USER, cognito_sub=cognito_sub
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_global_cache():
+    identity_cache.clear()
+    yield
+    identity_cache.clear()
+
+
+def test_user_found_by_sub_or_username():
+    """Test that a user is served under both keys it was cached by."""
+    cache = IdentityCache()
+    cache.set(user(), user_sub="sub-alice", username="alice")
+
+    assert cache.get(user_sub="sub-alice").id == 1
+    assert cache.get(username="alice").id == 1
+    assert cache.get(user_sub="sub-bob", username="bob") is None
+
+
+def test_entries_expire_after_ttl():
+    """Test that a cached user is not served past the TTL."""
+    clock = FakeClock()
+    cache = IdentityCache(ttl_seconds=30, clock=clock)
+    cache.set(user(), user_sub="sub-alice")
+
+    clock.now = 29
+    assert cache.get(user_sub="sub-alice") is not None
+    clock.now = 30
+    assert cache.get(user_sub="sub-alice") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_removes_every_key_of_a_user():
+    """Test that invalidating a user id forgets it under all lookup keys."""
+    cache = IdentityCache()
+    cache.set(user(), user_sub="sub-alice", username="alice")
+    cache.set(user(id=2, username="bob", cognito_sub="sub-bob"), user_sub="sub-bob")
+
+    assert cache.invalidate(1) == 2
+    assert cache.get(user_sub="sub-alice") is None
+    assert cache.get(username="alice") is None
+    assert cache.get(user_sub="sub-bob") is not None
+
+
+def test_stale_load_not_cached_after_invalidation():
+    """Test that a user loaded before a concurrent update is not cached."""
+    cache = IdentityCache()
+    generation = cache.generation
+    cache.invalidate(1)
+
+    cache.set(user(), user_sub="sub-alice", generation=generation)
+
+    assert cache.get(user_sub="sub-alice") is None
+
+
+def test_lru_eviction():
+    """Test that the least recently used keys are evicted first."""
+    cache = IdentityCache(max_entries=2)
+    cache.set(user(id=1, username="a", cognito_sub=None), username="a")
+    cache.set(user(id=2, username="b", cognito_sub=None), username="b")
+    cache.get(username="a")
+    cache.set(user(id=3, username="c", cognito_sub=None), username="c")
+
+    assert cache.get(username="a") is not None
+    assert cache.get(username="b") is None
+    assert cache.get(username="c") is not None
+
+
+def test_listener_invalidates_notified_user():
+    """Test that a change notification from another worker invalidates the user."""
+    cache = IdentityCache()
+    cache.set(user(), user_sub="sub-alice")
+    listener = IdentityInvalidationListener(cache, database_url="postgresql://localhost/app")
+
+    listener.handle_notification("1")
+    listener.handle_notification("not-an-id")
+
+    assert cache.get(user_sub="sub-alice") is None
+
+
+def test_listener_not_started_without_postgres():
+    """Test that the listener stays idle on databases without LISTEN/NOTIFY."""
+    listener = IdentityInvalidationListener(IdentityCache(), database_url="sqlite:///./test.db")
+    listener.start()
+
+    assert listener._thread is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_served_from_cache(db, async_db, user_service, async_user_service):
+    """Test that repeated requests resolve the user without querying the database."""
+    created = user_service.create_user(db, UserCreate(
+        username="carol", email="carol@example.com", cognito_sub="sub-carol"
+    ))
+    token_data = TokenData(username="carol", user_sub="sub-carol")
+    service = MagicMock(wraps=async_user_service)
+
+    first = await get_current_user(token_data=token_data, db=async_db, user_service=service)
+    second = await get_current_user(token_data=token_data, db=async_db, user_service=service)
+
+    assert first.id == second.id == created.id
+    assert service.get_user_by_cognito_sub.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_user_dao_update_and_delete_invalidate_cache(db, async_db, user_service, async_user_service):
+    """Test that updating or deleting a user drops it from the cache."""
+    created = user_service.create_user(db, UserCreate(
+        username="dave", email="dave@example.com", cognito_sub="sub-dave"
+    ))
+    token_data = TokenData(username="dave", user_sub="sub-dave")
+    await get_current_user(token_data=token_data, db=async_db, user_service=async_user_service)
+
+    user_service.update_user(db, created.id, UserUpdate(full_name="Dave"))
+    assert identity_cache.get(user_sub="sub-dave") is None
+
+    refreshed = await get_current_user(token_data=token_data, db=async_db, user_service=async_user_service)
+    assert refreshed.full_name == "Dave"
+
+    user_service.delete_user(db, created.id)
+    assert identity_cache.get(user_sub="sub-dave") is None
+
+
+@pytest.mark.asyncio
+async def test_async_user_dao_update_and_delete_invalidate_cache(async_db, async_user_service):
+    """Test that the async DAO invalidates cached users like the sync one."""
+    created = await async_user_service.create_user(async_db, UserCreate(
+        username="erin", email="erin@example.com", cognito_sub="sub-erin"
+    ))
+    token_data = TokenData(username="erin", user_sub="sub-erin")
+    await get_current_user(token_data=token_data, db=async_db, user_service=async_user_service)
+
+    await async_user_service.update_user(async_db, created.id, UserUpdate(full_name="Erin"))
+    assert identity_cache.get(user_sub="sub-erin") is None
+
+    refreshed = await get_current_user(token_data=token_data, db=async_db, user_service=async_user_service)
+    assert refreshed.full_name == "Erin"
+
+    await async_user_service.delete_user(async_db, created.id)
+    assert identity_cache.get(user_sub="sub-erin") is None
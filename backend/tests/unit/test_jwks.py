@@ -0,0 +1,193 @@
+"""
+Unit tests for the JWKS key store and Cognito token verification against it.
+"""
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt as jose_jwt
+
+from app.core.jwks import JWKSKeyStore
+from app.core.jwt_utils import JWTValidator
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_signing_key(kid):
+    """Generate an RSA key pair; returns (private PEM, public JWK)."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, algorithm="RS256").to_dict()
+    public_jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_pem, public_jwk
+
+
+class CountingFetcher:
+    """JWKS fetcher returning a mutable key set and counting calls."""
+
+    def __init__(self, *jwks_keys):
+        self.keys = list(jwks_keys)
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        return {"keys": list(self.keys)}
+
+
+@pytest.fixture(scope="module")
+def signing_keys():
+    return {kid: make_signing_key(kid) for kid in ("k1", "k2")}
+
+
+def test_keys_are_parsed_once_and_indexed_by_kid(signing_keys):
+    """Test that lookups hit parsed keys without refetching."""
+    fetcher = CountingFetcher(signing_keys["k1"][1])
+    store = JWKSKeyStore("https://example.com/jwks.json", fetcher=fetcher)
+
+    assert store.refresh()
+    first = store.get_key("k1")
+
+    assert store.get_key("k1") is first
+    assert fetcher.calls == 1
+
+
+def test_unknown_kid_triggers_one_rate_limited_refetch(signing_keys):
+    """Test that a rotated key is picked up, but repeated misses do not hammer the endpoint."""
+    clock = FakeClock()
+    fetcher = CountingFetcher(signing_keys["k1"][1])
+    store = JWKSKeyStore("https://example.com/jwks.json", fetcher=fetcher, min_refetch_interval_seconds=30, clock=clock)
+    store.refresh()
+
+    with pytest.raises(KeyError):
+        store.get_key("unknown")
+    assert fetcher.calls == 1  # refreshed just now, so no refetch yet
+
+    clock.now += 31
+    fetcher.keys.append(signing_keys["k2"][1])
+    assert store.get_key("k2") is not None
+    assert fetcher.calls == 2
+
+    with pytest.raises(KeyError):
+        store.get_key("still-unknown")
+    assert fetcher.calls == 2
+
+
+def test_failed_refresh_keeps_previous_keys(signing_keys):
+    """Test that a failing JWKS endpoint does not drop known keys."""
+    fetcher = CountingFetcher(signing_keys["k1"][1])
+    store = JWKSKeyStore("https://example.com/jwks.json", fetcher=fetcher)
+    store.refresh()
+
+    def failing_fetch(url):
+        raise ConnectionError("down")
+
+    store._fetcher = failing_fetch
+    assert not store.refresh()
+    assert store.get_key("k1") is not None
+
+
+def test_background_start_loads_keys(signing_keys):
+    """Test that start() loads keys off the calling thread."""
+    store = JWKSKeyStore("https://example.com/jwks.json", fetcher=CountingFetcher(signing_keys["k1"][1]))
+    store.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(store) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(store) == 1
+    finally:
+        store.stop()
+
+
+def test_validator_verifies_cognito_token_with_store(signing_keys):
+    """Test end-to-end RS256 verification using a parsed key from the store."""
+    private_pem, public_jwk = signing_keys["k1"]
+    validator = JWTValidator()
+    validator.key_store = JWKSKeyStore("https://example.com/jwks.json", fetcher=CountingFetcher(public_jwk))
+    token = jose_jwt.encode(
+        {
+            "sub": "sub-123",
+            "cognito:username": "alice",
+            "email": "alice@example.com",
+            "aud": validator.cognito_config["client_id"],
+            "token_use": "id",
+            "exp": int(time.time()) + 300,
+        },
+        private_pem,
+        algorithm="RS256",
+        headers={"kid": "k1"},
+    )
+
+    token_data = validator._validate_cognito_token(token)
+
+    assert token_data.username == "alice"
+    assert token_data.user_sub == "sub-123"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_misses_share_one_download(signing_keys):
+    """Test that a burst of cold-start lookups triggers exactly one non-blocking fetch."""
+    calls = []
+
+    async def slow_fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return {"keys": [signing_keys["k1"][1]]}
+
+    def blocking_fetch(url):
+        raise AssertionError("the async path must not use the blocking fetcher")
+
+    store = JWKSKeyStore("https://example.com/jwks.json", fetcher=blocking_fetch, async_fetcher=slow_fetch)
+
+    keys = await asyncio.gather(*(store.aget_key("k1") for _ in range(20)))
+
+    assert len(calls) == 1
+    assert all(key is keys[0] for key in keys)
+
+
+@pytest.mark.asyncio
+async def test_avalidate_token_fetches_keys_asynchronously(signing_keys):
+    """Test that the async validator loads a missing key without the blocking path."""
+    private_pem, public_jwk = signing_keys["k2"]
+
+    async def fetch(url):
+        return {"keys": [public_jwk]}
+
+    def blocking_fetch(url):
+        raise AssertionError("the async path must not use the blocking fetcher")
+
+    validator = JWTValidator()
+    validator.key_store = JWKSKeyStore(
+        "https://example.com/jwks.json", fetcher=blocking_fetch, async_fetcher=fetch
+    )
+    token = jose_jwt.encode(
+        {
+            "sub": "sub-456",
+            "cognito:username": "bob",
+            "aud": validator.cognito_config["client_id"],
+            "token_use": "id",
+            "exp": int(time.time()) + 300,
+        },
+        private_pem,
+        algorithm="RS256",
+        headers={"kid": "k2"},
+    )
+
+    token_data = await validator.avalidate_token(token)
+
+    assert token_data.user_sub == "sub-456"
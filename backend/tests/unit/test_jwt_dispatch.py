@@ -0,0 +1,75 @@
+"""
+Unit tests for routing tokens to a single verifier in JWTValidator.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.core.jwt_utils import JWTValidator, TokenIssuer
+from app.core.config_service import config_service
+from jose import jwt as jose_jwt
+
+
+def local_token(username="dev@example.com"):
+    return jose_jwt.encode(
+        {"username": username, "user_sub": "local-sub", "exp": 4_102_444_800},
+        config_service.get_secret_key(),
+        algorithm=config_service.get("security.algorithm", "HS256"),
+    )
+
+
+def test_local_token_skips_cognito_verifier():
+    """Test that dev-mode HS256 tokens go straight to local validation."""
+    validator = JWTValidator()
+    validator.is_development = True
+
+    with patch.object(validator, "_validate_cognito_token", side_effect=AssertionError("not called")), \
+            patch.object(validator.key_store, "get_key", side_effect=AssertionError("not called")):
+        token_data = validator.validate_token(local_token())
+
+    assert token_data.username == "dev@example.com"
+
+
+def test_local_token_rejected_in_production_without_verification():
+    """Test that HS256 tokens are refused outside development before any verifier runs."""
+    validator = JWTValidator()
+    validator.is_development = False
+
+    with patch.object(validator, "_validate_local_token", side_effect=AssertionError("not called")):
+        with pytest.raises(Exception, match="Invalid Cognito token"):
+            validator.validate_token(local_token())
+
+
+def test_rs256_token_is_dispatched_to_cognito():
+    """Test that tokens with an RS256 header and kid are routed to the Cognito verifier."""
+    validator = JWTValidator()
+    validator.cognito_config = {**validator.cognito_config, "user_pool_id": ""}
+    token = "eyJhbGciOiJSUzI1NiIsImtpZCI6ImsxIn0.eyJzdWIiOiJ4In0.c2ln"
+
+    issuer, header = validator._dispatch(token)
+
+    assert issuer == TokenIssuer.COGNITO
+    assert header["kid"] == "k1"
+
+
+def test_foreign_issuer_rejected_before_key_lookup():
+    """Test that tokens from another issuer never reach the JWKS store."""
+    validator = JWTValidator()
+    validator.is_localstack = False
+    validator.cognito_config = {**validator.cognito_config, "user_pool_id": "us-east-1_pool", "region": "us-east-1"}
+    token = jose_jwt.encode(
+        {"iss": "https://evil.example.com", "sub": "x"}, "secret", algorithm="HS256"
+    ).split(".")
+    header = "eyJhbGciOiJSUzI1NiIsImtpZCI6InVua25vd24ifQ"  # {"alg":"RS256","kid":"unknown"}
+
+    with patch.object(validator.key_store, "get_key", side_effect=AssertionError("not called")):
+        with pytest.raises(Exception, match="Invalid Cognito token"):
+            validator.validate_token(".".join([header, token[1], token[2]]))
+
+
+def test_malformed_token_rejected():
+    """Test that garbage tokens fail fast with the generic format error in dev mode."""
+    validator = JWTValidator()
+    validator.is_development = True
+
+    with pytest.raises(Exception, match="Invalid token format"):
+        validator.validate_token("not-a-jwt")
@@ -0,0 +1,128 @@
+"""
+Unit tests for the native InvokeModel adapters.
+"""
+import io
+import json
+
+import pytest
+
+from app.core.llm_adapters import ClaudeAdapter, LlamaAdapter, NovaAdapter, create_native_adapter
+from app.core.llm_service import LLMConfig, LLMResponse, ModelFamily, ModelName, resolve_model_family
+from tests.unit.test_llm_service import make_client
+
+
+class FakeInvokeClient:
+    """Fake bedrock-runtime client returning canned native response bodies."""
+
+    def __init__(self, body=None, chunks=None):
+        self.body = body
+        self.chunks = chunks or []
+        self.calls = []
+
+    def invoke_model(self, **request):
+        self.calls.append(request)
+        return {"body": io.BytesIO(json.dumps(self.body).encode())}
+
+    def invoke_model_with_response_stream(self, **request):
+        self.calls.append(request)
+        return {"body": iter({"chunk": {"bytes": json.dumps(chunk).encode()}} for chunk in self.chunks)}
+
+
+@pytest.mark.parametrize("model_name, family", [
+    (ModelName.CLAUDE_3_HAIKU, ModelFamily.CLAUDE),
+    (ModelName.LLAMA_3_8B, ModelFamily.LLAMA),
+    (ModelName.NOVA_LITE, ModelFamily.NOVA),
+    ("unknown-model", None),
+])
+def test_resolve_model_family(model_name, family):
+    """Test that model IDs map to their family."""
+    assert resolve_model_family(model_name) == family
+
+
+def substitute_prompt(template, message):
+    """Reference implementation: place the prompt into the template dict, then serialize."""
+    if isinstance(template, dict):
+        return {key: substitute_prompt(value, message) for key, value in template.items()}
+    if isinstance(template, list):
+        return [substitute_prompt(value, message) for value in template]
+    if isinstance(template, str):
+        return template.replace("\u0000prompt\u0000", message)
+    return template
+
+
+@pytest.mark.parametrize("adapter_class", [ClaudeAdapter, LlamaAdapter, NovaAdapter])
+def test_precompiled_body_matches_serialized_template(adapter_class):
+    """Test that the template fast path produces the same JSON as serializing the dict."""
+    adapter = adapter_class(LLMConfig(max_tokens=64, temperature=0.0))
+    message = 'Quote "this", a backslash \\ and a newline\n and \u00fcn\u00efcode'
+
+    body = json.loads(adapter.build_body(message))
+
+    assert body == substitute_prompt(adapter._request_template(adapter.config), message)
+
+
+def test_llama_generate_uses_native_api():
+    """Test that Llama generate calls invoke_model with the Llama prompt format."""
+    fake = FakeInvokeClient(body={
+        "generation": "positive", "prompt_token_count": 12, "generation_token_count": 1, "stop_reason": "stop"
+    })
+    client = make_client(fake)
+    client.model_id = ModelName.LLAMA_3_8B
+    client.family = ModelFamily.LLAMA
+
+    result = client.generate("Classify: great product", LLMResponse)
+
+    assert result.text == "positive"
+    prompt = json.loads(fake.calls[0]["body"])["prompt"]
+    assert "<|start_header_id|>user<|end_header_id|>\n\nClassify: great product<|eot_id|>" in prompt
+    totals = client.metrics_sink.totals_by_model()[ModelName.LLAMA_3_8B.value]
+    assert (totals.input_tokens, totals.output_tokens) == (12, 1)
+
+
+def test_nova_generate_uses_native_api():
+    """Test that Nova generate parses the messages-v1 response."""
+    fake = FakeInvokeClient(body={
+        "output": {"message": {"content": [{"text": "negative"}]}},
+        "usage": {"inputTokens": 8, "outputTokens": 1}
+    })
+    client = make_client(fake)
+    client.model_id = ModelName.NOVA_LITE
+    client.family = ModelFamily.NOVA
+
+    assert client.generate("Classify: broken", LLMResponse).text == "negative"
+    assert json.loads(fake.calls[0]["body"])["schemaVersion"] == "messages-v1"
+
+
+def test_llama_generate_stream():
+    """Test that Llama stream chunks are translated into stream events."""
+    fake = FakeInvokeClient(chunks=[
+        {"generation": "Hel", "stop_reason": None},
+        {"generation": "lo", "stop_reason": None},
+        {"generation": "", "stop_reason": "stop",
+         "amazon-bedrock-invocationMetrics": {"inputTokenCount": 5, "outputTokenCount": 2}},
+    ])
+    client = make_client(fake)
+    client.model_id = ModelName.LLAMA_3_8B
+    client.family = ModelFamily.LLAMA
+
+    events = list(client.generate_stream("Hi"))
+
+    assert "".join(event.text for event in events) == "Hello"
+    assert events[-1].stop_reason == "stop"
+
+
+def test_adapter_is_rebuilt_when_config_changes():
+    """Test that a new config object recompiles the template."""
+    client = make_client(FakeInvokeClient())
+    first = client._get_native_adapter()
+    assert client._get_native_adapter() is first
+
+    client.config = LLMConfig(max_tokens=42)
+
+    assert json.loads(client._prepare_native_api_request("x"))["max_tokens"] == 42
+
+
+def test_unsupported_family_rejected():
+    """Test that requesting an adapter for an unknown family fails clearly."""
+    with pytest.raises(ValueError):
+        create_native_adapter(None, LLMConfig())
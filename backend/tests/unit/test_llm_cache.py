@@ -0,0 +1,99 @@
+"""
+Unit tests for the LLM response cache.
+"""
+from app.core.llm_cache import DatabaseLLMCacheStore, LLMResponseCache, make_cache_key
+from app.core.llm_service import LLMConfig, LLMResponse
+from tests.conftest import TestingSessionLocal
+from tests.unit.test_llm_service import FakeBedrockClient, make_client, user_message
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_is_stable_and_sensitive_to_inputs():
+    """Test that equal inputs share a key and any differing field changes it."""
+    messages = [{"role": "user", "content": [{"text": "Hi"}]}]
+    key = make_cache_key("model-a", LLMConfig(), "converse", messages)
+
+    assert key == make_cache_key("model-a", LLMConfig(), "converse", messages)
+    assert key != make_cache_key("model-b", LLMConfig(), "converse", messages)
+    assert key != make_cache_key("model-a", LLMConfig(temperature=0.1), "converse", messages)
+    assert key != make_cache_key("model-a", LLMConfig(), "generate", messages)
+
+
+def test_lru_evicts_least_recently_used():
+    """Test that the in-process tier evicts the least recently used entry."""
+    cache = LLMResponseCache(max_entries=2)
+    cache.set("a", "m", {"text": "A"})
+    cache.set("b", "m", {"text": "B"})
+    cache.get("a")
+    cache.set("c", "m", {"text": "C"})
+
+    assert cache.get("a") == {"text": "A"}
+    assert cache.get("b") is None
+    assert cache.get("c") == {"text": "C"}
+
+
+def test_entries_expire_after_ttl():
+    """Test that entries are not served after their TTL."""
+    clock = FakeClock()
+    cache = LLMResponseCache(ttl_seconds=10, clock=clock)
+    cache.set("a", "m", {"text": "A"})
+
+    clock.now = 9
+    assert cache.get("a") == {"text": "A"}
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats.memory_hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_client_serves_repeated_converse_from_cache():
+    """Test that an identical converse call does not reach Bedrock twice."""
+    fake = FakeBedrockClient(text="cached answer")
+    client = make_client(fake)
+    client.cache = LLMResponseCache()
+
+    first = client.converse(user_message("Same question"), LLMResponse)
+    second = client.converse(user_message("Same question"), LLMResponse)
+
+    assert first == second
+    assert len(fake.calls) == 1
+    assert client.cache.stats.hits == 1
+
+
+def test_nonzero_temperature_bypass():
+    """Test that sampled calls skip the cache when the bypass is requested."""
+    fake = FakeBedrockClient()
+    client = make_client(fake)
+    client.config = LLMConfig(temperature=0.7)
+    client.cache = LLMResponseCache(bypass_nonzero_temperature=True)
+
+    client.converse(user_message("Hello"), LLMResponse)
+    client.converse(user_message("Hello"), LLMResponse)
+
+    assert len(fake.calls) == 2
+    assert client.cache.stats.bypasses == 2
+    assert len(client.cache) == 0
+
+
+def test_database_tier_is_shared_between_caches(db):
+    """Test that a response stored by one worker's cache is served to another's."""
+    store = DatabaseLLMCacheStore(session_factory=TestingSessionLocal)
+    worker_a = LLMResponseCache(persistent_store=store)
+    worker_b = LLMResponseCache(persistent_store=store)
+
+    worker_a.set("shared", "model-a", {"text": "from A"})
+
+    assert worker_b.get("shared") == {"text": "from A"}
+    assert worker_b.stats.persistent_hits == 1
+    # Promoted into worker B's in-process tier
+    assert worker_b.get("shared") == {"text": "from A"}
+    assert worker_b.stats.memory_hits == 1
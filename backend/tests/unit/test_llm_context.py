@@ -0,0 +1,106 @@
+"""
+Unit tests for the conversation context window manager.
+"""
+from app.core.llm_context import ContextWindowManager, MESSAGE_OVERHEAD_TOKENS
+from app.core.llm_service import ContentBlock, LLMResponse, Message, MessageRole
+from tests.unit.test_llm_service import FakeBedrockClient, make_client
+
+
+def message(role, text):
+    return Message(role=role, content=[ContentBlock(text=text)])
+
+
+def conversation(turns, words_per_turn=40):
+    """Alternating user/assistant turns of roughly equal size, oldest first."""
+    messages = [message(MessageRole.SYSTEM, "You are a helpful assistant.")]
+    for i in range(turns):
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+        messages.append(message(role, f"turn {i} " + "word " * words_per_turn))
+    return messages
+
+
+def test_short_conversation_is_unchanged():
+    """Test that a conversation under budget is returned as is."""
+    messages = conversation(4)
+    manager = ContextWindowManager(max_input_tokens=10_000)
+
+    assert manager.fit(messages) == messages
+
+
+def test_trims_oldest_turns_and_keeps_system_prompt():
+    """Test that trimming keeps the system prompt and a user-first window of recent turns."""
+    messages = conversation(20)
+    manager = ContextWindowManager(max_input_tokens=300)
+
+    fitted = manager.fit(messages)
+
+    assert fitted[0] == messages[0]
+    assert fitted[1].role == MessageRole.USER
+    assert fitted[-1] == messages[-1]
+    assert fitted[1:] == messages[len(messages) - len(fitted) + 1:]
+    assert manager.count_conversation_tokens(fitted) <= 300
+
+
+def test_latest_message_is_kept_even_when_over_budget():
+    """Test that the current turn is never dropped."""
+    messages = conversation(3, words_per_turn=500)
+    manager = ContextWindowManager(max_input_tokens=50)
+
+    fitted = manager.fit(messages)
+
+    assert fitted[-1] == messages[-1]
+    assert fitted[0].role == MessageRole.SYSTEM
+
+
+def test_token_counts_are_cached_per_message():
+    """Test that re-fitting a grown conversation only estimates the new messages."""
+    estimated = []
+
+    def estimator(text):
+        estimated.append(text)
+        return len(text) // 4
+
+    manager = ContextWindowManager(max_input_tokens=300, token_estimator=estimator)
+    messages = conversation(10)
+    manager.fit(messages)
+    first_pass = len(estimated)
+
+    manager.fit(messages + [message(MessageRole.USER, "one more question")])
+
+    assert first_pass == len(messages)
+    assert estimated[first_pass:] == ["one more question"]
+    assert manager.count_tokens(messages[1]) == MESSAGE_OVERHEAD_TOKENS + len(messages[1].content[0].text) // 4
+
+
+def test_dropped_turns_are_summarized_once():
+    """Test that the summary is added as a system message and reused for the same prefix."""
+    calls = []
+
+    def summarizer(dropped):
+        calls.append(len(dropped))
+        return "They discussed many turns."
+
+    manager = ContextWindowManager(max_input_tokens=400, summarizer=summarizer, summary_budget_tokens=50)
+    messages = conversation(20)
+
+    fitted = manager.fit(messages)
+    manager.fit(messages)
+
+    assert len(calls) == 1
+    assert fitted[1].role == MessageRole.SYSTEM
+    assert "They discussed many turns." in fitted[1].content[0].text
+    assert fitted[2].role == MessageRole.USER
+
+
+def test_client_sends_trimmed_history_with_system_field():
+    """Test that LLMClient applies the manager and moves system prompts to the system field."""
+    fake = FakeBedrockClient()
+    client = make_client(fake)
+    client.context_manager = ContextWindowManager(max_input_tokens=300)
+
+    client.converse(conversation(20), LLMResponse)
+
+    request = fake.calls[0]
+    assert request["system"] == [{"text": "You are a helpful assistant."}]
+    assert all(msg["role"] != MessageRole.SYSTEM for msg in request["messages"])
+    assert len(request["messages"]) < 20
@@ -0,0 +1,99 @@
+"""
+Unit tests for LLM token accounting and cost metering.
+"""
+import pytest
+
+from app.core.llm_cache import LLMResponseCache
+from app.core.llm_metrics import LLMCallRecord, LLMMetricsSink, estimate_cost, llm_user_context
+from app.core.llm_service import LLMResponse, ModelName
+from app.crud.llm_usage import LLMUsageDAO
+from app.services.llm_usage_service import LLMUsageService
+from tests.conftest import TestingSessionLocal
+from tests.unit.test_llm_service import FakeBedrockClient, make_client, user_message
+
+
+def test_estimate_cost_uses_model_pricing():
+    """Test that cost is priced per 1K input and output tokens."""
+    cost = estimate_cost(ModelName.CLAUDE_3_HAIKU.value, 1000, 1000)
+
+    assert cost == pytest.approx(0.00025 + 0.00125)
+    assert estimate_cost("unknown-model", 1000, 1000) == 0.0
+
+
+def test_client_records_usage_per_user():
+    """Test that converse calls are attributed to the current user with token counts."""
+    client = make_client(FakeBedrockClient())
+
+    with llm_user_context("42"):
+        client.converse(user_message("Hello"), LLMResponse)
+        client.converse(user_message("Again"), LLMResponse)
+    client.converse(user_message("Anonymous"), LLMResponse)
+
+    by_user = client.metrics_sink.totals_by_user()
+    assert by_user["42"].calls == 2
+    assert by_user["42"].input_tokens == 20
+    assert by_user["42"].output_tokens == 10
+    assert by_user[None].calls == 1
+    assert client.metrics_sink.totals_by_model()[ModelName.CLAUDE_3_HAIKU.value].cost_usd > 0
+
+
+def test_cache_hits_are_recorded_without_cost():
+    """Test that a cached response counts as a call but adds no tokens or cost."""
+    client = make_client(FakeBedrockClient())
+    client.cache = LLMResponseCache()
+
+    client.converse(user_message("Same"), LLMResponse)
+    client.converse(user_message("Same"), LLMResponse)
+
+    totals = client.metrics_sink.totals_by_model()[ModelName.CLAUDE_3_HAIKU.value]
+    assert totals.calls == 2
+    assert totals.cache_hits == 1
+    assert totals.input_tokens == 10
+
+
+def test_stream_usage_comes_from_metadata_event():
+    """Test that streamed calls record the token counts from the final metadata event."""
+    client = make_client(FakeBedrockClient(text="a b"))
+
+    list(client.converse_stream(user_message("Hi")))
+
+    totals = client.metrics_sink.totals_by_model()[ModelName.CLAUDE_3_HAIKU.value]
+    assert (totals.input_tokens, totals.output_tokens) == (10, 5)
+    assert totals.reasoning_tokens == 2
+
+
+@pytest.mark.asyncio
+async def test_user_context_propagates_to_executor_threads():
+    """Test that async calls keep the caller's user attribution inside the worker thread."""
+    client = make_client(FakeBedrockClient())
+
+    with llm_user_context("7"):
+        await client.aconverse(user_message("Hello"), LLMResponse)
+    client.close()
+
+    assert client.metrics_sink.totals_by_user()["7"].calls == 1
+
+
+def test_flush_writes_aggregates_to_database(db):
+    """Test that flushed aggregates are reported per model and per user."""
+    sink = LLMMetricsSink(session_factory=TestingSessionLocal)
+    for user_id in ("1", "1", "2"):
+        sink.record(LLMCallRecord(
+            model_id="amazon.nova-lite-v1:0", user_id=user_id,
+            input_tokens=100, output_tokens=50, latency_ms=20.0
+        ))
+    sink.record(LLMCallRecord(model_id="amazon.nova-lite-v1:0", user_id="2", success=False, latency_ms=10.0))
+
+    service = LLMUsageService(LLMUsageDAO(), metrics_sink=sink)
+    by_model = service.get_usage_by_model(db)
+    by_user = {summary.user_id: summary for summary in service.get_usage_by_user(db)}
+
+    assert len(by_model) == 1
+    assert by_model[0].calls == 4
+    assert by_model[0].errors == 1
+    assert by_model[0].input_tokens == 300
+    assert by_model[0].avg_latency_ms == pytest.approx(17.5)
+    assert by_user["1"].calls == 2
+    assert by_user["2"].errors == 1
+    # Nothing left pending after the service flushed
+    assert sink.flush() == 0
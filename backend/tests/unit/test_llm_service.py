@@ -0,0 +1,301 @@
+"""
+Unit tests for LLMClient using a fake Bedrock runtime client.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import LLMError, LLMThrottledError
+from app.core.llm_metrics import LLMMetricsSink
+from app.core.rate_limiter import AdaptiveRateLimiter, RetryPolicy
+from app.core.llm_service import (
+    ContentBlock, LLMClient, LLMResponse, LLMStreamEvent, Message, MessageRole, ModelName
+)
+from app.dependencies import get_current_active_user
+from app.main import app
+from app.models.user import UserRole
+from app.schemas.user import UserResponse
+
+
+class FakeBedrockClient:
+    """Minimal stand-in for the boto3 bedrock-runtime client."""
+
+    def __init__(self, text="Hello from Bedrock", delay=0.0):
+        self.text = text
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def converse_stream(self, **request):
+        self.calls.append(request)
+        events = [
+            {"messageStart": {"role": "assistant"}},
+            {"contentBlockDelta": {"delta": {"reasoningContent": {"text": "thinking"}}}},
+        ]
+        events += [{"contentBlockDelta": {"delta": {"text": word}}} for word in self.text.split(" ")]
+        events.append({"messageStop": {"stopReason": "end_turn"}})
+        events.append({"metadata": {"usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15}}})
+        return {"stream": iter(events)}
+
+    def converse(self, **request):
+        with self._lock:
+            self.calls.append(request)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return {
+                "output": {"message": {"content": [{"text": self.text}]}},
+                "usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15}
+            }
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def make_client(fake, max_concurrency=4):
+    client = LLMClient(
+        ModelName.CLAUDE_3_HAIKU,
+        max_concurrency=max_concurrency,
+        retry_policy=RetryPolicy(base_delay=0),
+        rate_limiter=AdaptiveRateLimiter(rate=1000),
+        metrics_sink=LLMMetricsSink()
+    )
+    client.client = fake
+    return client
+
+
+def user_message(text):
+    return [Message(role=MessageRole.USER, content=[ContentBlock(text=text)])]
+
+
+def test_converse_returns_response_model():
+    """Test that converse parses the Bedrock response into the response model."""
+    client = make_client(FakeBedrockClient(text="Hi there"))
+
+    result = client.converse(user_message("Hello"), LLMResponse)
+
+    assert isinstance(result, LLMResponse)
+    assert result.text == "Hi there"
+
+
+@pytest.mark.asyncio
+async def test_aconverse_does_not_block_event_loop():
+    """Test that aconverse runs inference off the event loop."""
+    client = make_client(FakeBedrockClient(delay=0.2))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    result, _ = await asyncio.gather(
+        client.aconverse(user_message("Hello"), LLMResponse),
+        ticker()
+    )
+
+    assert result.text == "Hello from Bedrock"
+    assert ticks == 5
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_aconverse_respects_max_concurrency():
+    """Test that concurrent aconverse calls never exceed max_concurrency."""
+    fake = FakeBedrockClient(delay=0.05)
+    client = make_client(fake, max_concurrency=3)
+
+    results = await asyncio.gather(
+        *[client.aconverse(user_message(f"q{i}"), LLMResponse) for i in range(10)]
+    )
+
+    assert len(results) == 10
+    assert fake.max_in_flight <= 3
+    client.close()
+
+
+def test_invalid_max_concurrency_rejected():
+    """Test that a non-positive concurrency limit is rejected."""
+    with pytest.raises(ValueError):
+        LLMClient(ModelName.CLAUDE_3_HAIKU, max_concurrency=0)
+
+
+def test_converse_stream_yields_text_and_reasoning_deltas():
+    """Test that converse_stream yields deltas in order and ends with the stop reason."""
+    client = make_client(FakeBedrockClient(text="Hello streaming world"))
+
+    events = list(client.converse_stream(user_message("Hi")))
+
+    assert events[0] == LLMStreamEvent(reasoning_text="thinking")
+    assert "".join(event.text for event in events) == "Hellostreamingworld"
+    assert events[-1].stop_reason == "end_turn"
+
+
+@pytest.mark.asyncio
+async def test_aconverse_stream_yields_events():
+    """Test that aconverse_stream relays the same events as the sync stream."""
+    client = make_client(FakeBedrockClient(text="a b c"))
+
+    events = [event async for event in client.aconverse_stream(user_message("Hi"))]
+
+    assert [event.text for event in events if event.text] == ["a", "b", "c"]
+    client.close()
+
+
+def test_converse_stream_endpoint_emits_sse():
+    """Test that the streaming endpoint relays deltas as server-sent events."""
+    current_user = UserResponse(
+        id=1, username="user@example.com", email="user@example.com",
+        is_active=True, role=UserRole.USER
+    )
+    app.dependency_overrides[get_current_active_user] = lambda: current_user
+    try:
+        with patch("app.routers.llm.LLMFactory.create_client") as mock_create_client:
+            mock_create_client.return_value = make_client(FakeBedrockClient(text="one two"))
+            response = TestClient(app).post("/api/v1/llm/converse/stream", json={
+                "messages": [{"role": "user", "content": [{"text": "Hi"}]}],
+                "model": ModelName.CLAUDE_3_HAIKU.value
+            })
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert 'event: delta\ndata: {"text":"one"}' in response.text
+    assert response.text.rstrip().endswith("event: done\ndata: {}")
+
+
+def test_routed_stream_endpoint_uses_request_config():
+    """Test that a request without a model is routed with the config it was sent with."""
+    current_user = UserResponse(
+        id=1, username="user@example.com", email="user@example.com",
+        is_active=True, role=UserRole.USER
+    )
+    fake = FakeBedrockClient(text="one two")
+
+    def create_client(model_name, **kwargs):
+        client = make_client(fake)
+        client.model_id = model_name
+        client.config = kwargs["config"]
+        return client
+
+    app.dependency_overrides[get_current_active_user] = lambda: current_user
+    try:
+        with patch("app.core.model_router.LLMFactory.create_client", side_effect=create_client):
+            response = TestClient(app).post("/api/v1/llm/converse/stream", json={
+                "messages": [{"role": "user", "content": [{"text": "Hi"}]}],
+                "config": {"max_tokens": 64, "temperature": 0.0}
+            })
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+    assert response.status_code == 200
+    assert fake.calls[0]["inferenceConfig"]["maxTokens"] == 64
+    assert fake.calls[0]["inferenceConfig"]["temperature"] == 0.0
+
+
+class FlakyBedrockClient(FakeBedrockClient):
+    """Fake client that fails for prompts containing 'fail'."""
+
+    def converse(self, **request):
+        if "fail" in request["messages"][0]["content"][0]["text"]:
+            raise RuntimeError("model error")
+        response = super().converse(**request)
+        response["output"]["message"]["content"][0]["text"] = request["messages"][0]["content"][0]["text"]
+        return response
+
+
+def test_batch_converse_keeps_order_and_collects_errors():
+    """Test that a batch keeps input order and records per-item failures."""
+    fake = FlakyBedrockClient(delay=0.01)
+    client = make_client(fake, max_concurrency=4)
+    prompts = ["q0", "q1", "fail", "q3", "q4"]
+
+    result = client.batch_converse([user_message(p) for p in prompts], LLMResponse, max_concurrency=3)
+
+    assert [item.index for item in result.items] == list(range(5))
+    assert [r.text if r else None for r in result.responses] == ["q0", "q1", None, "q3", "q4"]
+    assert result.failed == 1
+    assert result.succeeded == 4
+    assert "model error" in result.items[2].error
+    assert fake.max_in_flight <= 3
+    assert result.p99_latency_ms >= result.p50_latency_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_abatch_converse_bounds_concurrency():
+    """Test that the async batch never exceeds the requested concurrency."""
+    fake = FlakyBedrockClient(delay=0.02)
+    client = make_client(fake, max_concurrency=8)
+
+    result = await client.abatch_converse(
+        [user_message(f"q{i}") for i in range(12)], LLMResponse, max_concurrency=2
+    )
+
+    assert [r.text for r in result.responses] == [f"q{i}" for i in range(12)]
+    assert fake.max_in_flight <= 2
+    client.close()
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+class ThrottlingBedrockClient(FakeBedrockClient):
+    """Fake client that fails with the given error codes before succeeding."""
+
+    def __init__(self, error_codes):
+        super().__init__()
+        self.error_codes = list(error_codes)
+
+    def converse(self, **request):
+        if self.error_codes:
+            self.calls.append(request)
+            raise client_error(self.error_codes.pop(0))
+        return super().converse(**request)
+
+
+def test_converse_retries_throttling_and_slows_limiter():
+    """Test that throttled calls are retried and lower the limiter's rate."""
+    fake = ThrottlingBedrockClient(["ThrottlingException", "ServiceUnavailableException"])
+    client = make_client(fake)
+    initial_rate = client.rate_limiter.rate
+
+    result = client.converse(user_message("Hello"), LLMResponse)
+
+    assert result.text == "Hello from Bedrock"
+    assert len(fake.calls) == 3
+    assert client.rate_limiter.rate < initial_rate
+
+
+def test_converse_raises_throttled_error_after_max_attempts():
+    """Test that persistent throttling surfaces as LLMThrottledError."""
+    fake = ThrottlingBedrockClient(["ThrottlingException"] * 10)
+    client = make_client(fake)
+
+    with pytest.raises(LLMThrottledError) as exc_info:
+        client.converse(user_message("Hello"), LLMResponse)
+
+    assert exc_info.value.error_code == "ThrottlingException"
+    assert len(fake.calls) == client.retry_policy.max_attempts
+
+
+def test_converse_does_not_retry_validation_errors():
+    """Test that non-retryable errors fail on the first attempt."""
+    fake = ThrottlingBedrockClient(["ValidationException"])
+    client = make_client(fake)
+
+    with pytest.raises(LLMError) as exc_info:
+        client.converse(user_message("Hello"), LLMResponse)
+
+    assert not isinstance(exc_info.value, LLMThrottledError)
+    assert len(fake.calls) == 1
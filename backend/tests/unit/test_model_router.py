@@ -0,0 +1,153 @@
+"""
+Unit tests for the cost-aware model router.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.core.exceptions import LLMThrottledError
+from app.core.llm_metrics import LLMCallRecord, LLMMetricsSink
+from app.core.llm_service import LLMConfig, LLMResponse, ModelName, ReasoningConfig
+from app.core.model_router import ModelRouter, RequestComplexity, RoutingHints
+from tests.unit.test_llm_service import FakeBedrockClient, make_client, user_message
+
+
+class ThrottledModelClient(FakeBedrockClient):
+    """Fake client whose every call is throttled."""
+
+    def converse(self, **request):
+        self.calls.append(request)
+        raise LLMThrottledError("throttled", error_code="ThrottlingException")
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def router():
+    """Router whose clients talk to per-model fake Bedrock clients."""
+    router = ModelRouter(metrics_sink=LLMMetricsSink(), clock=FakeClock())
+    router.fakes = {}
+
+    def create_client(model_name, **kwargs):
+        fake = router.fakes.setdefault(model_name, FakeBedrockClient(text=model_name.value))
+        client = make_client(fake)
+        client.model_id = model_name
+        client.config = kwargs["config"]
+        client.metrics_sink = kwargs["metrics_sink"]
+        return client
+
+    with patch("app.core.model_router.LLMFactory.create_client", side_effect=create_client):
+        yield router
+
+
+def test_classifies_by_prompt_size_and_hints(router):
+    """Test that short prompts are simple, long ones complex, and hints take precedence."""
+    assert router.classify(user_message("Is this spam?")) == RequestComplexity.SIMPLE
+    assert router.classify(user_message("word " * 2000)) == RequestComplexity.STANDARD
+    assert router.classify(user_message("word " * 5000)) == RequestComplexity.COMPLEX
+    assert router.classify(user_message("Hi"), RoutingHints(requires_reasoning=True)) == RequestComplexity.COMPLEX
+    assert router.classify(
+        user_message("word " * 5000), RoutingHints(complexity=RequestComplexity.SIMPLE)
+    ) == RequestComplexity.SIMPLE
+
+
+def test_simple_requests_go_to_cheap_model(router):
+    """Test that a short prompt is answered by the cheapest tier."""
+    result = router.converse(user_message("Is this spam?"), LLMResponse)
+
+    assert result.text == ModelName.NOVA_LITE.value
+    assert router.stats()[ModelName.NOVA_LITE.value].calls == 1
+
+
+def test_reasoning_requests_go_to_reasoning_model(router):
+    """Test that reasoning requests use the model that supports extended thinking."""
+    result = router.converse(user_message("Prove it"), LLMResponse, RoutingHints(requires_reasoning=True))
+
+    assert result.text == ModelName.CLAUDE_3_7_SONNET.value
+    assert router.get_client(ModelName.CLAUDE_3_7_SONNET, reasoning=True).config.reasoning.enabled
+
+
+def test_reasoning_requests_meet_extended_thinking_constraints(router):
+    """Test that the reasoning route sends max_tokens above the budget, temperature 1 and no top_p."""
+    router.converse(user_message("Prove it"), LLMResponse, RoutingHints(requires_reasoning=True))
+
+    request = router.fakes[ModelName.CLAUDE_3_7_SONNET].calls[0]
+    budget = request["additionalModelRequestFields"]["thinking"]["budget_tokens"]
+    assert request["inferenceConfig"]["maxTokens"] > budget
+    assert request["inferenceConfig"]["temperature"] == 1.0
+    assert "topP" not in request["inferenceConfig"]
+
+
+def test_caller_config_is_used_for_routed_requests(router):
+    """Test that a caller's config reaches the routed model without replacing the shared client's."""
+    router.converse(user_message("Is this spam?"), LLMResponse, config=LLMConfig(max_tokens=64, temperature=0.0))
+
+    request = router.fakes[ModelName.NOVA_LITE].calls[0]
+    assert request["inferenceConfig"]["maxTokens"] == 64
+    assert request["inferenceConfig"]["temperature"] == 0.0
+    assert router.get_client(ModelName.NOVA_LITE).config == LLMConfig()
+
+
+def test_caller_reasoning_config_routes_to_reasoning_model(router):
+    """Test that a config enabling reasoning selects a thinking model and keeps the caller's budget."""
+    config = LLMConfig(reasoning=ReasoningConfig(budget_tokens=4000))
+    client = router.select_client(user_message("Hi"), config=config)
+
+    assert client.model_id == ModelName.CLAUDE_3_7_SONNET
+    assert client.config.reasoning.budget_tokens == 4000
+    assert client.config.max_tokens > 4000
+    client.close()
+
+
+def test_falls_back_and_demotes_throttled_model(router):
+    """Test that a throttled model falls back to the next candidate and is tried last afterwards."""
+    router.fakes[ModelName.NOVA_LITE] = ThrottledModelClient()
+
+    result = router.converse(user_message("Is this spam?"), LLMResponse)
+
+    assert result.text == ModelName.LLAMA_3_8B.value
+    assert router.stats()[ModelName.NOVA_LITE.value].throttles == 1
+    assert router.candidates(user_message("Is this spam?"))[-1] == ModelName.NOVA_LITE
+
+    # Preferred again once the cooldown has passed
+    router._clock.now += router.throttle_cooldown_seconds + 1
+    assert router.candidates(user_message("Is this spam?"))[0] == ModelName.NOVA_LITE
+
+
+def test_slow_models_are_demoted_for_latency_budget(router):
+    """Test that models slower than the caller's latency budget are tried last."""
+    router.converse(user_message("warm up"), LLMResponse)
+    router._stats[ModelName.NOVA_LITE.value].latency_ms = 5000
+
+    candidates = router.candidates(user_message("Is this spam?"), RoutingHints(max_latency_ms=1000))
+
+    assert candidates[-1] == ModelName.NOVA_LITE
+    assert candidates[0] == ModelName.LLAMA_3_8B
+
+
+def test_first_successful_call_seeds_averages_after_an_error(router):
+    """Test that a failed first call does not drag the averages of the next successful call towards zero."""
+    model_id = ModelName.NOVA_LITE.value
+    router._observe(LLMCallRecord(model_id=model_id, success=False))
+    router._observe(LLMCallRecord(model_id=model_id, latency_ms=800, input_tokens=100, output_tokens=50))
+
+    stats = router.stats()[model_id]
+    assert (stats.calls, stats.errors) == (2, 1)
+    assert stats.latency_ms == 800
+    assert (stats.input_tokens, stats.output_tokens) == (100, 50)
+
+
+def test_raises_when_every_candidate_is_throttled(router):
+    """Test that the throttling error surfaces once all fallbacks are exhausted."""
+    for model in (ModelName.NOVA_LITE, ModelName.LLAMA_3_8B, ModelName.CLAUDE_3_HAIKU):
+        router.fakes[model] = ThrottledModelClient()
+
+    with pytest.raises(LLMThrottledError):
+        router.converse(user_message("Is this spam?"), LLMResponse)
@@ -0,0 +1,168 @@
+"""
+Unit tests for cursor (keyset) pagination of users.
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import ValidationError
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.schemas.user import UserCreate
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def create_users(db, user_dao, count):
+    return [
+        user_dao.create(db, obj_in=UserCreate(username=f"user{i}", email=f"user{i}@example.com"))
+        for i in range(count)
+    ]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(12345)
+    assert "12345" not in cursor
+    assert decode_cursor(cursor) == 12345
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(1)[:-2], "eyJpZCI6ImEifQ", "WzFd"])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+def test_get_page_walks_all_users_in_id_order(db, user_dao):
+    """Test that following next_cursor visits every user exactly once, in order."""
+    created = create_users(db, user_dao, 7)
+
+    seen, cursor = [], None
+    while True:
+        page = user_dao.get_page(db, cursor=cursor, limit=3)
+        seen.extend(user.id for user in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == sorted(user.id for user in created)
+
+
+def test_get_page_last_page_has_no_cursor(db, user_dao):
+    create_users(db, user_dao, 3)
+
+    page = user_dao.get_page(db, limit=3)
+
+    assert len(page.items) == 3
+    assert page.next_cursor is None
+
+
+def test_keyset_query_seeks_by_id(user_dao):
+    """Test that later pages seek past the cursor instead of skipping rows."""
+    sql = str(user_dao._keyset_select(encode_cursor(500), 50).compile(compile_kwargs={"literal_binds": True}))
+
+    assert "users.id > 500" in sql
+    assert "ORDER BY users.id" in sql
+    assert "LIMIT 51" in sql
+    assert "OFFSET" not in sql
+
+
+def test_get_multi_is_ordered_by_id(db, user_dao):
+    created = create_users(db, user_dao, 4)
+
+    assert [user.id for user in user_dao.get_multi(db, skip=1, limit=2)] == [created[1].id, created[2].id]
+
+
+@pytest.mark.asyncio
+async def test_async_get_page(async_db, async_user_dao):
+    for i in range(5):
+        await async_user_dao.create(async_db, obj_in=UserCreate(username=f"a{i}", email=f"a{i}@example.com"))
+
+    first = await async_user_dao.get_page(async_db, limit=3)
+    second = await async_user_dao.get_page(async_db, cursor=first.next_cursor, limit=3)
+
+    assert len(first.items) == 3
+    assert len(second.items) == 2
+    assert second.next_cursor is None
+    assert first.items[-1].id < second.items[0].id
+
+
+@pytest.fixture
+def client(db):
+    from app.dependencies import get_async_db
+    from app.main import app
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+
+
+def test_read_users_follows_cursor_header(client, db, user_dao):
+    """Test that GET /users/ pages with the X-Next-Cursor header."""
+    created = create_users(db, user_dao, 5)
+
+    first = client.get("/api/v1/users/", params={"limit": 2})
+    assert first.status_code == 200
+    assert [user["id"] for user in first.json()] == [created[0].id, created[1].id]
+
+    ids, response = [], first
+    while True:
+        ids.extend(user["id"] for user in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get("/api/v1/users/", params={"limit": 2, "cursor": cursor})
+
+    assert ids == [user.id for user in created]
+
+
+def test_read_users_legacy_offset(client, db, user_dao):
+    created = create_users(db, user_dao, 4)
+
+    response = client.get("/api/v1/users/", params={"skip": 2, "limit": 10})
+
+    assert response.status_code == 200
+    assert [user["id"] for user in response.json()] == [created[2].id, created[3].id]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_read_users_rejects_bad_cursor(client):
+    assert client.get("/api/v1/users/", params={"cursor": "garbage!"}).status_code == 400
+    assert client.get("/api/v1/users/", params={"cursor": encode_cursor(1), "skip": 5}).status_code == 400
+
+
+def test_get_page_json_matches_get_page(db, user_dao):
+    """Test that the serialized fast path returns the same users and cursor as get_page."""
+    create_users(db, user_dao, 5)
+
+    page = user_dao.get_page(db, limit=3)
+    serialized = user_dao.get_page_json(db, limit=3)
+
+    assert json.loads(serialized.content) == [user.model_dump(mode="json") for user in page.items]
+    assert serialized.next_cursor == page.next_cursor
+
+    last = user_dao.get_page_json(db, cursor=serialized.next_cursor, limit=3)
+    assert len(json.loads(last.content)) == 2
+    assert last.next_cursor is None
+
+
+def test_get_page_json_selects_columns_not_entities(user_dao):
+    sql = str(user_dao._keyset_select(None, 10, *user_dao._schema_columns()))
+
+    assert sql.startswith("SELECT users.username, users.email, users.full_name, users.id")
+
+
+@pytest.mark.asyncio
+async def test_async_get_page_json(async_db, async_user_dao):
+    for i in range(3):
+        await async_user_dao.create(async_db, obj_in=UserCreate(username=f"a{i}", email=f"a{i}@example.com"))
+
+    page = await async_user_dao.get_page(async_db, limit=2)
+    serialized = await async_user_dao.get_page_json(async_db, limit=2)
+
+    assert json.loads(serialized.content) == [user.model_dump(mode="json") for user in page.items]
+    assert serialized.next_cursor == page.next_cursor
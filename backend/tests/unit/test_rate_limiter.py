@@ -0,0 +1,91 @@
+"""
+Unit tests for the adaptive rate limiter and retry policy.
+"""
+import pytest
+
+from app.core.rate_limiter import AdaptiveRateLimiter, RateLimiterRegistry, RetryPolicy
+
+
+class FakeTime:
+    """Clock and sleep pair where sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(fake_time, **kwargs):
+    return AdaptiveRateLimiter(clock=fake_time.clock, sleep=fake_time.sleep, **kwargs)
+
+
+def test_burst_is_served_without_waiting():
+    """Test that a full bucket serves a burst immediately."""
+    fake_time = FakeTime()
+    limiter = make_limiter(fake_time, rate=5)
+
+    for _ in range(5):
+        assert limiter.acquire()
+
+    assert fake_time.slept == []
+
+
+def test_acquire_waits_for_refill_when_empty():
+    """Test that an empty bucket waits one token interval."""
+    fake_time = FakeTime()
+    limiter = make_limiter(fake_time, rate=4, burst=1)
+
+    limiter.acquire()
+    limiter.acquire()
+
+    assert fake_time.slept == [pytest.approx(0.25)]
+
+
+def test_acquire_times_out():
+    """Test that acquire gives up when the wait exceeds the timeout."""
+    fake_time = FakeTime()
+    limiter = make_limiter(fake_time, rate=1, burst=1)
+    limiter.acquire()
+
+    assert limiter.acquire(timeout=0.5) is False
+
+
+def test_rate_adapts_to_throttling_and_recovers():
+    """Test multiplicative decrease on throttle and additive increase on success."""
+    fake_time = FakeTime()
+    limiter = make_limiter(fake_time, rate=8, min_rate=1, increase_step=1)
+
+    limiter.on_throttle()
+    assert limiter.rate == 4
+    limiter.on_throttle()
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 1  # clamped to min_rate
+
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 8  # clamped to max_rate
+
+
+def test_registry_returns_one_limiter_per_key():
+    """Test that the registry shares a limiter per key."""
+    registry = RateLimiterRegistry(lambda: AdaptiveRateLimiter(rate=10))
+
+    assert registry.get("model-a") is registry.get("model-a")
+    assert registry.get("model-a") is not registry.get("model-b")
+
+
+def test_retry_delay_is_jittered_and_capped():
+    """Test that backoff delays stay within the exponential cap."""
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+
+    for attempt in range(10):
+        assert 0 <= policy.compute_delay(attempt) <= min(1.0, 0.1 * 2 ** attempt)
+    assert policy.is_retryable("ThrottlingException")
+    assert not policy.is_retryable("ValidationException")
@@ -0,0 +1,97 @@
+"""
+Unit tests for the verified-token cache and its use in JWTValidator.
+"""
+from unittest.mock import patch
+
+from app.core.jwt_utils import JWTValidator
+from app.core.token_cache import VerifiedTokenCache
+from app.schemas.auth import TokenData
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def token_data(username="alice", user_sub="sub-alice"):
+    return TokenData(username=username, user_sub=user_sub, email=f"{username}@example.com")
+
+
+def test_entries_expire_at_token_exp():
+    """Test that a cached token is not served past its exp claim."""
+    clock = FakeClock()
+    cache = VerifiedTokenCache(max_ttl_seconds=300, clock=clock)
+    cache.set("token", token_data(), exp=clock.now + 10)
+
+    clock.now += 9
+    assert cache.get("token") == token_data()
+    clock.now += 2
+    assert cache.get("token") is None
+
+
+def test_entries_expire_after_max_ttl():
+    """Test that long-lived tokens are re-verified after the TTL."""
+    clock = FakeClock()
+    cache = VerifiedTokenCache(max_ttl_seconds=60, clock=clock)
+    cache.set("token", token_data(), exp=clock.now + 3600)
+
+    clock.now += 61
+    assert cache.get("token") is None
+
+
+def test_expired_tokens_are_not_cached():
+    """Test that a token already past exp is never stored."""
+    clock = FakeClock()
+    cache = VerifiedTokenCache(clock=clock)
+    cache.set("token", token_data(), exp=clock.now - 1)
+
+    assert len(cache) == 0
+
+
+def test_lru_bound_and_hashed_keys():
+    """Test that the cache is bounded and does not keep raw tokens."""
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.set("a", token_data("a"))
+    cache.set("b", token_data("b"))
+    cache.get("a")
+    cache.set("c", token_data("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").username == "a"
+    assert all(isinstance(key, bytes) and len(key) == 32 for key in cache._entries)
+
+
+def test_revocation_by_user_and_hook():
+    """Test that user revocation and revocation hooks evict cached identities."""
+    cache = VerifiedTokenCache()
+    cache.set("t1", token_data("alice", "sub-a"))
+    cache.set("t2", token_data("alice", "sub-a"))
+    cache.set("t3", token_data("bob", "sub-b"))
+
+    assert cache.revoke_user(user_sub="sub-a") == 2
+    assert cache.get("t1") is None
+
+    cache.add_revocation_check(lambda data: data.username == "bob")
+    assert cache.get("t3") is None
+    assert len(cache) == 0
+
+
+def test_validator_verifies_each_token_once():
+    """Test that repeated validation of the same token skips full verification."""
+    validator = JWTValidator()
+    verified = token_data()
+    verified.exp = int(validator.token_cache._clock()) + 600
+
+    with patch.object(validator, "_validate_uncached", return_value=verified) as validate:
+        assert validator.validate_token("bearer-token") == verified
+        assert validator.validate_token("bearer-token") == verified
+
+        validator.revoke_token("bearer-token")
+        validator.validate_token("bearer-token")
+
+    assert validate.call_count == 2
@@ -140,3 +140,65 @@ def test_second_user_is_regular_user(db, user_dao):
     
     # Second user should be regular user
     assert result.role == UserRole.USER
+
+
+def test_create_is_idempotent_per_email(db, user_dao):
+    """Test that creating a user twice returns the existing row and fills a missing cognito_sub."""
+    first = user_dao.create(db, obj_in=UserCreate(username="retry@example.com", email="retry@example.com"))
+
+    second = user_dao.create(db, obj_in=UserCreate(
+        username="retry@example.com", email="retry@example.com", cognito_sub="sub-retry"
+    ))
+
+    assert second.id == first.id
+    assert second.role == UserRole.ADMIN
+    assert second.cognito_sub == "sub-retry"
+    assert user_dao.get_count(db) == 1
+
+
+def test_create_does_not_count_users(db, user_dao):
+    """Test that first-admin promotion uses the claim row instead of counting users."""
+    from sqlalchemy import event
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        user_dao.create(db, obj_in=UserCreate(username="a", email="a@example.com"))
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert not any("count(" in statement.lower() for statement in statements)
+    assert any("RETURNING" in statement for statement in statements)
+
+
+def test_admin_claimed_only_once(db, user_dao):
+    """Test that deleting the first user does not make the next signup an admin."""
+    first = user_dao.create(db, obj_in=UserCreate(username="first", email="first@example.com"))
+    user_dao.delete(db, id=first.id)
+
+    result = user_dao.create(db, obj_in=UserCreate(username="next", email="next@example.com"))
+
+    assert result.role == UserRole.USER
+
+
+def test_postgres_create_is_one_statement(user_dao):
+    """Test that on PostgreSQL the admin claim and the insert are a single statement."""
+    from unittest.mock import MagicMock
+    from sqlalchemy.dialects import postgresql
+
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = "postgresql"
+    db.execute.return_value.one.return_value._mapping = {
+        "id": 1, "username": "pg", "email": "pg@example.com", "full_name": None,
+        "is_active": True, "role": UserRole.ADMIN, "cognito_sub": None
+    }
+
+    result = user_dao.create(db, obj_in=UserCreate(username="pg", email="pg@example.com"))
+
+    assert db.execute.call_count == 1
+    sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH claim AS")
+    assert "ON CONFLICT (email) DO UPDATE" in sql
+    assert "RETURNING users.id" in sql
+    assert result.role == UserRole.ADMIN
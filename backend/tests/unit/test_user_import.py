@@ -0,0 +1,272 @@
+"""
+Unit tests for bulk user import (service, CLI command and admin endpoint).
+"""
+import asyncio
+import io
+import json
+
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from app.commands import db_commands
+from app.core.exceptions import CognitoError, ValidationError
+from app.crud.user import UserDAO
+from app.models.user import UserRole
+from app.schemas.user import UserCreate, UserImportFormat, UserImportStatus, UserResponse
+from app.services.user_import_service import UserImportService, detect_import_format, parse_user_import
+from tests.conftest import TestingAsyncSessionLocal, async_engine
+
+CSV_USERS = """email,username,full_name,role
+Alice@Example.com,,Alice,admin
+bob@example.com,bob,Bob,
+not-an-email,,Nobody,
+alice@example.com,,Alice Again,
+carol@example.com,carol,Carol,user
+"""
+
+
+class FakeCognito:
+    """Async stand-in for CognitoService.admin_create_user."""
+
+    def __init__(self, fail_for=(), fail_delete_for=()):
+        self.fail_for = set(fail_for)
+        self.fail_delete_for = set(fail_delete_for)
+        self.active = 0
+        self.max_active = 0
+        self.created = []
+        self.deleted = []
+
+    async def admin_create_user(self, email, full_name="", send_invite=False):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if email in self.fail_for:
+            raise CognitoError("An account with this email already exists.", error_code="UsernameExistsException")
+        self.created.append(email)
+        return f"sub-{email}"
+
+    async def admin_delete_user(self, email):
+        if email in self.fail_delete_for:
+            raise CognitoError("Cognito is unavailable.", error_code="InternalErrorException")
+        self.deleted.append(email)
+
+
+def test_parse_csv_normalizes_and_reports_invalid_rows():
+    """Test that CSV rows are normalized and invalid rows are reported, not raised."""
+    rows = list(parse_user_import(io.StringIO(CSV_USERS), UserImportFormat.CSV))
+
+    assert [number for number, _, _ in rows] == [1, 2, 3, 4, 5]
+    first = rows[0][1]
+    assert first.email == "alice@example.com"
+    assert first.username == "alice@example.com"
+    assert first.role == UserRole.ADMIN
+    assert rows[1][1].role == UserRole.USER
+    assert rows[2][1] is None and rows[2][2] == "Invalid email format"
+
+
+def test_parse_jsonl_skips_blank_lines():
+    """Test JSONL parsing, including malformed lines."""
+    lines = ['{"email": "a@example.com"}\n', "\n", "not json\n", "[1]\n"]
+
+    rows = list(parse_user_import(lines, UserImportFormat.JSONL))
+
+    assert rows[0][1].email == "a@example.com"
+    assert rows[1][2].startswith("Invalid JSON")
+    assert rows[2][2] == "Expected a JSON object"
+
+
+def test_detect_import_format():
+    assert detect_import_format("users.jsonl") == UserImportFormat.JSONL
+    assert detect_import_format("upload", "application/x-ndjson") == UserImportFormat.JSONL
+    assert detect_import_format("users.csv", "text/csv") == UserImportFormat.CSV
+
+
+@pytest.mark.asyncio
+async def test_import_reports_every_row(async_db, async_user_dao):
+    """Test per-row results for created, duplicate (in file and in DB) and invalid rows."""
+    await async_user_dao.create(async_db, obj_in=UserCreate(username="carol", email="existing@example.com"))
+    service = UserImportService(async_user_dao, batch_size=2)
+
+    summary = await service.import_users(async_db, io.StringIO(CSV_USERS), UserImportFormat.CSV)
+
+    statuses = [(result.row, result.status) for result in summary.results]
+    assert statuses == [
+        (1, UserImportStatus.CREATED),
+        (2, UserImportStatus.CREATED),
+        (3, UserImportStatus.INVALID),
+        (4, UserImportStatus.DUPLICATE),
+        (5, UserImportStatus.DUPLICATE),
+    ]
+    assert summary.results[4].detail == "Username already taken"
+    assert (summary.total, summary.created, summary.duplicates, summary.invalid) == (5, 2, 2, 1)
+    assert (await async_user_dao.get_by_email(async_db, "alice@example.com")).role == UserRole.ADMIN
+    assert await async_user_dao.get_count(async_db) == 3
+
+
+@pytest.mark.asyncio
+async def test_import_batches_queries(async_db, async_user_dao):
+    """Test that each batch costs one lookup and one insert regardless of its size."""
+    from sqlalchemy import event
+
+    lines = [json.dumps({"email": f"user{i}@example.com"}) + "\n" for i in range(50)]
+    service = UserImportService(async_user_dao, batch_size=25)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        summary = await service.import_users(async_db, lines, UserImportFormat.JSONL)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert summary.created == 50
+    assert sum(statement.lstrip().upper().startswith("SELECT") for statement in statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_import_precreates_cognito_users(async_db, async_user_dao):
+    """Test that Cognito users are created with bounded concurrency and failures are reported."""
+    cognito = FakeCognito(fail_for={"user3@example.com"})
+    lines = [json.dumps({"email": f"user{i}@example.com"}) + "\n" for i in range(10)]
+    service = UserImportService(async_user_dao, cognito, cognito_concurrency=3)
+
+    summary = await service.import_users(
+        async_db, lines, UserImportFormat.JSONL, create_in_cognito=True, send_invites=True
+    )
+
+    assert cognito.max_active == 3
+    assert summary.created == 9
+    failed = [result for result in summary.results if result.status == UserImportStatus.FAILED]
+    assert [result.email for result in failed] == ["user3@example.com"]
+    assert (await async_user_dao.get_by_email(async_db, "user0@example.com")).cognito_sub == "sub-user0@example.com"
+    assert await async_user_dao.get_by_email(async_db, "user3@example.com") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("delete_fails", [False, True])
+async def test_import_deletes_cognito_users_of_rows_lost_to_a_race(async_db, async_user_dao, delete_fails):
+    """Test that a row lost to a concurrent signup does not leave its new Cognito user behind."""
+    await async_user_dao.create(async_db, obj_in=UserCreate(username="racer", email="user1@example.com"))
+    cognito = FakeCognito(fail_delete_for={"user1@example.com"} if delete_fails else ())
+    service = UserImportService(async_user_dao, cognito)
+    lines = [json.dumps({"email": f"user{i}@example.com"}) + "\n" for i in range(3)]
+
+    # The signup lands between the duplicate lookup and the insert
+    with patch.object(async_user_dao, "find_existing", return_value=(set(), set())):
+        summary = await service.import_users(
+            async_db, lines, UserImportFormat.JSONL, create_in_cognito=True, send_invites=True
+        )
+
+    assert summary.created == 2
+    assert summary.results[1].status == UserImportStatus.DUPLICATE
+    if delete_fails:
+        assert cognito.deleted == []
+        assert summary.cognito_orphans == 1
+        assert "could not be deleted" in summary.results[1].detail
+    else:
+        assert cognito.deleted == ["user1@example.com"]
+        assert summary.cognito_orphans == 0
+        assert summary.results[1].detail.endswith("was deleted")
+
+
+@pytest.mark.asyncio
+async def test_cognito_import_requires_invites(async_db, async_user_dao):
+    """Test that users cannot be created in Cognito without the invitation that lets them sign in."""
+    service = UserImportService(async_user_dao, FakeCognito())
+
+    with pytest.raises(ValidationError):
+        await service.import_users(
+            async_db, ['{"email": "a@example.com"}\n'], UserImportFormat.JSONL, create_in_cognito=True
+        )
+
+
+@pytest.mark.asyncio
+async def test_imported_user_can_sign_up(async_db, async_user_dao):
+    """Test that a user imported into the database only completes registration by signing up."""
+    from app.main import app
+    from app.dependencies import get_async_db
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    await UserImportService(async_user_dao).import_users(
+        async_db, ['{"email": "dee@example.com", "username": "dee", "role": "admin"}\n'], UserImportFormat.JSONL
+    )
+    signup = {"email": "dee@example.com", "password": "TestPass123!", "full_name": "Dee"}
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        with patch("app.services.cognito_service.cognito_service.sign_up") as mock_sign_up:
+            mock_sign_up.return_value = {"user_sub": "sub-dee", "user_confirmed": True}
+            client = TestClient(app)
+            first = client.post("/api/v1/auth/signup", json=signup)
+            second = client.post("/api/v1/auth/signup", json=signup)
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+
+    assert first.status_code == 200
+    assert second.status_code == 400
+    user = await async_user_dao.get_by_email(async_db, "dee@example.com")
+    assert (user.username, user.role, user.cognito_sub) == ("dee", UserRole.ADMIN, "sub-dee")
+
+
+def test_import_users_command_requires_invites_with_cognito(tmp_path):
+    """Test that --cognito without --send-invites is rejected before anything is imported."""
+    path = tmp_path / "users.csv"
+    path.write_text(CSV_USERS)
+
+    result = CliRunner().invoke(db_commands.app, ["import-users", str(path), "--cognito"])
+
+    assert result.exit_code == 2
+
+
+def test_bulk_import_claims_first_admin(db, user_dao):
+    """Test that a signup after an import is not promoted to admin."""
+    user_dao.bulk_create(db, [UserCreate(username="a", email="a@example.com")])
+
+    result = user_dao.create(db, obj_in=UserCreate(username="b", email="b@example.com"))
+
+    assert result.role == UserRole.USER
+
+
+def test_import_users_command(db, tmp_path):
+    """Test the import-users Typer command prints one line per row and fails on invalid rows."""
+    path = tmp_path / "users.csv"
+    path.write_text(CSV_USERS)
+
+    with patch.object(db_commands, "AsyncSessionLocal", TestingAsyncSessionLocal), \
+            patch.object(db_commands, "async_engine", async_engine):
+        result = CliRunner().invoke(db_commands.app, ["import-users", str(path), "--batch-size", "2"])
+
+    assert result.exit_code == 1
+    lines = [line.split("\t") for line in result.output.strip().splitlines()]
+    assert [line[1] for line in lines] == ["created", "created", "invalid", "duplicate", "created"]
+    assert UserDAO().get_count(db) == 3
+
+
+def test_import_endpoint_requires_admin_and_imports(db):
+    """Test the admin upload endpoint end to end."""
+    from app.main import app
+    from app.dependencies import get_async_db, get_current_admin_user
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    admin = UserResponse(id=999, username="admin", email="admin@example.com", is_active=True, role=UserRole.ADMIN)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_admin_user] = lambda: admin
+    try:
+        response = TestClient(app).post(
+            "/api/v1/users/import",
+            files={"file": ("users.jsonl", b'{"email": "dee@example.com", "full_name": "Dee"}\n{"email": "bad"}\n')},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["invalid"]) == (1, 1)
+    assert body["results"][0]["status"] == "created"
@@ -0,0 +1,137 @@
+"""
+Unit tests for user search (UserDAO.search, AsyncUserDAO.search and GET /users/search).
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects import postgresql
+
+from app.crud.user import _search_criteria
+from app.models.user import User, UserRole
+from app.schemas.user import UserCreate, UserResponse, UserSearchFilters, UserSearchMode, UserUpdate
+from tests.conftest import TestingAsyncSessionLocal, engine
+
+
+@pytest.fixture
+def users(db, user_dao):
+    """Admin alice, users bob and carol (inactive) and 100%_dan with LIKE wildcards in the name."""
+    alice = user_dao.create(db, obj_in=UserCreate(username="alice", email="alice@corp.com", full_name="Alice Admin"))
+    bob = user_dao.create(db, obj_in=UserCreate(username="bob", email="bob@example.com", full_name="Bob Builder"))
+    carol = user_dao.create(db, obj_in=UserCreate(username="carol", email="carol@corp.com", full_name="Carol Alison"))
+    dan = user_dao.create(db, obj_in=UserCreate(username="100%_dan", email="dan@example.com"))
+    user_dao.update_by_id(db, carol.id, UserUpdate(is_active=False))
+    return {"alice": alice, "bob": bob, "carol": carol, "dan": dan}
+
+
+def search_names(db, user_dao, **filters):
+    page = user_dao.search(db, UserSearchFilters(**filters))
+    return [user.username for user in page.items]
+
+
+def test_contains_matches_email_username_and_full_name(db, user_dao, users):
+    assert search_names(db, user_dao, query="ALI") == ["alice", "carol"]
+    assert search_names(db, user_dao, query="corp.com") == ["alice", "carol"]
+    assert search_names(db, user_dao, query="builder") == ["bob"]
+
+
+def test_prefix_mode(db, user_dao, users):
+    assert search_names(db, user_dao, query="ali", mode=UserSearchMode.PREFIX) == ["alice"]
+    assert search_names(db, user_dao, query="lice", mode=UserSearchMode.PREFIX) == []
+
+
+def test_like_wildcards_are_literal(db, user_dao, users):
+    assert search_names(db, user_dao, query="%") == ["100%_dan"]
+    assert search_names(db, user_dao, query="_") == ["100%_dan"]
+
+
+def test_role_and_active_filters(db, user_dao, users):
+    assert search_names(db, user_dao, role=UserRole.ADMIN) == ["alice"]
+    assert search_names(db, user_dao, is_active=False) == ["carol"]
+    assert search_names(db, user_dao, query="corp", is_active=True) == ["alice"]
+    assert search_names(db, user_dao) == ["alice", "bob", "carol", "100%_dan"]
+
+
+def test_search_is_keyset_paginated(db, user_dao, users):
+    first = user_dao.search(db, UserSearchFilters(query="corp"), limit=1)
+    second = user_dao.search(db, UserSearchFilters(query="corp"), cursor=first.next_cursor, limit=1)
+
+    assert [user.username for user in first.items] == ["alice"]
+    assert [user.username for user in second.items] == ["carol"]
+    assert second.next_cursor is None
+
+
+def test_postgres_search_uses_ilike():
+    stmt = select(User).where(*_search_criteria(UserSearchFilters(query="ali", mode=UserSearchMode.PREFIX)))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("ILIKE") == 3
+
+
+def test_trigram_indexes_only_on_postgres(db):
+    """Test that the GIN trigram indexes are PostgreSQL-only and the filter index exists everywhere."""
+    index_names = {index["name"] for index in inspect(engine).get_indexes("users")}
+
+    assert "ix_users_role_is_active_id" in index_names
+    assert not any(name.endswith("_trgm") for name in index_names)
+
+
+@pytest.mark.asyncio
+async def test_async_search(async_db, async_user_dao, users):
+    page = await async_user_dao.search(async_db, UserSearchFilters(query="example.com"))
+
+    assert [user.username for user in page.items] == ["bob", "100%_dan"]
+
+
+@pytest.fixture
+def client(users):
+    from app.dependencies import get_async_db, get_current_admin_user
+    from app.main import app
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_admin_user] = lambda: UserResponse.model_validate(users["alice"])
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_search_endpoint(client):
+    response = client.get("/api/v1/users/search", params={"q": "corp", "limit": 1})
+
+    assert response.status_code == 200
+    assert [user["username"] for user in response.json()] == ["alice"]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get("/api/v1/users/search", params={"q": "corp", "limit": 1, "cursor": cursor})
+    assert [user["username"] for user in response.json()] == ["carol"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_search_endpoint_filters_and_validation(client):
+    response = client.get("/api/v1/users/search", params={"role": "admin", "is_active": "true"})
+    assert [user["username"] for user in response.json()] == ["alice"]
+
+    assert client.get("/api/v1/users/search", params={"mode": "fuzzy"}).status_code == 422
+    assert client.get("/api/v1/users/search", params={"cursor": "garbage!"}).status_code == 400
+
+
+def test_search_endpoint_requires_admin(users):
+    from app.main import app
+
+    assert TestClient(app).get("/api/v1/users/search").status_code in (401, 403)
+
+
+def test_search_json_matches_search(db, user_dao, users):
+    filters = UserSearchFilters(query="corp")
+
+    page = user_dao.search(db, filters, limit=1)
+    serialized = user_dao.search_json(db, filters, limit=1)
+
+    assert json.loads(serialized.content) == [user.model_dump(mode="json") for user in page.items]
+    assert serialized.next_cursor == page.next_cursor
@@ -1,4 +1,4 @@
-import { User, UserCreate, UserUpdate, UserStats, Role, Permission } from '@/types/user';
+import { User, UserCreate, UserUpdate, UserStats, Role, Permission, UserSearchParams, UserSearchPage } from '@/types/user';
 
 const API_BASE = '/api';
 
@@ -23,6 +23,37 @@ class UserService {
     }
   }
 
+  async searchUsers(params: UserSearchParams = {}): Promise<UserSearchPage> {
+    try {
+      const query = new URLSearchParams();
+      if (params.q) query.set('q', params.q);
+      if (params.mode) query.set('mode', params.mode);
+      if (params.role) query.set('role', params.role);
+      if (params.isActive !== undefined) query.set('is_active', String(params.isActive));
+      if (params.cursor) query.set('cursor', params.cursor);
+      if (params.limit) query.set('limit', String(params.limit));
+
+      const response = await fetch(`${API_BASE}/users/search?${query}`, {
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('token')}`,
+          'Content-Type': 'application/json',
+        },
+      });
+      
+      if (!response.ok) {
+        throw new Error('Failed to search users');
+      }
+      
+      return {
+        users: await response.json(),
+        nextCursor: response.headers.get('X-Next-Cursor'),
+      };
+    } catch (error) {
+      console.error('Error searching users:', error);
+      throw error;
+    }
+  }
+
   async getUserById(id: number): Promise<User> {
     try {
       const response = await fetch(`${API_BASE}/users/${id}`, {
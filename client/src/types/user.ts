@@ -33,6 +33,20 @@ export interface UserUpdate {
   isActive?: boolean;
 }
 
+export interface UserSearchParams {
+  q?: string;
+  mode?: 'prefix' | 'contains';
+  role?: UserRole;
+  isActive?: boolean;
+  cursor?: string;
+  limit?: number;
+}
+
+export interface UserSearchPage {
+  users: User[];
+  nextCursor: string | null;
+}
+
 export interface Role {
   id: string;
   name: string;